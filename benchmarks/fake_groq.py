@@ -0,0 +1,245 @@
+"""A deterministic local stand-in for the Groq chat-completions endpoint.
+
+Point the pipeline at it with ``GROQ_BASE_URL``; the Groq SDK appends
+``/openai/v1/chat/completions``. Responses depend only on the request, so
+every run produces the same text, token counts and (seeded) latencies.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Latency and throughput of the fake endpoint.
+
+    A response takes ``ttft`` seconds to its first token, then streams
+    ``completion_tokens`` at ``tokens_per_second`` (``0`` means instantly).
+    ``jitter`` scales both by a seeded factor in ``[1 - jitter, 1 + jitter]``.
+    With ``rpm`` set, requests beyond that many per model per minute get a
+    429 with ``Retry-After``, like the real API.
+    """
+
+    name: str
+    ttft: float = 0.0
+    tokens_per_second: float = 0.0
+    completion_tokens: int = 200
+    jitter: float = 0.0
+    rpm: Optional[int] = None
+
+
+PROFILES: Dict[str, Profile] = {
+    "instant": Profile("instant"),
+    "groq": Profile("groq", ttft=0.25, tokens_per_second=500, completion_tokens=600, jitter=0.2),
+    "slow": Profile("slow", ttft=1.0, tokens_per_second=60, completion_tokens=600, jitter=0.2),
+    "throttled": Profile(
+        "throttled", ttft=0.25, tokens_per_second=500, completion_tokens=600, jitter=0.2, rpm=30
+    ),
+}
+
+_WORDS = (
+    "open rate audience subject click growth signal newsletter readers insight "
+    "trend retention segment archive story weekly metric draft hook"
+).split()
+
+
+def _seed(body: dict) -> int:
+    payload = json.dumps([body.get("model"), body.get("messages")], sort_keys=True)
+    return int(hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16], 16)
+
+
+def fake_completion(body: dict, completion_tokens: int) -> str:
+    """Deterministic Markdown that every agent's parser accepts.
+
+    It carries two outline options with subject-line candidates (for the
+    outline stage) and a revision summary (for the editor); roughly one
+    token per word.
+    """
+    rng = random.Random(_seed(body))
+    words = max(completion_tokens - 40, 10)
+
+    def prose(n: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(n)).capitalize() + "."
+
+    subjects = "\n".join(f'- "{prose(6)[:-1]}"' for _ in range(5))
+    return (
+        "# Outline Option 1\n"
+        f"## Hook\n{prose(words // 3)}\n\n"
+        f"## Subject Line Candidates\n{subjects}\n\n"
+        "# Outline Option 2\n"
+        f"## Hook\n{prose(words // 3)}\n\n"
+        f"{prose(words // 3)}\n\n"
+        "## Revision Summary\n- Tightened the hook.\n- Clarified the call to action.\n"
+    )
+
+
+def _prompt_tokens(body: dict) -> int:
+    return sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+
+
+def create_app(profile: Profile) -> FastAPI:
+    """Build the ASGI app; ``app.state.stats`` counts requests and tokens."""
+    app = FastAPI(title="Fake Groq")
+    app.state.stats = defaultdict(int)
+    windows: Dict[str, deque] = defaultdict(deque)
+    lock = asyncio.Lock()
+
+    async def throttle(model: str) -> Optional[float]:
+        if profile.rpm is None:
+            return None
+        async with lock:
+            now = time.monotonic()
+            window = windows[model]
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= profile.rpm:
+                return 60 - (now - window[0])
+            window.append(now)
+        return None
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "unknown")
+        stats = app.state.stats
+        stats["requests"] += 1
+        retry_after = await throttle(model)
+        if retry_after is not None:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": f"{retry_after:.3f}"},
+            )
+
+        rng = random.Random(_seed(body))
+        scale = 1 + profile.jitter * (2 * rng.random() - 1)
+        text = fake_completion(body, profile.completion_tokens)
+        pieces = text.split(" ")
+        prompt_tokens = _prompt_tokens(body)
+        completion_tokens = len(pieces)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        per_token = scale / profile.tokens_per_second if profile.tokens_per_second else 0.0
+        created = int(time.time())
+        completion_id = f"chatcmpl-{_seed(body):x}"
+
+        if not body.get("stream"):
+            await asyncio.sleep(profile.ttft * scale + per_token * completion_tokens)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }
+
+        def chunk(delta: dict, finish: Optional[str] = None, extra: Optional[dict] = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **(extra or {}),
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events():
+            await asyncio.sleep(profile.ttft * scale)
+            yield chunk({"role": "assistant", "content": ""})
+            for i, piece in enumerate(pieces):
+                if per_token:
+                    await asyncio.sleep(per_token)
+                yield chunk({"content": piece if i == 0 else " " + piece})
+            yield chunk({}, "stop", {"x_groq": {"id": completion_id, "usage": usage}})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class FakeGroqServer:
+    """Run :func:`create_app` on a free local port in a background thread.
+
+    Use as a context manager; ``base_url`` is ready for ``GROQ_BASE_URL``.
+    """
+
+    def __init__(self, profile: Profile = PROFILES["instant"], host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile
+        self.app = create_app(profile)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self.base_url = f"http://{host}:{self._socket.getsockname()[1]}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, log_level="warning", lifespan="off", timeout_keep_alive=30)
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self.app.state.stats)
+
+    def start(self) -> "FakeGroqServer":
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Fake Groq server failed to start.")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self._socket.close()
+
+    def __enter__(self) -> "FakeGroqServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Groq chat-completions endpoint")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="groq")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    profile = PROFILES[args.profile]
+    print(f"Fake Groq on http://{args.host}:{args.port} with {json.dumps(asdict(profile))}")
+    uvicorn.run(create_app(profile), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""Offline benchmarks for the newsletter pipeline.
+
+Every scenario runs against :class:`~benchmarks.fake_groq.FakeGroqServer`
+in a scratch directory, so results need no network or API key and only
+vary with the machine. Typical use::
+
+    python -m benchmarks.run --profile groq --output bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --save-baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json  # exits 1 on regression
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fake_groq import PROFILES, FakeGroqServer, Profile
+
+# Sizes per scale; "smoke" keeps a full run to a few seconds.
+SCALES = {
+    "smoke": {"concurrent_requests": 2, "archive_files": 50, "csv_rows": 500, "candidates": 20},
+    "default": {"concurrent_requests": 8, "archive_files": 500, "csv_rows": 20_000, "candidates": 200},
+    "large": {"concurrent_requests": 32, "archive_files": 5_000, "csv_rows": 200_000, "candidates": 1_000},
+}
+
+
+def _png(width: int = 64, height: int = 64) -> bytes:
+    """A solid-colour RGB PNG, built without Pillow."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\x00" + b"\x30\x60\x90" * width for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def write_metrics_csv(path: Path, rows: int, seed: int = 0) -> Path:
+    """Weekly issues with plausible open/click rates, deterministic per ``seed``."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2015-01-05", periods=rows, freq="7D")
+    open_rate = np.clip(40 + rng.normal(0, 5, rows), 5, 95)
+    pd.DataFrame({
+        "IssueDate": dates.strftime("%Y-%m-%d"),
+        "SubjectLine": [f"Issue {i}: {'Growth' if i % 3 else 'Retention'} notes {i % 7}?" for i in range(rows)],
+        "OpenRate": open_rate.round(2),
+        "ClickRate": (open_rate / 8 + rng.normal(0, 1, rows)).clip(0.1).round(2),
+        "ReplyCount": rng.integers(0, 40, rows),
+        "Subscribers": 1000 + np.arange(rows) * 3,
+    }).to_csv(path, index=False)
+    return path
+
+
+def write_archive(content_dir: Path, files: int) -> Path:
+    content_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        body = "\n\n".join(
+            f"## Section {j}\nIssue {i} looked at open rates, subject lines and segment {j} retention."
+            for j in range(6)
+        )
+        (content_dir / f"issue-{i:05d}.md").write_text(f"# Archive issue {i}\n\n{body}\n", encoding="utf-8")
+    return content_dir
+
+
+def pipeline_spec(root: Path, rows: int = 52) -> Dict[str, Any]:
+    cover = root / "cover.png"
+    if not cover.exists():
+        cover.write_bytes(_png())
+    return {
+        "metrics_csv": str(write_metrics_csv(root / "metrics.csv", rows)),
+        "research_query": "newsletter growth",
+        "issue_brief": "How small newsletters grow retention",
+        "cover_image": str(cover),
+        "title": "Benchmark issue",
+        "slug": "benchmark-issue",
+        "tags": ["growth"],
+        "publish_date": "2025-07-01T09:00:00+00:00",
+    }
+
+
+@contextmanager
+def fake_groq(profile: Profile):
+    """Serve ``profile`` and point the shared Groq clients, agents, limiter and caches at a clean slate."""
+    from src.llm_cache import configure_response_cache
+    from src.rate_limit import configure_rate_limiter
+    from src.registry import configure_registry
+    from src.utils import close_async_groq_client, close_groq_client
+
+    saved = {k: os.environ.get(k) for k in ("GROQ_API_KEY", "GROQ_BASE_URL")}
+    with FakeGroqServer(profile) as server:
+        os.environ["GROQ_API_KEY"] = saved["GROQ_API_KEY"] or "fake-key"
+        os.environ["GROQ_BASE_URL"] = server.base_url
+        close_groq_client()
+        asyncio.run(close_async_groq_client())
+        configure_registry(None)
+        configure_rate_limiter(None)
+        configure_response_cache(None)
+        try:
+            yield server
+        finally:
+            # Registered agents hold the client that is about to be closed.
+            configure_registry(None)
+            close_groq_client()
+            asyncio.run(close_async_groq_client())
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def _clear_local_caches() -> None:
+    from src.forecasting import clear_forecaster_cache
+    from src.metrics_store import clear_metrics_cache
+
+    clear_forecaster_cache()
+    clear_metrics_cache()
+
+
+def single_pipeline(root: Path, profile: Profile, scale: Dict[str, int]) -> Dict[str, float]:
+    """One end-to-end ``run_pipeline`` call."""
+    from src.orchestrator import RUN_REPORT, run_pipeline
+
+    spec = pipeline_spec(root)
+    write_archive(root / "data" / "content", 20)
+    with fake_groq(profile) as server:
+        start = time.perf_counter()
+        zip_path = run_pipeline(**spec, output_root=str(root / "output"))
+        seconds = time.perf_counter() - start
+    report = json.loads((Path(zip_path).parents[1] / RUN_REPORT).read_text(encoding="utf-8"))
+    return {
+        "seconds": seconds,
+        "llm_seconds": report["totals"]["llm_seconds"],
+        "cpu_seconds": report["totals"]["cpu_seconds"],
+        "llm_calls": report["totals"]["llm_calls"],
+        "server_requests": server.stats.get("requests", 0),
+    }
+
+
+def concurrent_api(root: Path, profile: Profile, scale: Dict[str, int]) -> Dict[str, float]:
+    """N concurrent ``POST /api/run-pipeline`` calls through the ASGI app."""
+    import httpx
+
+    from src.api import app
+
+    n = scale["concurrent_requests"]
+    spec = pipeline_spec(root)
+    write_archive(root / "data" / "content", 20)
+
+    async def one(client: httpx.AsyncClient, i: int) -> float:
+        start = time.perf_counter()
+        response = await client.post("/api/run-pipeline", json={**spec, "slug": f"issue-{i}"})
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    async def run_all() -> List[float]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await asyncio.gather(*(one(client, i) for i in range(n)))
+
+    with fake_groq(profile) as server:
+        start = time.perf_counter()
+        latencies = asyncio.run(run_all())
+        seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "p50_seconds": float(np.percentile(latencies, 50)),
+        "p95_seconds": float(np.percentile(latencies, 95)),
+        "pipelines_per_minute": n * 60 / seconds,
+        "rate_limited": server.stats.get("rate_limited", 0),
+    }
+
+
+def archive_ingestion(root: Path, profile: Profile, scale: Dict[str, int]) -> Dict[str, float]:
+    """Cold index build, no-op rescan and a one-file incremental update."""
+    from src.orchestrator import _update_archive
+
+    content = write_archive(root / "content", scale["archive_files"])
+    index = root / "index"
+    start = time.perf_counter()
+    _update_archive(str(content), str(index))
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    _update_archive(str(content), str(index))
+    rescan = time.perf_counter() - start
+    (content / "issue-00000.md").write_text("# Changed\n\nA rewritten archive issue.\n", encoding="utf-8")
+    start = time.perf_counter()
+    _update_archive(str(content), str(index))
+    incremental = time.perf_counter() - start
+    return {"seconds": cold, "rescan_seconds": rescan, "incremental_seconds": incremental}
+
+
+def forecast_large_csv(root: Path, profile: Profile, scale: Dict[str, int]) -> Dict[str, float]:
+    """Fit the open-rate model on a large export and rank many candidates."""
+    from src.forecasting import rank_subjects
+
+    csv_path = str(write_metrics_csv(root / "large.csv", scale["csv_rows"]))
+    candidates = [f"Candidate {i}: growth notes {'?' if i % 2 else '!'}" for i in range(scale["candidates"])]
+    _clear_local_caches()
+    start = time.perf_counter()
+    rank_subjects(csv_path, candidates)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    rank_subjects(csv_path, candidates)
+    warm = time.perf_counter() - start
+    return {"seconds": cold, "warm_seconds": warm}
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("pandas", "numpy", "groq", "faiss", "httpx", "PIL", "pyarrow")
+
+
+def _python(*args: str) -> float:
+    """Wall time of a fresh interpreter run with ``args`` from the repo root."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=REPO_ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def startup(root: Path, profile: Profile, scale: Dict[str, int]) -> Dict[str, float]:
+    """Cold-start costs: importing the API, CLI ``--help`` and time until ``/api/health`` answers."""
+    import httpx
+
+    baseline = _python("-c", "pass")
+    api_import = _python("-c", "import src.api")
+    cli_help = _python("-m", "src.orchestrator", "--help")
+    heavy = subprocess.run(
+        [sys.executable, "-c", f"import sys, src.api; print(sum(m in sys.modules for m in {HEAVY_MODULES!r}))"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                if server.poll() is not None or time.perf_counter() - start > 60:
+                    raise RuntimeError("API did not become healthy.")
+                time.sleep(0.02)
+        health = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {
+        "seconds": health,
+        "interpreter_seconds": baseline,
+        "api_import_seconds": api_import,
+        "cli_help_seconds": cli_help,
+        "heavy_modules_at_import": int(heavy),
+    }
+
+
+SCENARIOS: Dict[str, Callable[[Path, Profile, Dict[str, int]], Dict[str, float]]] = {
+    "single_pipeline": single_pipeline,
+    "concurrent_api": concurrent_api,
+    "archive_ingestion": archive_ingestion,
+    "forecast_large_csv": forecast_large_csv,
+    "startup": startup,
+}
+
+
+def run_scenarios(
+    names: Optional[List[str]] = None,
+    profile: str = "groq",
+    scale: str = "default",
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """Run scenarios ``repeat`` times each and return the median of every metric.
+
+    Each repetition runs in a fresh scratch directory (also the working
+    directory, since the pipeline reads ``data/`` and writes ``output/``
+    relative to it) with local caches cleared.
+    """
+    names = names or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+    sizes = SCALES[scale]
+    results: Dict[str, Any] = {}
+    cwd = os.getcwd()
+    saved_env = {k: os.environ.get(k) for k in ("METRICS_CACHE_DIR", "ASSET_CACHE_DIR")}
+    try:
+        for name in names:
+            runs = []
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as tmp:
+                    os.chdir(tmp)
+                    os.environ["METRICS_CACHE_DIR"] = str(Path(tmp) / ".cache" / "metrics")
+                    os.environ["ASSET_CACHE_DIR"] = str(Path(tmp) / ".cache" / "assets")
+                    _clear_local_caches()
+                    try:
+                        runs.append(SCENARIOS[name](Path(tmp), PROFILES[profile], sizes))
+                    finally:
+                        os.chdir(cwd)
+            results[name] = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "profile": profile,
+            "scale": scale,
+            "repeat": repeat,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2, slack: float = 0.05
+) -> List[str]:
+    """Return a message for every ``*seconds`` metric more than ``tolerance`` slower than baseline.
+
+    Slowdowns of at most ``slack`` seconds are timer noise and never count,
+    so millisecond metrics in smoke runs do not flap. Scenarios or metrics
+    missing from either side are ignored. A baseline
+    recorded with a different profile or scale cannot be compared and
+    raises ``ValueError``.
+    """
+    mismatched = [
+        f"{k}={results['meta'].get(k)} (baseline {baseline.get('meta', {}).get(k)})"
+        for k in ("profile", "scale")
+        if results["meta"].get(k) != baseline.get("meta", {}).get(k)
+    ]
+    if mismatched:
+        raise ValueError(f"Baseline recorded with different settings: {', '.join(mismatched)}")
+    regressions = []
+    for name, metrics in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name, {})
+        for key, value in metrics.items():
+            if not key.endswith("seconds") or key not in base or base[key] <= 0:
+                continue
+            if value > base[key] * (1 + tolerance) and value - base[key] > slack:
+                regressions.append(
+                    f"{name}.{key}: {value:.3f}s vs baseline {base[key]:.3f}s "
+                    f"(+{(value / base[key] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run offline pipeline benchmarks")
+    parser.add_argument("--scenarios", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="groq")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="default")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_output.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Write these results to --baseline instead of comparing"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",")] if args.scenarios else None
+    results = run_scenarios(names, args.profile, args.scale, args.repeat)
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    for name, metrics in results["scenarios"].items():
+        print(name, " ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in metrics.items()))
+
+    if args.baseline and args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+    elif args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        try:
+            regressions = compare(results, baseline, args.tolerance)
+        except ValueError as e:
+            print(f"BASELINE MISMATCH {e}", file=sys.stderr)
+            return 1
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,7 +18,7 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     try {
-      const resp = await fetch("/api/create-draft", {
+      const resp = await fetch("/api/create-draft/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ outline_markdown: outline })
@@ -29,8 +29,15 @@ document.addEventListener("DOMContentLoaded", () => {
         throw new Error(`Error ${resp.status}: ${errText}`);
       }
 
-      const data = await resp.json();
-      outputDiv.textContent = data.draft_markdown;
+      let draft = "";
+      await readEventStream(resp, (event, data) => {
+        if (event === "token") {
+          draft += data.text;
+          outputDiv.textContent = draft;
+        } else if (event === "error") {
+          throw new Error(data.detail);
+        }
+      });
     } catch (err) {
       errorDiv.textContent = `Request failed: ${err.message}`;
       outputDiv.textContent = "";
@@ -21,7 +21,7 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     try {
-      const resp = await fetch("/api/edit-draft", {
+      const resp = await fetch("/api/edit-draft/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ draft_markdown: draft })
@@ -32,9 +32,21 @@ document.addEventListener("DOMContentLoaded", () => {
         throw new Error(`Error ${resp.status}: ${errText}`);
       }
 
-      const data = await resp.json();
-      polishedDiv.textContent = data.polished_markdown;
-      summaryDiv.textContent = data.revision_summary;
+      let polished = "";
+      let summary = "";
+      await readEventStream(resp, (event, data) => {
+        if (event === "polished") {
+          polished += data.text;
+          polishedDiv.textContent = polished;
+        } else if (event === "summary") {
+          summary += data.text;
+          summaryDiv.textContent = summary.trim();
+        } else if (event === "done") {
+          polishedDiv.textContent = polished.trimEnd();
+        } else if (event === "error") {
+          throw new Error(data.detail);
+        }
+      });
     } catch (err) {
       errorDiv.textContent = `Request failed: ${err.message}`;
       polishedDiv.textContent = "";
@@ -36,7 +36,7 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     try {
-      const resp = await fetch("/api/run-pipeline", {
+      const resp = await fetch("/api/jobs", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -56,7 +56,28 @@ document.addEventListener("DOMContentLoaded", () => {
         throw new Error(`Error ${resp.status}: ${errText}`);
       }
 
-      const data = await resp.json();
+      const { job_id } = await resp.json();
+      let status;
+      while (true) {
+        const statusResp = await fetch(`/api/jobs/${job_id}`);
+        if (!statusResp.ok) {
+          throw new Error(`Error ${statusResp.status}: ${await statusResp.text()}`);
+        }
+        status = await statusResp.json();
+        const stages = Object.entries(status.stages)
+          .map(([name, state]) => `${name}: ${state}`)
+          .join("\n");
+        outputDiv.textContent =
+          `Job ${job_id} ${status.status} (${status.completed_stages}/${status.total_stages} stages)\n${stages}`;
+        if (status.status === "succeeded" || status.status === "failed") break;
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+      }
+
+      if (status.status === "failed") {
+        throw new Error(status.error);
+      }
+      const resultResp = await fetch(`/api/jobs/${job_id}/result`);
+      const data = await resultResp.json();
       outputDiv.textContent = `Pipeline complete. ZIP at: ${data.package_zip_path}`;
     } catch (err) {
       errorDiv.textContent = `Request failed: ${err.message}`;
@@ -1,5 +1,11 @@
-from groq import Groq
-from src.utils import get_groq_client
+from src.llm import acomplete, complete
+from src.prompt_budget import Prompt, compact
+from src.utils import get_async_groq_client, get_groq_client
+
+MODEL = "compound-beta-mini"
+SYSTEM_PROMPT = "You are a creative director."
+# About 1,500 characters of prose.
+EXCERPT_TOKENS = 400
 
 
 class CreativeDirector:
@@ -8,34 +14,28 @@ class CreativeDirector:
     def __init__(self):
         self.client = get_groq_client()
 
-    def suggest_visuals(self, draft_excerpt: str) -> str:
-        """Return plain-text visual prompts for the provided excerpt."""
+    def _build_prompt(self, draft_excerpt: str) -> str:
         if not draft_excerpt.strip():
             raise ValueError("Draft excerpt cannot be empty.")
 
-        excerpt = draft_excerpt.strip()
-        if len(excerpt) > 1500:
-            excerpt = excerpt[:1500] + "\u2026"
-
-        prompt = (
+        excerpt = compact(draft_excerpt, EXCERPT_TOKENS)
+        return Prompt(
             "You are a creative director specialized in minimal design. "
             "Given these first paragraphs:\n\n"
-            f"{excerpt}\n\n"
+            f"{excerpt.text}\n\n"
             "Suggest 3 cover image concepts in plain text. For each concept, provide:\n"
             "- A brief description (e.g., \"Charcoal background, yellow barbell vs. gloves\").\n"
             "- A text-to-image prompt string suitable for DALL·E or Stable Diffusion.\n\n"
-            "Format as plain text, one concept per line, with description and prompt separated by a tab."
+            "Format as plain text, one concept per line, with description and prompt separated by a tab.",
+            excerpt.tokens_saved,
         )
 
-        try:
-            response = self.client.chat.completions.create(
-                model="compound-beta-mini",
-                messages=[
-                    {"role": "system", "content": "You are a creative director."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as e:
-            raise RuntimeError(f"Groq API call failed: {e}")
-
-        return response.choices[0].message.content
+    def suggest_visuals(self, draft_excerpt: str) -> str:
+        """Return plain-text visual prompts for the provided excerpt."""
+        prompt = self._build_prompt(draft_excerpt)
+        return complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
+
+    async def asuggest_visuals(self, draft_excerpt: str) -> str:
+        """Coroutine variant of :meth:`suggest_visuals`."""
+        prompt = self._build_prompt(draft_excerpt)
+        return await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
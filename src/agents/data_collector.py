@@ -1,25 +1,21 @@
 import glob
+import hashlib
+import json
 import os
-from typing import List, Dict
+import threading
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional
 
 import pandas as pd
 import numpy as np
 
-from ..utils import get_groq_client
+from ..embeddings import EmbeddingEngine
+from ..metrics_store import load_metrics
 
 
 def ingest_metrics(csv_path: str) -> pd.DataFrame:
     """Parse metrics CSV into DataFrame with validated columns."""
-    if not os.path.isfile(csv_path):
-        raise FileNotFoundError(f"Metrics CSV not found at {csv_path}")
-
-    df = pd.read_csv(csv_path)
-    required = {"IssueDate", "SubjectLine", "OpenRate", "ClickRate", "ReplyCount", "Subscribers"}
-    missing = required - set(df.columns)
-    if missing:
-        raise ValueError(f"Metrics CSV is missing required columns: {missing}")
-
-    df["IssueDate"] = pd.to_datetime(df["IssueDate"], format="%Y-%m-%d")
+    df = load_metrics(csv_path)
     df["OpenRate"] = df["OpenRate"].astype(float)
     df["ClickRate"] = df["ClickRate"].astype(float)
     df["ReplyCount"] = df["ReplyCount"].astype(int)
@@ -44,26 +40,112 @@ def ingest_content(markdown_dir: str) -> List[Dict[str, str]]:
     return docs
 
 
-def compute_embeddings(documents: List[str], model: str = "llama-3.1-8b-instant") -> np.ndarray:
-    """Generate embeddings for documents using Groq via a language model."""
-    client = get_groq_client()
-    vectors = []
-    for doc in documents:
-        prompt = (
-            "Generate a fixed-length embedding vector (as a JSON array) for the following text:\n\n" + doc
-        )
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are an embedding generator."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        text = response.choices[0].message.content.strip()
-        try:
-            vector = np.array(eval(text), dtype=float)
-        except Exception as exc:
-            raise RuntimeError(f"Failed to parse embedding vector from Groq: {exc}")
-        vectors.append(vector)
-
-    return np.vstack(vectors)
+def _read_doc(path: str) -> tuple[Dict[str, str], str]:
+    with open(path, "rb") as f:
+        raw = f.read()
+    doc = {
+        "path": path,
+        "content": raw.decode("utf-8"),
+        "metadata": {"filename": os.path.basename(path)},
+    }
+    return doc, hashlib.sha256(raw).hexdigest()
+
+
+@dataclass
+class ContentDelta:
+    """Markdown files that changed since the last manifest scan."""
+
+    added: List[Dict[str, str]] = field(default_factory=list)
+    changed: List[Dict[str, str]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def updated(self) -> List[Dict[str, str]]:
+        """Documents that downstream indexes need to (re)process."""
+        return self.added + self.changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class ContentManifest:
+    """Track path, mtime, size and content hash of ingested Markdown files.
+
+    :meth:`scan` only reads files whose mtime or size differ from the
+    manifest, and only reports them as changed when their hash differs too.
+    Call :meth:`save` once downstream consumers have applied the delta.
+    """
+
+    def __init__(self, path: str, files: Optional[Dict[str, Dict]] = None):
+        self.path = path
+        self.files: Dict[str, Dict] = files or {}
+
+    @classmethod
+    def load(cls, path: str) -> "ContentManifest":
+        """Read a manifest from ``path``; a missing file yields an empty one."""
+        if not os.path.isfile(path):
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(path, data.get("files", {}))
+
+    def scan(self, markdown_dir: str) -> ContentDelta:
+        """Compare ``markdown_dir`` against the manifest and update it in memory."""
+        delta = ContentDelta()
+        seen = set()
+        for path in sorted(glob.glob(os.path.join(markdown_dir, "*.md"))):
+            seen.add(path)
+            st = os.stat(path)
+            entry = self.files.get(path)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                delta.unchanged.append(path)
+                continue
+
+            doc, digest = _read_doc(path)
+            self.files[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+            if entry is None:
+                delta.added.append(doc)
+            elif entry["sha256"] != digest:
+                delta.changed.append(doc)
+            else:
+                delta.unchanged.append(path)
+
+        for path in sorted(set(self.files) - seen):
+            del self.files[path]
+            delta.removed.append(path)
+        return delta
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self.files}, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+def ingest_content_incremental(markdown_dir: str, manifest_path: str) -> ContentDelta:
+    """Scan ``markdown_dir`` against the manifest, save it, and return the delta."""
+    manifest = ContentManifest.load(manifest_path)
+    delta = manifest.scan(markdown_dir)
+    manifest.save()
+    return delta
+
+
+_hashing_engines: Dict[int, EmbeddingEngine] = {}
+
+
+def compute_embeddings(documents: List[str], backend: str = "hashing", dim: int = 256) -> np.ndarray:
+    """Embed documents locally and return a ``(len(documents), dim)`` float32 matrix.
+
+    The ``hashing`` engine is shared per dimension so repeated documents are
+    served from its content-hash cache. ``tfidf`` is fitted on ``documents``.
+    """
+    if backend == "hashing":
+        engine = _hashing_engines.get(dim)
+        if engine is None:
+            engine = _hashing_engines.setdefault(dim, EmbeddingEngine("hashing", dim=dim))
+    else:
+        engine = EmbeddingEngine(backend, dim=dim)
+    return engine.encode(documents)
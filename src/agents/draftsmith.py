@@ -1,5 +1,12 @@
-from groq import Groq
-from src.utils import get_groq_client
+from typing import AsyncIterator
+
+from src.llm import acomplete, astream, complete
+from src.prompt_budget import Prompt, fit
+from src.utils import get_async_groq_client, get_groq_client
+
+MODEL = "llama-3.3-70b-versatile"
+SYSTEM_PROMPT = "You are a skilled newsletter writer."
+
 
 class Draftsmith:
     """Generate a newsletter draft from an outline using Groq."""
@@ -7,29 +14,35 @@ class Draftsmith:
     def __init__(self):
         self.client = get_groq_client()
 
-    def create_draft(self, outline_md: str) -> str:
-        """Return a Markdown draft. Raises ValueError on empty outline."""
+    def _build_prompt(self, outline_md: str) -> str:
         if not outline_md.strip():
             raise ValueError("Outline Markdown cannot be empty.")
 
-        prompt = (
+        outline = fit(MODEL, outline_md)
+        return Prompt(
             "You are an expert newsletter writer. Using this outline:\n\n"
-            f"{outline_md}\n\n"
+            f"{outline.text}\n\n"
             "Write a 1,200-word draft in a minimal, direct tone. "
             "Insert a cover image placeholder <!-- COVER_IMAGE_HOOK --> at the top.\n"
             "Include any relevant data points or examples from the outline. "
-            "Output the result as Markdown."
+            "Output the result as Markdown.",
+            outline.tokens_saved,
         )
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a skilled newsletter writer."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as exc:
-            raise RuntimeError(f"Groq API call failed: {exc}")
-
-        return response.choices[0].message.content
+    def create_draft(self, outline_md: str) -> str:
+        """Return a Markdown draft. Raises ValueError on empty outline."""
+        prompt = self._build_prompt(outline_md)
+        return complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
+
+    async def acreate_draft(self, outline_md: str) -> str:
+        """Coroutine variant of :meth:`create_draft` using the shared async client."""
+        prompt = self._build_prompt(outline_md)
+        return await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
+
+    def astream_draft(self, outline_md: str) -> AsyncIterator[str]:
+        """Return an async iterator of draft text chunks as the model writes them.
+
+        The outline is validated immediately, before any request is made.
+        """
+        prompt = self._build_prompt(outline_md)
+        return astream(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
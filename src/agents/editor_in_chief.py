@@ -1,19 +1,113 @@
-from groq import Groq
+import asyncio
+import contextvars
+import json
 import re
-from src.utils import get_groq_client
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional
 
-class EditorInChief:
-    """Polish a draft with inline comments and summary using Groq."""
+from src.llm import acomplete, astream, complete
+from src.llm_cache import ResponseCache, cache_key
+from src.prompt_budget import count_tokens, input_budget
+from src.utils import get_async_groq_client, get_groq_client
+
+MODEL = "llama-3.1-8b-instant"
+SYSTEM_PROMPT = "You are an expert editor."
+SUMMARY_HEADING = "## Revision Summary"
+# Drafts longer than the model's per-input budget (about 6,000 tokens, or
+# 3,000 words, by default; see src.prompt_budget.input_budget) are edited
+# section by section, concurrently. A typical issue is edited in one call.
+# Short sections are merged with the next one until they reach this size.
+MIN_SECTION_TOKENS = 150
+MAX_PARALLEL_SECTIONS = 8
+SECTION_CACHE_ENTRIES = 512
+
+_SECTION_RE = re.compile(r"^#{1,2}\s")
+
+
+def split_sections(draft_md: str, min_tokens: int = MIN_SECTION_TOKENS) -> list[str]:
+    """Split a draft before each ``#`` or ``##`` heading outside code fences.
+
+    Consecutive sections are merged until each has at least ``min_tokens``
+    tokens, so a title or a one-paragraph section does not cost a call of
+    its own. A short trailing section joins the one before it.
+    """
+    sections, current, fenced = [], [], False
+    for line in draft_md.strip().split("\n"):
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+        if not fenced and _SECTION_RE.match(line) and count_tokens("\n".join(current)) >= min_tokens:
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    tail = "\n".join(current).strip()
+    if sections and count_tokens(tail) < min_tokens:
+        sections[-1] += "\n\n" + tail
+    elif tail:
+        sections.append(tail)
+    return sections
+
+
+class RevisionSummarySplitter:
+    """Route streamed text to the polished draft or the revision summary.
+
+    Text is emitted as ``("polished", text)`` until the ``## Revision
+    Summary`` heading appears (case-insensitively, even when split across
+    chunks) and as ``("summary", text)`` from the heading on. Only the last
+    few characters that could start the heading are held back.
+    """
+
+    _pattern = re.compile(re.escape(SUMMARY_HEADING), re.IGNORECASE)
 
     def __init__(self):
+        self._pending = ""
+        self.in_summary = False
+
+    def feed(self, text: str) -> list[tuple[str, str]]:
+        if self.in_summary:
+            return [("summary", text)] if text else []
+
+        buffer = self._pending + text
+        match = self._pattern.search(buffer)
+        if match:
+            self.in_summary = True
+            self._pending = ""
+            parts = [("polished", buffer[:match.start()]), ("summary", buffer[match.start():])]
+            return [p for p in parts if p[1]]
+
+        hold = len(SUMMARY_HEADING) - 1
+        emit, self._pending = buffer[:-hold], buffer[-hold:]
+        return [("polished", emit)] if emit else []
+
+    def flush(self) -> list[tuple[str, str]]:
+        pending, self._pending = self._pending, ""
+        if not pending:
+            return []
+        return [("summary" if self.in_summary else "polished", pending)]
+
+
+class EditorInChief:
+    """Polish a draft with inline comments and summary using Groq.
+
+    Long drafts are split with :func:`split_sections` and the sections are
+    edited concurrently, so the edit takes about as long as the longest
+    section. Edited sections are kept in ``section_cache`` by a hash of
+    their text, and a re-edit skips every section that has not changed. The
+    default cache is an in-memory LRU, shared by everyone using this
+    instance, and it is thread-safe.
+    """
+
+    def __init__(self, section_cache: Optional[ResponseCache] = None):
         self.client = get_groq_client()
+        self.sections = section_cache if section_cache is not None else ResponseCache(
+            max_entries=SECTION_CACHE_ENTRIES
+        )
 
-    def edit_draft(self, draft_md: str) -> tuple[str, str]:
-        """Return polished markdown and revision summary."""
+    def _build_prompt(self, draft_md: str) -> str:
         if not draft_md.strip():
             raise ValueError("Draft Markdown cannot be empty.")
 
-        prompt = (
+        # The edit returns the whole draft verbatim, so it is never compacted.
+        return (
             "You are a meticulous editor. Polish the following draft:\n\n"
             f"{draft_md}\n\n"
             "- Improve clarity and flow.\n"
@@ -23,19 +117,67 @@ class EditorInChief:
             "Output the entire result as Markdown."
         )
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are an expert editor."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as exc:
-            raise RuntimeError(f"Groq API call failed: {exc}")
-
-        edited_md = response.choices[0].message.content
+    def _build_section_prompt(self, section_md: str) -> str:
+        return (
+            "You are a meticulous editor. Polish the following section of a longer newsletter draft:\n\n"
+            f"{section_md}\n\n"
+            "- Improve clarity and flow.\n"
+            "- Enforce a minimal, direct brand voice.\n"
+            "- Keep its headings and any <!-- ... --> placeholders unchanged.\n"
+            "- Insert inline comments prefaced by \">> COMMENT:\" where suggestions apply.\n"
+            "- At the end, include a \"## Revision Summary\" section that lists major changes to this section.\n\n"
+            "Output only the edited section and its summary as Markdown."
+        )
+
+    def _chunks(self, draft_md: str, chunked: Optional[bool]) -> Optional[list[str]]:
+        """Return the sections to edit separately, or ``None`` for a single edit."""
+        if not draft_md.strip():
+            raise ValueError("Draft Markdown cannot be empty.")
+        if chunked is False or (chunked is None and count_tokens(draft_md) <= input_budget(MODEL)):
+            return None
+        sections = split_sections(draft_md)
+        return sections if len(sections) > 1 else None
+
+    def _cached_section(self, section_md: str) -> tuple[str, str, Optional[tuple[str, str]]]:
+        prompt = self._build_section_prompt(section_md)
+        key = cache_key(MODEL, SYSTEM_PROMPT, prompt)
+        hit = self.sections.get(key)
+        return prompt, key, tuple(json.loads(hit)) if hit is not None else None
+
+    def _edit_section(self, section_md: str) -> tuple[str, str]:
+        prompt, key, hit = self._cached_section(section_md)
+        if hit is not None:
+            return hit
+        result = self._split_summary(complete(self.client, MODEL, SYSTEM_PROMPT, prompt))
+        self.sections.set(key, json.dumps(result))
+        return result
+
+    async def _aedit_section(self, section_md: str) -> tuple[str, str]:
+        prompt, key, hit = self._cached_section(section_md)
+        if hit is not None:
+            return hit
+        edited_md = await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
+        result = self._split_summary(edited_md)
+        self.sections.set(key, json.dumps(result))
+        return result
+
+    @staticmethod
+    def _merge_summaries(summaries: list[str]) -> str:
+        """Combine per-section revision summaries under one heading."""
+        lines = []
+        for summary in summaries:
+            body = summary.split("\n", 1)[1] if "\n" in summary else ""
+            lines += [line for line in body.strip().split("\n") if line.strip()]
+        lines = list(dict.fromkeys(lines))
+        return f"{SUMMARY_HEADING}\n" + "\n".join(lines) if lines else ""
 
+    @classmethod
+    def _stitch(cls, results: list[tuple[str, str]]) -> tuple[str, str]:
+        polished = "\n\n".join(p.strip() for p, _ in results if p.strip())
+        return polished, cls._merge_summaries([s for _, s in results])
+
+    @staticmethod
+    def _split_summary(edited_md: str) -> tuple[str, str]:
         match = re.search(r"## Revision Summary", edited_md, re.IGNORECASE)
         if match:
             idx = match.start()
@@ -44,5 +186,75 @@ class EditorInChief:
         else:
             polished = edited_md
             summary = ""
-
         return polished, summary
+
+    def edit_draft(self, draft_md: str, chunked: Optional[bool] = None) -> tuple[str, str]:
+        """Return polished markdown and revision summary.
+
+        ``chunked`` forces section-by-section editing on or off; by default
+        drafts over the model's input budget
+        (:func:`~src.prompt_budget.input_budget`) are chunked.
+        """
+        sections = self._chunks(draft_md, chunked)
+        if sections is not None:
+            workers = min(len(sections), MAX_PARALLEL_SECTIONS)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="edit-section") as pool:
+                # Sections inherit the caller's stage and priority.
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._edit_section, section)
+                    for section in sections
+                ]
+                return self._stitch([f.result() for f in futures])
+        prompt = self._build_prompt(draft_md)
+        edited_md = complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
+        return self._split_summary(edited_md)
+
+    async def aedit_draft(self, draft_md: str, chunked: Optional[bool] = None) -> tuple[str, str]:
+        """Coroutine variant of :meth:`edit_draft` using the shared async client."""
+        sections = self._chunks(draft_md, chunked)
+        if sections is not None:
+            return self._stitch(await asyncio.gather(*(self._aedit_section(s) for s in sections)))
+        prompt = self._build_prompt(draft_md)
+        edited_md = await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
+        return self._split_summary(edited_md)
+
+    def astream_edit(
+        self, draft_md: str, chunked: Optional[bool] = None
+    ) -> AsyncIterator[tuple[str, str]]:
+        """Return an async iterator of ``(part, text)`` chunks of the edit.
+
+        ``part`` is ``"polished"`` or ``"summary"``; see
+        :class:`RevisionSummarySplitter`. The draft is validated immediately.
+        A chunked edit yields each polished section, in order, as soon as it
+        and the sections before it are done, then the merged summary.
+        """
+        sections = self._chunks(draft_md, chunked)
+        if sections is not None:
+            return self._stream_sections(sections)
+        prompt = self._build_prompt(draft_md)
+        return self._split_stream(astream(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt))
+
+    @staticmethod
+    async def _split_stream(deltas: AsyncIterator[str]) -> AsyncIterator[tuple[str, str]]:
+        splitter = RevisionSummarySplitter()
+        async for delta in deltas:
+            for part in splitter.feed(delta):
+                yield part
+        for part in splitter.flush():
+            yield part
+
+    async def _stream_sections(self, sections: list[str]) -> AsyncIterator[tuple[str, str]]:
+        tasks = [asyncio.ensure_future(self._aedit_section(s)) for s in sections]
+        try:
+            summaries = []
+            for i, task in enumerate(tasks):
+                polished, summary = await task
+                summaries.append(summary)
+                if polished.strip():
+                    yield "polished", ("\n\n" if i else "") + polished.strip()
+            merged = self._merge_summaries(summaries)
+            if merged:
+                yield "summary", merged
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,19 +1,52 @@
 # src/agents/formatter.py
 
+import asyncio
 import os
-import shutil
 import json
+import threading
 import zipfile
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from ..assets import AssetPipeline
+
+# Already-compressed formats gain nothing from deflate; store them as-is.
+STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif"}
+CHUNK_SIZE = 1 << 20
+
+
+class _ChunkSink:
+    """Write-only file object that buffers bytes for streaming.
+
+    ``zipfile`` detects that it cannot seek and writes data descriptors
+    instead, so the archive is produced strictly front to back.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
 
 class Formatter:
     """Create a Substack-ready package from draft, cover image, and metadata."""
 
-    def __init__(self, output_root: str = "package"):
+    def __init__(self, output_root: str = "package", assets: Optional[AssetPipeline] = None):
         self.output_root = Path(output_root)
+        self.assets = assets or AssetPipeline()
 
-    def package_for_substack(
+    def _entries(
         self,
         draft_path: str,
         cover_image_path: str,
@@ -21,9 +54,12 @@ class Formatter:
         slug: str,
         tags: list[str],
         publish_date: str,
-    ) -> str:
-        """Create package/YYYY-MM-DD.zip and return its path."""
+    ) -> tuple[str, list[tuple[str, Union[bytes, Path]]]]:
+        """Validate inputs and return ``(folder, [(arcname, bytes or file path), ...])``.
 
+        Images referenced by the draft are collected, optimized and renamed
+        by :class:`~src.assets.AssetPipeline`, and the links rewritten.
+        """
         draft_file = Path(draft_path)
         if not draft_file.is_file():
             raise FileNotFoundError(f"Draft file not found at {draft_path}")
@@ -42,43 +78,125 @@ class Formatter:
         except Exception:
             raise ValueError("Publish date must be in ISO 8601 format.")
 
-        date_folder = datetime.now().strftime("%Y-%m-%d")
-        pkg_dir = self.output_root / date_folder
-        images_dir = pkg_dir / "images"
-
+        folder = datetime.now().strftime("%Y-%m-%d")
         try:
-            if pkg_dir.exists():
-                shutil.rmtree(pkg_dir)
-            images_dir.mkdir(parents=True)
-
-            draft_text = draft_file.read_text(encoding="utf-8")
-            issue_md = f"![Cover](images/cover.png)\n\n{draft_text}"
-            (pkg_dir / "Issue.md").write_text(issue_md, encoding="utf-8")
-
-            dest_cover = images_dir / "cover.png"
-            shutil.copy2(cover_file, dest_cover)
-
-            metadata = {
-                "title": title,
-                "slug": slug,
-                "tags": tags,
-                "publish_date": publish_date,
-            }
-            (pkg_dir / "metadata.json").write_text(
-                json.dumps(metadata, ensure_ascii=False, indent=2), encoding="utf-8"
+            draft_text, cover, assets = self.assets.prepare(
+                draft_file.read_text(encoding="utf-8"), str(draft_file.parent), cover_image_path
             )
+        except Exception as e:
+            raise RuntimeError(f"Packaging failed: {e}")
+        metadata = {
+            "title": title,
+            "slug": slug,
+            "tags": tags,
+            "publish_date": publish_date,
+        }
+        return folder, [
+            (f"{folder}/Issue.md", f"![Cover]({cover.arcname})\n\n{draft_text}".encode("utf-8")),
+            *((f"{folder}/{asset.arcname}", asset.path) for asset in assets),
+            (
+                f"{folder}/metadata.json",
+                json.dumps(metadata, ensure_ascii=False, indent=2).encode("utf-8"),
+            ),
+        ]
+
+    @staticmethod
+    def _write_entries(zf: zipfile.ZipFile, entries) -> Iterator[None]:
+        """Write entries into ``zf``, yielding after every chunk written.
+
+        Files are copied from their handles in ``CHUNK_SIZE`` blocks; image
+        formats in ``STORED_SUFFIXES`` are stored rather than deflated.
+        """
+        for arcname, source in entries:
+            if isinstance(source, bytes):
+                zf.writestr(arcname, source, compress_type=zipfile.ZIP_DEFLATED)
+                yield
+                continue
+            info = zipfile.ZipInfo.from_file(source, arcname)
+            info.compress_type = (
+                zipfile.ZIP_STORED if source.suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+            )
+            with open(source, "rb") as src, zf.open(info, "w") as dest:
+                for block in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dest.write(block)
+                    yield
+
+    def package_for_substack(
+        self,
+        draft_path: str,
+        cover_image_path: str,
+        title: str,
+        slug: str,
+        tags: list[str],
+        publish_date: str,
+    ) -> str:
+        """Create package/YYYY-MM-DD.zip and return its path.
+
+        Entries are written straight into the archive; the ZIP is built under
+        a temporary name and published with ``os.replace``.
+        """
+        folder, entries = self._entries(draft_path, cover_image_path, title, slug, tags, publish_date)
+        zip_path = self.output_root / f"{folder}.zip"
+        tmp = self.output_root / f".{folder}.zip.{os.getpid()}.{threading.get_ident()}.tmp"
 
-            zip_path = self.output_root / f"{date_folder}.zip"
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                for root, _, files in os.walk(pkg_dir):
-                    for file in files:
-                        fp = Path(root) / file
-                        zf.write(fp, arcname=str(fp.relative_to(self.output_root)))
+        try:
+            self.output_root.mkdir(parents=True, exist_ok=True)
+            with zipfile.ZipFile(tmp, "w") as zf:
+                for _ in self._write_entries(zf, entries):
+                    pass
+            os.replace(tmp, zip_path)
             return str(zip_path)
         except Exception as e:
-            if pkg_dir.exists():
-                shutil.rmtree(pkg_dir)
-            zp = self.output_root / f"{date_folder}.zip"
-            if zp.exists():
-                zp.unlink()
+            if tmp.exists():
+                tmp.unlink()
             raise RuntimeError(f"Packaging failed: {e}")
+
+    def stream_package(
+        self,
+        draft_path: str,
+        cover_image_path: str,
+        title: str,
+        slug: str,
+        tags: list[str],
+        publish_date: str,
+    ) -> tuple[str, Iterator[bytes]]:
+        """Validate inputs and return ``(filename, chunks)`` for an in-memory ZIP stream.
+
+        The ZIP itself is built in memory; only processed images are written,
+        to the asset cache (``ASSET_CACHE_DIR``). Validation errors are raised
+        here, before the first chunk, so callers can still report them.
+        """
+        folder, entries = self._entries(draft_path, cover_image_path, title, slug, tags, publish_date)
+
+        def chunks() -> Iterator[bytes]:
+            sink = _ChunkSink()
+            with zipfile.ZipFile(sink, "w") as zf:
+                for _ in self._write_entries(zf, entries):
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+
+        return f"{folder}.zip", chunks()
+
+    async def apackage_for_substack(
+        self,
+        draft_path: str,
+        cover_image_path: str,
+        title: str,
+        slug: str,
+        tags: list[str],
+        publish_date: str,
+    ) -> str:
+        """Run :meth:`package_for_substack` in a worker thread."""
+        return await asyncio.to_thread(
+            self.package_for_substack,
+            draft_path,
+            cover_image_path,
+            title,
+            slug,
+            tags,
+            publish_date,
+        )
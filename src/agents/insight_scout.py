@@ -1,7 +1,15 @@
-import os
+import asyncio
+
 import pandas as pd
 
-from ..utils import get_groq_client
+from .. import analytics
+from ..archive_index import format_passages
+from ..llm import acomplete, complete
+from ..metrics_store import load_metrics
+from ..utils import get_async_groq_client, get_groq_client
+
+MODEL = "compound-beta"
+SYSTEM_PROMPT = "You are an expert research assistant."
 
 
 class InsightScout:
@@ -11,40 +19,19 @@ class InsightScout:
         self.client = get_groq_client()
 
     def _extract_pain_points(self, df: pd.DataFrame, top_n: int = 3) -> list[str]:
-        """Return a list of pain point strings based on reply engagement."""
-        df = df.copy()
-        df["RepliesPerK"] = df["ReplyCount"] / (df["Subscribers"] / 1000)
-        df_sorted = df.sort_values("RepliesPerK", ascending=True).head(top_n)
-        points = []
-        for _, row in df_sorted.iterrows():
-            date_str = row["IssueDate"].strftime("%Y-%m-%d")
-            rp = round(row["RepliesPerK"], 2)
-            points.append(
-                f"- **{date_str}**: only {rp} replies per 1k subscribers "
-                f"(ReplyCount={row['ReplyCount']}, Subscribers={row['Subscribers']})"
-            )
-        return points
+        """Return a list of pain point strings based on reply engagement.
 
-    def fetch_research_brief(self, csv_path: str, query: str) -> str:
-        """Return Markdown brief of pain points plus trending articles."""
-        if not os.path.isfile(csv_path):
-            raise FileNotFoundError(f"Metrics CSV not found at {csv_path}")
+        Exports with a segment or cohort column get the lowest issues per segment.
+        """
+        return analytics.pain_points(df, top_n=top_n, by=analytics.segment_column(df))
 
-        df = pd.read_csv(csv_path)
-        required = {"IssueDate", "SubjectLine", "OpenRate", "ClickRate", "ReplyCount", "Subscribers"}
-        missing = required - set(df.columns)
-        if missing:
-            raise ValueError(f"Metrics CSV is missing required columns: {missing}")
-
-        df["IssueDate"] = pd.to_datetime(df["IssueDate"], format="%Y-%m-%d")
+    def _build_prompt(self, csv_path: str, query: str, archive=None) -> tuple[str, str]:
+        """Return the LLM prompt and the locally computed pain-point Markdown."""
+        df = load_metrics(csv_path)
         pain_points = self._extract_pain_points(df, top_n=3)
         pain_markdown = "## Pain Points\n" + "\n".join(pain_points)
 
-        recent = df.sort_values("IssueDate", ascending=False).head(3)
-        metrics_excerpt = "\n".join(
-            f"{row.IssueDate.strftime('%Y-%m-%d')}, {row.OpenRate}%, {row.ClickRate}%, {row.ReplyCount} replies, {row.Subscribers} subs"
-            for _, row in recent.iterrows()
-        )
+        metrics_excerpt = analytics.metrics_excerpt(df, 3)
 
         prompt = (
             "You are a data-driven newsletter researcher.\n"
@@ -54,19 +41,33 @@ class InsightScout:
             f"(2) Perform a web search for \"{query}\" and list 3 recent article headlines + URLs under '## Trending Articles'.\n"
             "(3) Format the entire response as Markdown, with the two sections '## Pain Points' and '## Trending Articles'."
         )
+        if archive is not None:
+            passages = archive.search(query, k=3)
+            if passages:
+                prompt += (
+                    "\n\nRelevant passages from past issues (avoid repeating them):\n"
+                    + format_passages(passages)
+                )
+        return prompt, pain_markdown
 
-        try:
-            response = self.client.chat.completions.create(
-                model="compound-beta",
-                messages=[
-                    {"role": "system", "content": "You are an expert research assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as exc:
-            raise RuntimeError(f"Groq API call failed: {exc}")
-
-        content = response.choices[0].message.content
+    @staticmethod
+    def _ensure_pain_points(content: str, pain_markdown: str) -> str:
         if "## Pain Points" not in content:
             content = pain_markdown + "\n\n" + content
         return content
+
+    def fetch_research_brief(self, csv_path: str, query: str, archive=None) -> str:
+        """Return Markdown brief of pain points plus trending articles.
+
+        If ``archive`` (an :class:`~src.archive_index.ArchiveIndex`) is given,
+        the past passages closest to ``query`` are added to the prompt.
+        """
+        prompt, pain_markdown = self._build_prompt(csv_path, query, archive)
+        content = complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
+        return self._ensure_pain_points(content, pain_markdown)
+
+    async def afetch_research_brief(self, csv_path: str, query: str, archive=None) -> str:
+        """Coroutine variant of :meth:`fetch_research_brief`."""
+        prompt, pain_markdown = await asyncio.to_thread(self._build_prompt, csv_path, query, archive)
+        content = await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
+        return self._ensure_pain_points(content, pain_markdown)
@@ -1,8 +1,23 @@
-import os
-from typing import List
+import asyncio
+from typing import List, Optional
+
 import pandas as pd
 
-from src.utils import get_groq_client
+from src import analytics
+from src.forecasting import fitted_forecaster, rank_subjects
+from src.llm import acomplete, complete
+from src.metrics_store import load_metrics
+from src.utils import get_async_groq_client, get_groq_client
+
+MODEL = "llama-3.1-8b-instant"
+SYSTEM_PROMPT = "You are a forecasting expert."
+# Only the best candidates are described to the LLM, however many are scored.
+NARRATIVE_CANDIDATES = 10
+
+
+def _cell(text: str) -> str:
+    """Escape a value for a Markdown table cell."""
+    return text.replace("|", "\\|")
 
 
 class MetricsForecaster:
@@ -11,63 +26,94 @@ class MetricsForecaster:
     def __init__(self):
         self.client = get_groq_client()
 
-    def forecast(self, csv_path: str, subject_lines: List[str]) -> str:
-        """Return a Markdown forecast report given a metrics CSV and subjects."""
+    def _history(self, csv_path: str, subject_lines: List[str]):
         if not subject_lines or not any(s.strip() for s in subject_lines):
             raise ValueError("At least one subject line is required.")
+        return load_metrics(csv_path, required={"IssueDate", "SubjectLine", "OpenRate"})
+
+    @staticmethod
+    def _stub(subject_lines: List[str]) -> str:
+        stub = (
+            "## Stub Forecast\n"
+            "Insufficient historical data (fewer than 3 issues). Using generic benchmark:\n\n"
+            "- Subject Lines to test:\n"
+        )
+        for s in subject_lines:
+            stub += f"  - \"{s}\": Predicted open rate = ~15%\n"
+        stub += (
+            "\n- Recommended send date/time: Next weekday at 09:00 UTC+3\n"
+            "- Suggested segmentation: Top 20% most engaged subscribers as a test group.\n"
+        )
+        return stub
+
+    def score(self, csv_path: str, subject_lines: List[str]) -> pd.DataFrame:
+        """Score candidates locally, best first (see :func:`src.forecasting.rank_subjects`)."""
+        self._history(csv_path, subject_lines)
+        return rank_subjects(csv_path, subject_lines)
+
+    def _build_prompt(self, csv_path: str, subject_lines: List[str]) -> tuple[Optional[str], str]:
+        """Return ``(narrative_prompt, report)``; the prompt is ``None`` for a stub report.
 
-        if not os.path.isfile(csv_path):
-            raise FileNotFoundError(f"Metrics CSV not found at {csv_path}")
-
-        df = pd.read_csv(csv_path)
-        required_cols = {"IssueDate", "SubjectLine", "OpenRate"}
-        missing = required_cols - set(df.columns)
-        if missing:
-            raise ValueError(f"Metrics CSV is missing required columns: {missing}")
-
-        df["IssueDate"] = pd.to_datetime(df["IssueDate"], format="%Y-%m-%d")
-        df_sorted = df.sort_values("IssueDate", ascending=False).reset_index(drop=True)
-        recent = df_sorted.head(5)
-
-        hist_lines = [
-            f"- {row.IssueDate.strftime('%Y-%m-%d')}: \"{row.SubjectLine}\" \u2192 {row.OpenRate}%"
-            for _, row in recent.iterrows()
-        ]
-        hist_markdown = "\n".join(hist_lines)
-
-        if len(recent) < 3:
-            stub = (
-                "## Stub Forecast\n"
-                "Insufficient historical data (fewer than 3 issues). Using generic benchmark:\n\n"
-                "- Subject Lines to test:\n"
-            )
-            for s in subject_lines:
-                stub += f"  - \"{s}\": Predicted open rate = ~15%\n"
-            stub += (
-                "\n- Recommended send date/time: Next weekday at 09:00 UTC+3\n"
-                "- Suggested segmentation: Top 20% most engaged subscribers as a test group.\n"
-            )
-            return stub
-
-        subj_md = "\n".join(f'- "{s}"' for s in subject_lines)
+        The report's numbers come from :class:`~src.forecasting.OpenRateForecaster`;
+        the LLM is only asked to explain them.
+        """
+        df = self._history(csv_path, subject_lines)
+        if len(df.dropna(subset=["IssueDate", "SubjectLine", "OpenRate"])) < 3:
+            return None, self._stub(subject_lines)
+
+        model = fitted_forecaster(csv_path)
+        scores = model.predict(subject_lines).sort_values("open_rate", ascending=False, kind="stable")
+        send_date = model.next_issue_date()
+        best_day = model.best_weekday()
+
+        pct = int(round(model.confidence * 100))
+        rows = "\n".join(
+            f'| "{_cell(subject)}" | {rate:.1f}% | {low:.1f}\u2013{high:.1f}% |'
+            for subject, rate, low, high in scores.itertuples(index=False)
+        )
+        report = (
+            "## Forecast\n"
+            f"Local model over {len(model.history)} past issues: trend and weekday baseline, "
+            f"ridge regression on subject-line features, {pct}% bootstrap intervals.\n\n"
+            f"| Subject line | Predicted open rate | {pct}% interval |\n"
+            "|---|---|---|\n"
+            f"{rows}\n\n"
+            f"- Recommended send date/time: {send_date.strftime('%Y-%m-%d')} ({send_date.day_name()}) at 09:00 UTC+3; "
+            f"historically strongest weekday: {best_day}\n"
+            "- Suggested segmentation: Top 20% most engaged subscribers as a test group.\n"
+        )
+
+        recent = analytics.recent(df, 5)
+        top = scores.head(NARRATIVE_CANDIDATES)
+        top_md = "\n".join(
+            f'- "{subject}": {rate:.1f}% ({low:.1f}\u2013{high:.1f}%)'
+            for subject, rate, low, high in top.itertuples(index=False)
+        )
         prompt = (
             f"You are a data analyst. Here are the last {len(recent)} issues (Date: Subject \u2192 OpenRate%):\n"
-            f"{hist_markdown}\n\n"
-            f"Predict an open rate for each of these candidate subject lines:\n{subj_md}\n\n"
-            "Also recommend an optimal send date/time (weekday at 09:00 UTC+3) "
-            "and a segmentation strategy for the top 20% engaged subscribers. "
-            "Format your response in Markdown."
+            f"{analytics.subject_history(recent)}\n\n"
+            f"A statistical model predicts these open rates for the top candidate subject lines:\n{top_md}\n\n"
+            f"The recommended send date is {send_date.strftime('%Y-%m-%d')} at 09:00 UTC+3. "
+            "Do not change the numbers. Under '## Narrative', explain in 3-5 bullet points why the "
+            "leading candidates are expected to perform better and suggest a segmentation strategy "
+            "for the top 20% engaged subscribers. Format your response in Markdown."
         )
+        return prompt, report
+
+    def forecast(self, csv_path: str, subject_lines: List[str], narrative: bool = True) -> str:
+        """Return a Markdown forecast report given a metrics CSV and subjects.
+
+        Predictions are computed locally; with ``narrative=True`` an LLM-written
+        explanation is appended.
+        """
+        prompt, report = self._build_prompt(csv_path, subject_lines)
+        if prompt is None or not narrative:
+            return report
+        return report + "\n" + complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are a forecasting expert."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as e:
-            raise RuntimeError(f"Groq API call failed: {e}")
-
-        return response.choices[0].message.content
+    async def aforecast(self, csv_path: str, subject_lines: List[str], narrative: bool = True) -> str:
+        """Coroutine variant of :meth:`forecast`; the model is fit in a worker thread."""
+        prompt, report = await asyncio.to_thread(self._build_prompt, csv_path, subject_lines)
+        if prompt is None or not narrative:
+            return report
+        return report + "\n" + await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
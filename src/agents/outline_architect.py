@@ -1,5 +1,13 @@
-from groq import Groq
-from src.utils import get_groq_client
+import asyncio
+
+from src.archive_index import format_passages
+from src.llm import acomplete, complete
+from src.prompt_budget import Prompt, count_tokens, fit
+from src.utils import get_async_groq_client, get_groq_client
+
+MODEL = "llama-3.3-70b-versatile"
+SYSTEM_PROMPT = "You are a newsletter outline expert."
+
 
 class OutlineArchitect:
     """Generate newsletter outlines from research and issue briefs using Groq."""
@@ -7,34 +15,45 @@ class OutlineArchitect:
     def __init__(self):
         self.client = get_groq_client()
 
-    def generate_outlines(self, research_brief: str, issue_brief: str) -> str:
-        """Return Markdown outlines. Raises ValueError on empty input."""
+    def _build_prompt(self, research_brief: str, issue_brief: str, archive=None) -> str:
         if not research_brief.strip():
             raise ValueError("Research brief cannot be empty.")
         if not issue_brief.strip():
             raise ValueError("Issue brief cannot be empty.")
 
-        prompt = (
+        past = ""
+        if archive is not None:
+            passages = archive.search(issue_brief, k=3)
+            if passages:
+                past = (
+                    "Related passages from past issues (build on them, don't repeat them):\n"
+                    f"{format_passages(passages)}\n\n"
+                )
+
+        research = fit(MODEL, research_brief, reserved=count_tokens(past))
+        return Prompt(
             "You are a professional newsletter strategist.\n\n"
-            f"Research Brief:\n{research_brief}\n\n"
+            f"Research Brief:\n{research.text}\n\n"
+            f"{past}"
             f"Issue Brief: \"{issue_brief}\"\n\n"
             "Generate 3 distinct outlines. Each outline must include:\n"
             "- A heading `# Outline Option N` (where N is 1, 2, or 3).\n"
             "- 3\u20135 section headers with 1\u20132 sentence descriptions.\n"
             "- 3 candidate subject lines under a subheading `## Subject Line Candidates`.\n\n"
-            "Format the entire response in Markdown."
+            "Format the entire response in Markdown.",
+            research.tokens_saved,
         )
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a newsletter outline expert."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as exc:
-            raise RuntimeError(f"Groq API call failed: {exc}")
-
-        outlines_md = response.choices[0].message.content
-        return outlines_md
+    def generate_outlines(self, research_brief: str, issue_brief: str, archive=None) -> str:
+        """Return Markdown outlines. Raises ValueError on empty input.
+
+        If ``archive`` is given, past passages related to the issue brief are
+        included so the outlines can reference earlier issues.
+        """
+        prompt = self._build_prompt(research_brief, issue_brief, archive)
+        return complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
+
+    async def agenerate_outlines(self, research_brief: str, issue_brief: str, archive=None) -> str:
+        """Coroutine variant of :meth:`generate_outlines`."""
+        prompt = await asyncio.to_thread(self._build_prompt, research_brief, issue_brief, archive)
+        return await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
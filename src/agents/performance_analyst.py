@@ -1,7 +1,13 @@
-import os
-import pandas as pd
-from groq import Groq
-from src.utils import get_groq_client
+import asyncio
+
+from src import analytics
+from src.llm import acomplete, complete
+from src.metrics_store import load_metrics
+from src.prompt_budget import Prompt, fit
+from src.utils import get_async_groq_client, get_groq_client
+
+MODEL = "llama-3.3-70b-versatile"
+SYSTEM_PROMPT = "You are a data-driven performance analyst."
 
 
 class PerformanceAnalyst:
@@ -10,44 +16,30 @@ class PerformanceAnalyst:
     def __init__(self):
         self.client = get_groq_client()
 
-    def analyze(self, forecast_md: str, actuals_csv_path: str) -> str:
-        """Return a Markdown lessons-learned report."""
+    def _build_prompt(self, forecast_md: str, actuals_csv_path: str) -> str:
         if not forecast_md.strip():
             raise ValueError("Forecast Markdown cannot be empty.")
-        if not os.path.isfile(actuals_csv_path):
-            raise FileNotFoundError(f"Actuals CSV not found at {actuals_csv_path}")
-
-        df = pd.read_csv(actuals_csv_path)
-        required = {"IssueDate", "OpenRate", "ClickRate"}
-        missing = required - set(df.columns)
-        if missing:
-            raise ValueError(f"Actuals CSV missing columns: {missing}")
-
-        df["IssueDate"] = pd.to_datetime(df["IssueDate"], format="%Y-%m-%d")
-        df = df.sort_values("IssueDate", ascending=False)
-        rows = df.head(5).to_dict(orient="records")
-        actuals_lines = "\n".join(
-            f"- {r['IssueDate'].strftime('%Y-%m-%d')}: OpenRate={r['OpenRate']}%, ClickRate={r['ClickRate']}%"
-            for r in rows
+        df = load_metrics(
+            actuals_csv_path, required={"IssueDate", "OpenRate", "ClickRate"}, label="Actuals CSV"
         )
+        actuals_lines = analytics.open_click_history(analytics.recent(df, 5))
 
-        prompt = (
+        forecast = fit(MODEL, forecast_md)
+        return Prompt(
             "You are a performance analyst. Here is the forecast:\n\n"
-            f"{forecast_md}\n\n"
+            f"{forecast.text}\n\n"
             "And here are the actual post-send metrics (Date: OpenRate%, ClickRate%):\n"
             f"{actuals_lines}\n\n"
-            "Compare predicted vs. actual. Under '## Lessons Learned', list 3 bullet points noting accuracy, discrepancies, and recommendations. Output as Markdown."
+            "Compare predicted vs. actual. Under '## Lessons Learned', list 3 bullet points noting accuracy, discrepancies, and recommendations. Output as Markdown.",
+            forecast.tokens_saved,
         )
 
-        try:
-            resp = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a data-driven performance analyst."},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-        except Exception as exc:
-            raise RuntimeError(f"Groq API call failed: {exc}")
-
-        return resp.choices[0].message.content
+    def analyze(self, forecast_md: str, actuals_csv_path: str) -> str:
+        """Return a Markdown lessons-learned report."""
+        prompt = self._build_prompt(forecast_md, actuals_csv_path)
+        return complete(self.client, MODEL, SYSTEM_PROMPT, prompt)
+
+    async def aanalyze(self, forecast_md: str, actuals_csv_path: str) -> str:
+        """Coroutine variant of :meth:`analyze`."""
+        prompt = await asyncio.to_thread(self._build_prompt, forecast_md, actuals_csv_path)
+        return await acomplete(get_async_groq_client(), MODEL, SYSTEM_PROMPT, prompt)
@@ -0,0 +1,104 @@
+from typing import Optional
+
+import pandas as pd
+
+SEGMENT_COLUMNS = ("Segment", "Cohort")
+
+
+def segment_column(df: pd.DataFrame) -> Optional[str]:
+    """Return the first segment/cohort column present in ``df``, if any."""
+    return next((c for c in SEGMENT_COLUMNS if c in df.columns), None)
+
+
+def replies_per_k(df: pd.DataFrame) -> pd.Series:
+    """Replies per 1,000 subscribers for every row."""
+    return df["ReplyCount"] / (df["Subscribers"] / 1000)
+
+
+def _dates(df: pd.DataFrame) -> pd.Series:
+    return df["IssueDate"].dt.strftime("%Y-%m-%d")
+
+
+def _text(series: pd.Series) -> pd.Series:
+    return series.astype(str)
+
+
+def lowest(values: pd.Series, n: int, by: Optional[pd.Series] = None) -> pd.Index:
+    """Index labels of the ``n`` smallest values, overall or within each ``by`` group.
+
+    Uses a partial selection (``nsmallest``, per group when grouped) rather
+    than a full sort; ties keep row order. Grouped results are ordered by
+    group, then by value.
+    """
+    if n <= 0 or values.empty:
+        return values.index[:0]
+    if by is None:
+        return values.nsmallest(n).index
+    return values.groupby(by).nsmallest(n).index.get_level_values(-1)
+
+
+def pain_points(df: pd.DataFrame, top_n: int = 3, by: Optional[str] = None) -> list[str]:
+    """Markdown bullets for the issues with the fewest replies per 1k subscribers.
+
+    With ``by`` (a segment or cohort column), the ``top_n`` lowest issues of
+    each segment are listed, prefixed with the segment name.
+    """
+    rate = replies_per_k(df)
+    idx = lowest(rate, top_n, df[by] if by else None)
+    rows = df.loc[idx]
+    prefix = "- **" if by is None else "- [" + _text(rows[by]) + "] **"
+    lines = (
+        prefix
+        + _dates(rows)
+        + "**: only "
+        + _text(rate[idx].round(2))
+        + " replies per 1k subscribers (ReplyCount="
+        + _text(rows["ReplyCount"])
+        + ", Subscribers="
+        + _text(rows["Subscribers"])
+        + ")"
+    )
+    return lines.tolist()
+
+
+def recent(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """The ``n`` most recent rows by ``IssueDate``, newest first."""
+    return df.nlargest(n, "IssueDate")
+
+
+def metrics_excerpt(df: pd.DataFrame, n: int = 3) -> str:
+    """Recent issues as ``date, open%, click%, replies, subs`` lines."""
+    rows = recent(df, n)
+    lines = (
+        _dates(rows)
+        + ", "
+        + _text(rows["OpenRate"])
+        + "%, "
+        + _text(rows["ClickRate"])
+        + "%, "
+        + _text(rows["ReplyCount"])
+        + " replies, "
+        + _text(rows["Subscribers"])
+        + " subs"
+    )
+    return "\n".join(lines)
+
+
+def subject_history(rows: pd.DataFrame) -> str:
+    """Subject lines and open rates as Markdown bullets."""
+    lines = "- " + _dates(rows) + ': "' + _text(rows["SubjectLine"]) + '" \u2192 ' + _text(rows["OpenRate"]) + "%"
+    return "\n".join(lines)
+
+
+def open_click_history(rows: pd.DataFrame) -> str:
+    """Open and click rates as Markdown bullets."""
+    lines = (
+        "- "
+        + _dates(rows)
+        + ": OpenRate="
+        + _text(rows["OpenRate"])
+        + "%, ClickRate="
+        + _text(rows["ClickRate"])
+        + "%"
+    )
+    return "\n".join(lines)
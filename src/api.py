@@ -1,262 +1,132 @@
+import importlib
 import os
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from src.agents.insight_scout import InsightScout
-from src.orchestrator import run_pipeline
-
-app = FastAPI(title="Newsletter Agent API")
-
-
-class ResearchRequest(BaseModel):
-    csv_path: str
-    query: str
-
-
-class ResearchResponse(BaseModel):
-    research_brief: str
-
-
-@app.post("/api/generate-research", response_model=ResearchResponse)
-async def generate_research(req: ResearchRequest):
-    """Generate a research brief from metrics CSV and search query."""
-    scout = InsightScout()
-    try:
-        brief = scout.fetch_research_brief(req.csv_path, req.query)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Metrics CSV not found.")
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return ResearchResponse(research_brief=brief)
+import sys
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, Tuple
+
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.instrumentation import METRICS, limiter_gauges
+from src.jobs import jobs_db_path
+from src.rate_limit import get_rate_limiter
+from src.registry import get_registry
+from src.utils import close_async_groq_client, close_groq_client
+
+# Router modules and the path prefixes they serve. Each module (and the
+# agent, pandas, numpy and groq imports behind it) is loaded the first time
+# a request reaches one of its paths, so health checks and container start
+# do not pay for it.
+ROUTERS: Dict[str, Tuple[str, ...]] = {
+    "src.routers.research": ("/api/generate-research",),
+    "src.routers.outlines": ("/api/generate-outlines",),
+    "src.routers.drafts": ("/api/create-draft",),
+    "src.routers.editing": ("/api/edit-draft",),
+    "src.routers.visuals": ("/api/suggest-visuals",),
+    "src.routers.forecast": ("/api/forecast-performance", "/api/score-subjects"),
+    "src.routers.packaging": ("/api/package-for-substack",),
+    "src.routers.analysis": ("/api/analyze-performance",),
+    "src.routers.pipeline": ("/api/run-pipeline", "/api/jobs"),
+}
+# Schema and docs pages need every route.
+_DOC_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+class LazyRouters:
+    """Include router modules into ``app`` on demand, each exactly once."""
+
+    def __init__(self, app: FastAPI, routers: Dict[str, Tuple[str, ...]]):
+        self.app = app
+        self.routers = routers
+        self.loaded: set = set()
+        self._lock = threading.Lock()
+
+    def modules_for(self, path: str) -> Iterable[str]:
+        if path in _DOC_PATHS or path.startswith("/docs/"):
+            return [m for m in self.routers if m not in self.loaded]
+        return [
+            module
+            for module, prefixes in self.routers.items()
+            if module not in self.loaded
+            and any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+        ]
+
+    def load(self, modules: Iterable[str]) -> None:
+        with self._lock:
+            for module in modules:
+                if module in self.loaded:
+                    continue
+                self.app.include_router(importlib.import_module(module).router)
+                self.loaded.add(module)
+                self.app.openapi_schema = None
+
+    def load_all(self) -> None:
+        self.load(list(self.routers))
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that loads the routers a request needs before routing it."""
+
+    def __init__(self, app: ASGIApp, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            modules = self.routers.modules_for(scope["path"])
+            if modules:
+                # Importing an agent takes a while; keep the event loop free.
+                await run_in_threadpool(self.routers.load, modules)
+        await self.app(scope, receive, send)
+
+
+def _resume_jobs() -> None:
+    importlib.import_module("src.routers.pipeline").get_job_queue()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Handlers and run_pipeline share these agent singletons (and through
+    # them one pooled Groq client) instead of building agents per request.
+    app.state.agents = get_registry()
+    if os.getenv("API_PRELOAD_ROUTERS", "").lower() in ("1", "true", "yes"):
+        await run_in_threadpool(routers.load_all)
+    if os.path.isfile(jobs_db_path()):
+        # Resume queued and orphaned pipeline jobs. Loading the pipeline
+        # router is slow, so it happens off the startup path.
+        threading.Thread(target=_resume_jobs, name="job-resume", daemon=True).start()
+    yield
+    pipeline = sys.modules.get("src.routers.pipeline")
+    if pipeline is not None:
+        pipeline.shutdown_job_queue()
+    app.state.agents.clear()
+    await close_async_groq_client()
+    close_groq_client()
+
+
+app = FastAPI(title="Newsletter Agent API", lifespan=lifespan)
+routers = LazyRouters(app, ROUTERS)
+app.add_middleware(LazyRouterMiddleware, routers=routers)
 
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok"}
 
-from src.agents.outline_architect import OutlineArchitect
-
-class OutlineRequest(BaseModel):
-    research_brief: str
-    issue_brief: str
-
-class OutlineResponse(BaseModel):
-    outlines_markdown: str
-
-@app.post("/api/generate-outlines", response_model=OutlineResponse)
-async def generate_outlines(req: OutlineRequest):
-    """Generate newsletter outlines from research and issue briefs."""
-    architect = OutlineArchitect()
-    try:
-        md = architect.generate_outlines(req.research_brief, req.issue_brief)
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return OutlineResponse(outlines_markdown=md)
-
-from src.agents.draftsmith import Draftsmith
-
-class DraftRequest(BaseModel):
-    outline_markdown: str
-
-class DraftResponse(BaseModel):
-    draft_markdown: str
-
-@app.post("/api/create-draft", response_model=DraftResponse)
-async def create_draft(req: DraftRequest):
-    """Expand an outline into a full newsletter draft."""
-    smith = Draftsmith()
-    try:
-        draft_md = smith.create_draft(req.outline_markdown)
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return DraftResponse(draft_markdown=draft_md)
-
-from src.agents.editor_in_chief import EditorInChief
-
-class EditRequest(BaseModel):
-    draft_markdown: str
-
-class EditResponse(BaseModel):
-    polished_markdown: str
-    revision_summary: str
-
-@app.post("/api/edit-draft", response_model=EditResponse)
-async def edit_draft(req: EditRequest):
-    """Polish a draft and return polished content plus revision summary."""
-    editor = EditorInChief()
-    try:
-        polished, summary = editor.edit_draft(req.draft_markdown)
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return EditResponse(polished_markdown=polished, revision_summary=summary)
-
-from src.agents.creative_director import CreativeDirector
-
-class VisualRequest(BaseModel):
-    draft_excerpt: str
-
-class VisualResponse(BaseModel):
-    visual_prompts: str
-
-@app.post("/api/suggest-visuals", response_model=VisualResponse)
-async def suggest_visuals(req: VisualRequest):
-    """Generate cover image concepts from a draft excerpt."""
-    director = CreativeDirector()
-    try:
-        prompts = director.suggest_visuals(req.draft_excerpt)
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return VisualResponse(visual_prompts=prompts)
-
-from typing import List
-from src.agents.metrics_forecaster import MetricsForecaster
-
-class ForecastRequest(BaseModel):
-    csv_path: str
-    subject_lines: List[str]
-
-class ForecastResponse(BaseModel):
-    forecast_markdown: str
-
-@app.post("/api/forecast-performance", response_model=ForecastResponse)
-async def forecast_performance(req: ForecastRequest):
-    """Generate a performance forecast from metrics CSV and subject lines."""
-    forecaster = MetricsForecaster()
-    try:
-        md = forecaster.forecast(req.csv_path, req.subject_lines)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Metrics CSV not found.")
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return ForecastResponse(forecast_markdown=md)
-
-from typing import List
-from src.agents.formatter import Formatter
-
-class PackageRequest(BaseModel):
-    draft_path: str
-    cover_image_path: str
-    title: str
-    slug: str
-    tags: List[str]
-    publish_date: str
-
-class PackageResponse(BaseModel):
-    package_zip_path: str
-
-@app.post("/api/package-for-substack", response_model=PackageResponse)
-async def package_for_substack(req: PackageRequest):
-    """Package final draft and assets into a Substack-ready ZIP."""
-    fmt = Formatter()
-    try:
-        zip_path = fmt.package_for_substack(
-            draft_path=req.draft_path,
-            cover_image_path=req.cover_image_path,
-            title=req.title,
-            slug=req.slug,
-            tags=req.tags,
-            publish_date=req.publish_date,
-        )
-    except FileNotFoundError as fnf:
-        raise HTTPException(status_code=404, detail=str(fnf))
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except RuntimeError as re:
-        raise HTTPException(status_code=500, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return PackageResponse(package_zip_path=zip_path)
-
-from src.agents.performance_analyst import PerformanceAnalyst
-
-
-class AnalyzeRequest(BaseModel):
-    forecast_markdown: str
-    actuals_csv_path: str
-
-
-class AnalyzeResponse(BaseModel):
-    analysis_markdown: str
-
-
-@app.post("/api/analyze-performance", response_model=AnalyzeResponse)
-async def analyze_performance(req: AnalyzeRequest):
-    """Compare forecast vs. actual metrics and return lessons learned."""
-    analyst = PerformanceAnalyst()
-    try:
-        md = analyst.analyze(req.forecast_markdown, req.actuals_csv_path)
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except FileNotFoundError as fnf:
-        raise HTTPException(status_code=404, detail=str(fnf))
-    except RuntimeError as re:
-        raise HTTPException(status_code=502, detail=str(re))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
-
-    return AnalyzeResponse(analysis_markdown=md)
-
-class PipelineRequest(BaseModel):
-    metrics_csv: str
-    research_query: str
-    issue_brief: str
-    cover_image: str
-    title: str
-    slug: str
-    tags: List[str]
-    publish_date: str
-
 
-class PipelineResponse(BaseModel):
-    package_zip_path: str
+@app.get("/api/rate-limits")
+async def rate_limits():
+    """Live per-model Groq queue depth, in-flight calls and retry counters."""
+    return get_rate_limiter().stats()
 
 
-@app.post("/api/run-pipeline", response_model=PipelineResponse)
-async def run_pipeline_api(req: PipelineRequest):
-    """Run the full newsletter pipeline and return the package ZIP path."""
-    try:
-        zip_path = run_pipeline(
-            metrics_csv=req.metrics_csv,
-            research_query=req.research_query,
-            issue_brief=req.issue_brief,
-            cover_image=req.cover_image,
-            title=req.title,
-            slug=req.slug,
-            tags=req.tags,
-            publish_date=req.publish_date,
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Pipeline error: {e}")
-    return PipelineResponse(package_zip_path=zip_path)
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of pipeline, stage and LLM call metrics."""
+    return PlainTextResponse(
+        METRICS.render(limiter_gauges(get_rate_limiter().stats())),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.embeddings import EmbeddingEngine
+
+INDEX_TYPES = ("auto", "flat", "ivf", "hnsw")
+FLAT_MAX_CHUNKS = 10_000
+
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+
+
+def chunk_markdown(text: str, max_words: int = 200) -> List[str]:
+    """Split Markdown into chunks of at most ``max_words`` words.
+
+    Paragraphs are packed together until the limit is reached, and a heading
+    always starts a new chunk so passages stay within one section.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    words = 0
+
+    def flush():
+        nonlocal current, words
+        if current:
+            chunks.append("\n\n".join(current))
+        current, words = [], 0
+
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        para_words = para.split()
+        if _HEADING_RE.match(para):
+            flush()
+        if len(para_words) > max_words:
+            flush()
+            for start in range(0, len(para_words), max_words):
+                chunks.append(" ".join(para_words[start:start + max_words]))
+            continue
+        if words + len(para_words) > max_words:
+            flush()
+        current.append(para)
+        words += len(para_words)
+    flush()
+    return chunks
+
+
+def format_passages(results: List[Dict[str, Any]]) -> str:
+    """Render search results as a Markdown bullet list for prompts."""
+    return "\n".join(
+        f"- ({r['filename']}) {' '.join(r['text'].split())}" for r in results
+    )
+
+
+class ArchiveIndex:
+    """Searchable FAISS index over chunks of past newsletter issues.
+
+    Small archives use an exact inner-product index; past
+    ``FLAT_MAX_CHUNKS`` chunks ``auto`` switches to IVF. HNSW can be chosen
+    explicitly. Vectors are L2-normalized, so scores are cosine similarities.
+
+    Every chunk has a stable integer ID, so added and removed documents are
+    applied to the FAISS index in place (``add_with_ids``/``remove_ids``).
+    The index is rebuilt only when its type changes (``auto`` crossing
+    ``FLAT_MAX_CHUNKS``), when an IVF index has doubled since it was
+    trained, or on removals from HNSW, which cannot delete vectors.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[EmbeddingEngine] = None,
+        index_type: str = "auto",
+        max_words: int = 200,
+    ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}'. Expected one of {INDEX_TYPES}.")
+        self.engine = engine or EmbeddingEngine("hashing")
+        self.index_type = index_type
+        self.max_words = max_words
+        self.chunks: List[Dict[str, Any]] = []
+        self.vectors = np.zeros((0, self.engine.dim), dtype=np.float32)
+        # FAISS IDs of ``chunks``, in order; new IDs only grow, so this stays sorted.
+        self.ids = np.zeros(0, dtype=np.int64)
+        self._index = None
+        self._built_type: Optional[str] = None
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 over the indexed chunks, used to key pipeline checkpoints."""
+        h = hashlib.sha256()
+        for chunk in self.chunks:
+            h.update(chunk["path"].encode("utf-8"))
+            h.update(b"\0")
+            h.update(chunk["text"].encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _chunk_documents(self, docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        chunks = []
+        for doc in docs:
+            filename = doc.get("metadata", {}).get("filename") or os.path.basename(doc["path"])
+            for i, text in enumerate(chunk_markdown(doc["content"], self.max_words)):
+                chunks.append({"path": doc["path"], "filename": filename, "chunk": i, "text": text})
+        return chunks
+
+    def build(self, docs: Iterable[Dict[str, Any]]) -> "ArchiveIndex":
+        """Chunk and embed ``docs`` (as returned by ``ingest_content``)."""
+        chunks = self._chunk_documents(docs)
+        texts = [c["text"] for c in chunks]
+        if texts and not self.engine.is_fitted:
+            self.engine.fit(texts)
+        self.chunks = chunks
+        self.vectors = self.engine.encode(texts)
+        self.ids = np.arange(len(chunks), dtype=np.int64)
+        self._rebuild()
+        return self
+
+    def add_documents(self, docs: Iterable[Dict[str, Any]]) -> None:
+        """Chunk, embed and index additional documents."""
+        chunks = self._chunk_documents(docs)
+        if not chunks:
+            return
+        vectors = self.engine.encode([c["text"] for c in chunks])
+        start = int(self.ids[-1]) + 1 if len(self.ids) else 0
+        ids = np.arange(start, start + len(chunks), dtype=np.int64)
+        self.chunks.extend(chunks)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.ids = np.concatenate([self.ids, ids])
+        if self._needs_rebuild():
+            self._rebuild()
+        else:
+            self._index.add_with_ids(vectors, ids)
+
+    def remove_paths(self, paths: Iterable[str]) -> None:
+        """Drop every chunk that came from one of ``paths``."""
+        drop = set(paths)
+        keep = [i for i, c in enumerate(self.chunks) if c["path"] not in drop]
+        if len(keep) == len(self.chunks):
+            return
+        removed = np.delete(self.ids, keep)
+        self.chunks = [self.chunks[i] for i in keep]
+        self.vectors = self.vectors[keep]
+        self.ids = self.ids[keep]
+        if self._needs_rebuild() or self._built_type == "hnsw":
+            self._rebuild()
+        else:
+            self._index.remove_ids(removed)
+
+    def apply_delta(self, delta) -> None:
+        """Apply a :class:`~src.agents.data_collector.ContentDelta`.
+
+        Only added and changed files are embedded, and only their chunks
+        are removed from or added to the FAISS index; unchanged chunks are
+        left where they are.
+        """
+        self.remove_paths(delta.removed + [doc["path"] for doc in delta.changed])
+        self.add_documents(delta.updated)
+
+    def _resolved_type(self) -> str:
+        if self.index_type != "auto":
+            return self.index_type
+        return "flat" if len(self.chunks) <= FLAT_MAX_CHUNKS else "ivf"
+
+    def _needs_rebuild(self) -> bool:
+        if self._index is None or self._resolved_type() != self._built_type:
+            return True
+        # IVF centroids trained on a much smaller corpus cluster it poorly.
+        return self._built_type == "ivf" and len(self.chunks) > 2 * self._trained_size
+
+    def _rebuild(self) -> None:
+        import faiss
+
+        dim = self.engine.dim
+        index_type = self._resolved_type()
+        n = len(self.vectors)
+        if index_type == "hnsw":
+            index = faiss.IndexIDMap(faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT))
+        elif index_type == "ivf" and n > 0:
+            nlist = max(1, min(int(4 * np.sqrt(n)), n // 39 or 1))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(self.vectors)
+            index.nprobe = min(nlist, 8)
+        else:
+            index = faiss.IndexIDMap(faiss.IndexFlatIP(dim))
+        if n:
+            index.add_with_ids(self.vectors, self.ids)
+        self._index = index
+        self._built_type = index_type
+        self._trained_size = n
+
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Return up to ``k`` chunks most similar to ``query``, best first."""
+        if not query.strip():
+            raise ValueError("Search query cannot be empty.")
+        if not self.chunks or k <= 0:
+            return []
+        vector = self.engine.encode([query])
+        scores, ids = self._index.search(vector, min(k, len(self.chunks)))
+        positions = np.searchsorted(self.ids, ids[0])
+        return [
+            dict(self.chunks[p], score=float(score))
+            for score, i, p in zip(scores[0], ids[0], positions)
+            if i >= 0
+        ]
+
+    def save(self, directory: str) -> None:
+        """Write the FAISS index, vectors, chunk metadata and embedder to ``directory``."""
+        import faiss
+
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+
+        def replace(name: str, write):
+            tmp = out / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            write(str(tmp))
+            os.replace(tmp, out / name)
+
+        def write_json(payload):
+            def write(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+            return write
+
+        def write_npy(path):
+            with open(path, "wb") as f:
+                np.save(f, self.vectors)
+
+        def write_ids(path):
+            with open(path, "wb") as f:
+                np.save(f, self.ids)
+
+        replace("vectors.npy", write_npy)
+        replace("ids.npy", write_ids)
+        replace("embedder.npz", self.engine.save)
+        replace("index.faiss", lambda path: faiss.write_index(self._index, path))
+        replace("chunks.json", write_json(self.chunks))
+        replace(
+            "meta.json",
+            write_json(
+                {
+                    "index_type": self.index_type,
+                    "max_words": self.max_words,
+                    "built_type": self._built_type,
+                    "trained_size": self._trained_size,
+                }
+            ),
+        )
+
+    @classmethod
+    def load(cls, directory: str) -> "ArchiveIndex":
+        """Load an index written by :meth:`save`."""
+        import faiss
+
+        src = Path(directory)
+        if not (src / "meta.json").is_file():
+            raise FileNotFoundError(f"No archive index found at {directory}")
+        meta = json.loads((src / "meta.json").read_text(encoding="utf-8"))
+        index = cls(
+            engine=EmbeddingEngine.load(str(src / "embedder.npz")),
+            index_type=meta["index_type"],
+            max_words=meta["max_words"],
+        )
+        index.chunks = json.loads((src / "chunks.json").read_text(encoding="utf-8"))
+        index.vectors = np.load(src / "vectors.npy")
+        if (src / "ids.npy").is_file():
+            index.ids = np.load(src / "ids.npy")
+            index._index = faiss.read_index(str(src / "index.faiss"))
+            index._built_type = meta["built_type"]
+            index._trained_size = meta["trained_size"]
+        else:
+            # Saved before chunks had IDs; rebuild with IDs by position.
+            index.ids = np.arange(len(index.chunks), dtype=np.int64)
+            index._rebuild()
+        return index
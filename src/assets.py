@@ -0,0 +1,179 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from PIL import Image, ImageOps
+
+# Substack renders body images at up to 1456px wide.
+SUBSTACK_WIDTH = 1456
+
+_MD_IMAGE_RE = re.compile(r'(!\[[^\]]*\]\(\s*)(<[^>]+>|[^)\s]+)((?:\s+"[^"]*")?\s*\))')
+_HTML_IMAGE_RE = re.compile(r'(<img\b[^>]*?\bsrc=["\'])([^"\']+)(["\'])', re.IGNORECASE)
+_REMOTE_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|//|#)", re.IGNORECASE)
+
+# Only these are packaged from draft references; other links are left alone.
+IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp"})
+
+_REENCODE_FORMATS = {
+    "JPEG": {"quality": 85, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 85},
+}
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def process_image(src: str, dest: str, max_width: int = SUBSTACK_WIDTH) -> str:
+    """Re-encode ``src`` into ``dest``: fix orientation, cap the width, drop metadata.
+
+    Runs in worker processes. Files Pillow cannot read or safely re-encode
+    (SVG, animated GIF) are copied unchanged. The output appears atomically
+    at ``dest``.
+    """
+    tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        img = Image.open(src)
+    except OSError:
+        img = None  # not a format Pillow can read, e.g. SVG
+    if img is None:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        return dest
+
+    with img:
+        fmt = img.format
+        if fmt not in _REENCODE_FORMATS or getattr(img, "is_animated", False):
+            shutil.copyfile(src, tmp)
+        else:
+            out = ImageOps.exif_transpose(img)
+            if out.width > max_width:
+                height = max(1, round(out.height * max_width / out.width))
+                out = out.resize((max_width, height), Image.LANCZOS)
+            if fmt == "JPEG" and out.mode not in ("RGB", "L"):
+                out = out.convert("RGB")
+            # Saving without exif/icc/pnginfo arguments strips the metadata.
+            out.save(tmp, format=fmt, **_REENCODE_FORMATS[fmt])
+    os.replace(tmp, dest)
+    return dest
+
+
+@dataclass
+class Asset:
+    """One unique image, identified by the SHA-256 of its source bytes."""
+
+    digest: str
+    source: Path
+    arcname: str
+    path: Optional[Path] = None  # processed file, set by AssetPipeline.process
+
+
+class AssetPipeline:
+    """Collect, deduplicate and optimize the images referenced by a draft.
+
+    Processed images are cached under ``cache_dir`` by content hash and
+    target width, so re-packaging the same images is a lookup. Cache
+    misses are processed in parallel on a process pool.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_width: int = SUBSTACK_WIDTH,
+        max_workers: Optional[int] = None,
+    ):
+        self.cache_dir = Path(cache_dir or os.getenv("ASSET_CACHE_DIR", ".cache/assets"))
+        self.max_width = max_width
+        self.max_workers = max_workers
+
+    @staticmethod
+    def find_references(markdown: str) -> List[str]:
+        """Return local image references from Markdown and ``<img>`` tags, in order."""
+        refs = [m.group(2).strip("<>") for m in _MD_IMAGE_RE.finditer(markdown)]
+        refs += [m.group(2) for m in _HTML_IMAGE_RE.finditer(markdown)]
+        return [r for r in dict.fromkeys(refs) if not _REMOTE_RE.match(r)]
+
+    def _cached_path(self, asset: Asset) -> Path:
+        return self.cache_dir / f"{asset.digest}-{self.max_width}{asset.source.suffix.lower()}"
+
+    def process(self, assets: List[Asset]) -> None:
+        """Fill in ``asset.path`` for every asset, processing cache misses in parallel."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        todo = []
+        for asset in assets:
+            asset.path = self._cached_path(asset)
+            if not asset.path.is_file():
+                todo.append(asset)
+        if len(todo) > 1 and (self.max_workers or os.cpu_count() or 1) > 1:
+            # spawn: the pipeline calls this from threads, where fork is unsafe.
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx) as pool:
+                futures = [
+                    pool.submit(process_image, str(a.source), str(a.path), self.max_width) for a in todo
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for asset in todo:
+                process_image(str(asset.source), str(asset.path), self.max_width)
+
+    def prepare(
+        self,
+        markdown: str,
+        base_dir: str,
+        cover_image: Optional[str] = None,
+    ) -> tuple[str, Optional[Asset], List[Asset]]:
+        """Return ``(rewritten_markdown, cover, assets)`` ready for packaging.
+
+        References are resolved relative to ``base_dir``; missing files,
+        remote URLs, paths that resolve outside ``base_dir`` and files without
+        an image suffix (see :data:`IMAGE_SUFFIXES`) are left untouched. Files
+        with identical bytes become a single asset. Links are rewritten to
+        ``images/<hash><ext>``.
+        """
+        by_digest: Dict[str, Asset] = {}
+        rewrite: Dict[str, str] = {}
+
+        def add(path: Path, arcname: Optional[str] = None) -> Asset:
+            digest = _file_digest(path)
+            if digest not in by_digest:
+                name = arcname or f"images/{digest[:16]}{path.suffix.lower()}"
+                by_digest[digest] = Asset(digest, path, name)
+            return by_digest[digest]
+
+        cover = None
+        if cover_image is not None:
+            cover_path = Path(cover_image)
+            cover = add(cover_path, f"images/cover{cover_path.suffix.lower() or '.png'}")
+
+        base = Path(base_dir).resolve()
+        for ref in self.find_references(markdown):
+            path = (base / unquote(ref)).resolve()
+            if path.is_relative_to(base) and path.suffix.lower() in IMAGE_SUFFIXES and path.is_file():
+                rewrite[ref] = add(path).arcname
+
+        def md_sub(m: re.Match) -> str:
+            ref = m.group(2).strip("<>")
+            return m.group(1) + rewrite[ref] + m.group(3) if ref in rewrite else m.group(0)
+
+        def html_sub(m: re.Match) -> str:
+            ref = m.group(2)
+            return m.group(1) + rewrite[ref] + m.group(3) if ref in rewrite else m.group(0)
+
+        markdown = _HTML_IMAGE_RE.sub(html_sub, _MD_IMAGE_RE.sub(md_sub, markdown))
+        assets = list(by_digest.values())
+        self.process(assets)
+        return markdown, cover, assets
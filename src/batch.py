@@ -0,0 +1,121 @@
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.orchestrator import _update_archive, check_from_stage, run_pipeline
+from src.rate_limit import BATCH, priority
+from src.workspace import gc_runs
+
+SPEC_FIELDS = (
+    "metrics_csv",
+    "research_query",
+    "issue_brief",
+    "cover_image",
+    "title",
+    "slug",
+    "tags",
+    "publish_date",
+)
+OPTIONAL_FIELDS = ("resume", "from_stage", "speculative")
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """Read pipeline specs from a ``.jsonl`` or ``.csv`` manifest.
+
+    Each spec carries the :func:`~src.orchestrator.run_pipeline` arguments;
+    ``tags`` may be a list or a comma-separated string. Blank lines are
+    skipped. Specs are not validated here, so one bad row fails alone.
+    """
+    manifest = Path(path)
+    if not manifest.is_file():
+        raise FileNotFoundError(f"Batch manifest not found at {path}")
+    with open(manifest, "r", encoding="utf-8", newline="") as f:
+        if manifest.suffix.lower() == ".csv":
+            specs = [dict(row) for row in csv.DictReader(f)]
+        elif manifest.suffix.lower() in (".jsonl", ".ndjson"):
+            specs = [json.loads(line) for line in f if line.strip()]
+        else:
+            raise ValueError("Batch manifest must be a .jsonl or .csv file.")
+    for spec in specs:
+        if isinstance(spec.get("tags"), str):
+            spec["tags"] = [t.strip() for t in spec["tags"].split(",") if t.strip()]
+    return specs
+
+
+def _pipeline_kwargs(spec: Dict[str, Any]) -> Dict[str, Any]:
+    missing = [name for name in SPEC_FIELDS if not spec.get(name)]
+    if missing:
+        raise ValueError(f"Spec is missing required fields: {missing}")
+    kwargs = {name: spec[name] for name in SPEC_FIELDS}
+    kwargs.update({name: spec[name] for name in OPTIONAL_FIELDS if spec.get(name)})
+    for flag in ("resume", "speculative"):
+        if isinstance(kwargs.get(flag), str):
+            kwargs[flag] = kwargs[flag].strip().lower() in ("1", "true", "yes")
+    # Batch runs share one archive index, so ingest_content is not a stage.
+    check_from_stage(kwargs.get("from_stage"), kwargs.get("speculative", False), ingest_archive=False)
+    return kwargs
+
+
+def run_batch(
+    specs: List[Dict[str, Any]],
+    max_concurrent: int = 4,
+    stage_workers: int = 4,
+    report_path: Optional[str] = None,
+    output_root: str = "output",
+    keep_runs: int = 20,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Run many pipelines in one process and return a per-issue report.
+
+    The archive index is brought up to date once and shared by every issue;
+    metrics files, fitted forecasters and Groq connections are shared
+    through their process-wide caches. At most ``max_concurrent`` issues run
+    at a time, each with ``stage_workers`` stage threads. A failing issue is
+    recorded and does not stop the others. Groq calls run at batch priority,
+    behind any interactive API requests sharing the process. The report (one
+    dict per spec, in manifest order) is also written as JSON to
+    ``report_path`` if given.
+    """
+    archive = _update_archive("data/content", "data/index")
+
+    def run_one(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        entry = {"index": index, "slug": spec.get("slug"), "title": spec.get("title")}
+        try:
+            with priority(BATCH):
+                zip_path = run_pipeline(
+                    **_pipeline_kwargs(spec),
+                    max_workers=stage_workers,
+                    output_root=output_root,
+                    keep_runs=None,
+                    ingest_archive=False,
+                    archive=archive,
+                )
+            entry.update(status="succeeded", zip_path=zip_path, error=None)
+        except Exception as exc:
+            entry.update(status="failed", zip_path=None, error=f"{type(exc).__name__}: {exc}")
+        entry["seconds"] = round(time.perf_counter() - start, 3)
+        if on_result is not None:
+            on_result(entry)
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="batch") as pool:
+        results = list(pool.map(run_one, range(len(specs)), specs))
+
+    succeeded = sum(r["status"] == "succeeded" for r in results)
+    gc_runs(output_root, keep=max(keep_runs, succeeded))
+
+    if report_path is not None:
+        report = Path(report_path)
+        report.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "issues": results,
+        }
+        report.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return results
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Bump when stage prompts or output formats change so old checkpoints miss.
+# 2: model-based forecast report, compacted prompt inputs, chunked editing
+#    and speculative variants.
+CHECKPOINT_VERSION = 2
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class CheckpointStore:
+    """Content-addressed store of stage outputs keyed by an input fingerprint.
+
+    A fingerprint covers the stage name, ``CHECKPOINT_VERSION`` and every
+    input value. Inputs named in ``file_inputs`` are file paths whose
+    contents are hashed, so editing a metrics CSV invalidates the stages that
+    read it. Values with a ``fingerprint`` attribute (such as the archive
+    index) contribute that instead of their repr.
+    """
+
+    def __init__(self, directory: str, file_inputs: Iterable[str] = ()):
+        self.directory = Path(directory)
+        self.file_inputs = set(file_inputs)
+        self._digests: Dict[tuple, str] = {}
+
+    def _encode(self, name: str, value: Any) -> Any:
+        if name in self.file_inputs and isinstance(value, str) and os.path.isfile(value):
+            st = os.stat(value)
+            key = (os.path.abspath(value), st.st_mtime_ns, st.st_size)
+            if key not in self._digests:
+                self._digests[key] = _file_digest(value)
+            return {"file": value, "sha256": self._digests[key]}
+        if hasattr(value, "fingerprint"):
+            return {"fingerprint": value.fingerprint}
+        if isinstance(value, Path):
+            return str(value)
+        return value
+
+    def fingerprint(self, stage: str, inputs: Dict[str, Any]) -> str:
+        """Return the hex fingerprint of running ``stage`` on ``inputs``."""
+        payload = {
+            "stage": stage,
+            "version": CHECKPOINT_VERSION,
+            "inputs": {name: self._encode(name, value) for name, value in sorted(inputs.items())},
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=repr)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _path(self, stage: str, fingerprint: str) -> Path:
+        return self.directory / f"{stage}-{fingerprint[:32]}.json"
+
+    def load(self, stage: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return stored outputs for ``(stage, fingerprint)`` or ``None``."""
+        path = self._path(stage, fingerprint)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.get("fingerprint") != fingerprint:
+            return None
+        return data["outputs"]
+
+    def save(self, stage: str, fingerprint: str, outputs: Dict[str, Any]) -> None:
+        """Atomically store ``outputs`` (which must be JSON-serializable)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(stage, fingerprint)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "fingerprint": fingerprint, "outputs": outputs}, f, ensure_ascii=False)
+        os.replace(tmp, path)
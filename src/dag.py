@@ -0,0 +1,170 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline step that reads named inputs and produces named outputs.
+
+    Stages with ``checkpoint=False`` always run, even when a checkpoint store
+    is in use; use it for cheap stages or ones with non-serializable outputs.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    checkpoint: bool = True
+
+    def run(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the stage with its inputs and map the result onto its outputs."""
+        result = self.func(**{name: values[name] for name in self.inputs})
+        if not self.outputs:
+            return {}
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        if not isinstance(result, tuple) or len(result) != len(self.outputs):
+            raise ValueError(
+                f"Stage '{self.name}' must return a tuple of {len(self.outputs)} values."
+            )
+        return dict(zip(self.outputs, result))
+
+
+def validate_stages(stages: List[Stage], available: Iterable[str] = ()) -> None:
+    """Raise ValueError if the stages do not form a runnable dependency graph."""
+    names = set()
+    produced = set(available)
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        names.add(stage.name)
+        for out in stage.outputs:
+            if out in produced:
+                raise ValueError(f"Value '{out}' is produced more than once.")
+            produced.add(out)
+
+    for stage in stages:
+        missing = set(stage.inputs) - produced
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' has unsatisfied inputs: {missing}")
+
+    # Kahn-style pass: every stage must become ready at some point.
+    ready_values = set(available)
+    remaining = list(stages)
+    while remaining:
+        runnable = [s for s in remaining if set(s.inputs) <= ready_values]
+        if not runnable:
+            cycle = ", ".join(s.name for s in remaining)
+            raise ValueError(f"Dependency cycle between stages: {cycle}")
+        for stage in runnable:
+            ready_values.update(stage.outputs)
+            remaining.remove(stage)
+
+
+def downstream(stages: List[Stage], name: str) -> Set[str]:
+    """Return ``name`` and the names of every stage that depends on it."""
+    if name not in {s.name for s in stages}:
+        raise ValueError(f"Unknown stage: {name}")
+    selected = {name}
+    tainted = set(next(s for s in stages if s.name == name).outputs)
+    changed = True
+    while changed:
+        changed = False
+        for stage in stages:
+            if stage.name not in selected and tainted & set(stage.inputs):
+                selected.add(stage.name)
+                tainted.update(stage.outputs)
+                changed = True
+    return selected
+
+
+def run_stages(
+    stages: List[Stage],
+    initial: Optional[Dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+    on_event: Optional[Callable[[str, str], None]] = None,
+    on_outputs: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    checkpoints=None,
+    force: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Run stages as soon as their inputs are available and return all values.
+
+    Independent stages run concurrently on a thread pool. If a stage raises,
+    no further stages are started and the first exception is re-raised once
+    the stages already in flight have finished.
+
+    ``on_event(stage_name, status)`` is called with ``"pending"`` for every
+    stage up front, then ``"running"``, ``"done"``, ``"skipped"`` or
+    ``"failed"`` as each stage progresses. ``on_outputs(stage_name, outputs)``
+    is called on the calling thread whenever a stage's outputs become
+    available, before any dependent stage starts.
+
+    With a :class:`~src.checkpoints.CheckpointStore`, a stage whose input
+    fingerprint matches a stored checkpoint is skipped and its outputs are
+    restored; stages named in ``force`` always run. Fresh outputs are saved.
+    """
+    values: Dict[str, Any] = dict(initial or {})
+    validate_stages(stages, values)
+    force = set(force)
+
+    def notify(stage: Stage, status: str) -> None:
+        if on_event is not None:
+            on_event(stage.name, status)
+
+    def finish(stage: Stage, outputs: Dict[str, Any], status: str) -> None:
+        values.update(outputs)
+        if on_outputs is not None:
+            on_outputs(stage.name, outputs)
+        notify(stage, status)
+
+    for stage in stages:
+        notify(stage, "pending")
+
+    pending = list(stages)
+    running = {}
+    error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1)) as pool:
+        while pending or running:
+            ready = [s for s in pending if all(i in values for i in s.inputs)]
+            while error is None and ready:
+                for stage in ready:
+                    pending.remove(stage)
+                    fingerprint = None
+                    if checkpoints is not None and stage.checkpoint:
+                        fingerprint = checkpoints.fingerprint(
+                            stage.name, {i: values[i] for i in stage.inputs}
+                        )
+                        if stage.name not in force:
+                            restored = checkpoints.load(stage.name, fingerprint)
+                            if restored is not None:
+                                finish(stage, restored, "skipped")
+                                continue
+                    notify(stage, "running")
+                    # Stage threads inherit context such as the LLM call priority.
+                    ctx = contextvars.copy_context()
+                    running[pool.submit(ctx.run, stage.run, dict(values))] = (stage, fingerprint)
+                ready = [s for s in pending if all(i in values for i in s.inputs)]
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, fingerprint = running.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    notify(stage, "failed")
+                    if error is None:
+                        error = exc
+                    continue
+                outputs = future.result()
+                if fingerprint is not None:
+                    checkpoints.save(stage.name, fingerprint, outputs)
+                finish(stage, outputs, "done")
+
+    if error is not None:
+        raise error
+    return values
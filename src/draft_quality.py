@@ -0,0 +1,89 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict
+
+from src.outlines import Outline
+
+TARGET_WORDS = 1200
+COMMENT_MARKER = ">> COMMENT:"
+# Relative weight of each component in the total score.
+WEIGHTS: Dict[str, float] = {
+    "coverage": 0.35,
+    "length": 0.2,
+    "readability": 0.2,
+    "polish": 0.15,
+    "structure": 0.1,
+}
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z'\u2019]+|\d+")
+_SENTENCE_RE = re.compile(r"[.!?]+(?:\s|$)")
+_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_STOPWORDS = frozenset(
+    "the and for that with this from have are was were will your you our how why what when into "
+    "about more than their they them its not but can".split()
+)
+
+
+@dataclass
+class DraftScore:
+    total: float
+    components: Dict[str, float] = field(default_factory=dict)
+
+
+def _content_words(text: str) -> set:
+    return {w.lower() for w in _WORD_RE.findall(text) if len(w) > 3 and w.lower() not in _STOPWORDS}
+
+
+def _coverage(draft_words: set, outline: Outline) -> float:
+    """Share of the outline's sections whose title words mostly appear in the draft."""
+    if not outline.sections:
+        return 1.0
+    covered = 0
+    for section in outline.sections:
+        words = _content_words(section.title) or _content_words(section.description)
+        if not words or len(words & draft_words) / len(words) >= 0.5:
+            covered += 1
+    return covered / len(outline.sections)
+
+
+def _readability(text: str, words: int) -> float:
+    """1.0 for an average sentence of 12-20 words, falling off on either side."""
+    sentences = max(1, len(_SENTENCE_RE.findall(text)))
+    average = words / sentences
+    if 12 <= average <= 20:
+        return 1.0
+    gap = 12 - average if average < 12 else average - 20
+    return max(0.0, 1.0 - gap / 15)
+
+
+def score_draft(polished_md: str, outline: Outline, target_words: int = TARGET_WORDS) -> DraftScore:
+    """Score an edited draft from 0 to 1 without calling a model.
+
+    The components are:
+
+    - ``coverage``: how many of the outline's sections made it into the draft.
+    - ``length``: closeness to ``target_words``.
+    - ``readability``: average sentence length.
+    - ``polish``: fewer open ``>> COMMENT:`` notes left by the editor per
+      100 words.
+    - ``structure``: section headings and the cover image placeholder.
+
+    The score is meant for ranking drafts of the same issue against each
+    other, not for comparing issues.
+    """
+    body = polished_md.replace(COMMENT_MARKER, "")
+    words = len(_WORD_RE.findall(body))
+    if not words:
+        return DraftScore(0.0, {name: 0.0 for name in WEIGHTS})
+    comments = polished_md.count(COMMENT_MARKER)
+    components = {
+        "coverage": _coverage(_content_words(body), outline),
+        "length": max(0.0, 1.0 - abs(words - target_words) / target_words),
+        "readability": _readability(body, words),
+        "polish": max(0.0, 1.0 - comments * 100 / words / 2),
+        "structure": 0.5 * min(1.0, len(_HEADING_RE.findall(body)) / 3)
+        + 0.5 * ("<!-- COVER_IMAGE_HOOK -->" in body),
+    }
+    components = {name: round(value, 4) for name, value in components.items()}
+    total = sum(WEIGHTS[name] * value for name, value in components.items())
+    return DraftScore(round(total, 4), components)
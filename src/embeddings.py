@@ -0,0 +1,241 @@
+import hashlib
+import json
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from itertools import chain, repeat
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+BACKENDS = ("hashing", "tfidf")
+
+
+def tokenize(text: str, ngram_range: tuple[int, int] = (1, 2)) -> List[str]:
+    """Return lowercase word n-grams for ``text``."""
+    words = TOKEN_RE.findall(text.lower())
+    low, high = ngram_range
+    tokens = list(words) if low <= 1 else []
+    for n in range(max(low, 2), high + 1):
+        tokens.extend(map(" ".join, zip(*(words[i:] for i in range(n)))))
+    return tokens
+
+
+def _hash_tokens(tokens: List[str]) -> np.ndarray:
+    # crc32 is stable across processes, unlike the built-in hash().
+    return np.fromiter(
+        map(zlib.crc32, map(str.encode, tokens)), dtype=np.uint32, count=len(tokens)
+    ).astype(np.int64)
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return matrix / norms
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingEngine:
+    """Offline CPU text embeddings with a fixed output dimension.
+
+    ``hashing`` maps word n-grams into ``dim`` signed buckets and needs no
+    fitting. ``tfidf`` learns a vocabulary and IDF weights from a corpus and
+    projects the TF-IDF vectors onto ``dim`` components from a randomized SVD.
+    Both return L2-normalized ``float32`` rows, encoded in NumPy batches, and
+    memoize vectors by content hash.
+    """
+
+    def __init__(
+        self,
+        backend: str = "hashing",
+        dim: int = 256,
+        batch_size: int = 512,
+        max_features: int = 4096,
+        ngram_range: tuple[int, int] = (1, 2),
+        cache_size: int = 100_000,
+        seed: int = 0,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}'. Expected one of {BACKENDS}.")
+        if dim <= 0:
+            raise ValueError("Embedding dimension must be positive.")
+        self.backend = backend
+        self.dim = dim
+        self.batch_size = batch_size
+        self.max_features = max_features
+        self.ngram_range = ngram_range
+        self.cache_size = cache_size
+        self.seed = seed
+
+        self.vocabulary: dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.backend == "hashing" or self.components is not None
+
+    def config(self) -> dict:
+        """Return the constructor arguments needed to rebuild this engine."""
+        return {
+            "backend": self.backend,
+            "dim": self.dim,
+            "batch_size": self.batch_size,
+            "max_features": self.max_features,
+            "ngram_range": list(self.ngram_range),
+            "seed": self.seed,
+        }
+
+    def save(self, path: str) -> None:
+        """Write the engine config and any fitted TF-IDF state to ``path`` (.npz)."""
+        arrays = {"config": np.array(json.dumps(self.config()))}
+        if self.components is not None:
+            arrays["vocabulary"] = np.array(json.dumps(self.vocabulary))
+            arrays["idf"] = self.idf
+            arrays["components"] = self.components
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingEngine":
+        """Rebuild an engine written by :meth:`save`."""
+        with np.load(path) as data:
+            config = json.loads(str(data["config"]))
+            config["ngram_range"] = tuple(config["ngram_range"])
+            engine = cls(**config)
+            if "components" in data:
+                engine.vocabulary = json.loads(str(data["vocabulary"]))
+                engine.idf = data["idf"]
+                engine.components = data["components"]
+        return engine
+
+    def fit(self, texts: Sequence[str]) -> "EmbeddingEngine":
+        """Learn TF-IDF weights and SVD components (a no-op for ``hashing``)."""
+        if self.backend == "hashing":
+            return self
+        if not texts:
+            raise ValueError("Cannot fit TF-IDF embeddings on an empty corpus.")
+
+        token_lists = [tokenize(t, self.ngram_range) for t in texts]
+        df = Counter()
+        for tokens in token_lists:
+            df.update(set(tokens))
+        vocab_terms = [term for term, _ in df.most_common(self.max_features)]
+        self.vocabulary = {term: i for i, term in enumerate(vocab_terms)}
+
+        n_docs = len(token_lists)
+        doc_freq = np.array([df[t] for t in vocab_terms], dtype=np.float64)
+        self.idf = (np.log((1 + n_docs) / (1 + doc_freq)) + 1).astype(np.float32)
+
+        tfidf = self._tfidf(token_lists)
+        self.components = self._randomized_svd(tfidf)
+        with self._cache_lock:
+            self._cache.clear()
+        return self
+
+    def _randomized_svd(self, matrix: np.ndarray, oversample: int = 10, n_iter: int = 2) -> np.ndarray:
+        """Return a ``(n_features, dim)`` projection from a randomized SVD."""
+        n_features = matrix.shape[1]
+        rank = min(self.dim + oversample, *matrix.shape)
+        rng = np.random.default_rng(self.seed)
+        q = matrix @ rng.standard_normal((n_features, rank)).astype(np.float32)
+        for _ in range(n_iter):
+            q, _ = np.linalg.qr(q)
+            q = matrix @ (matrix.T @ q)
+        q, _ = np.linalg.qr(q)
+        _, _, vt = np.linalg.svd(q.T @ matrix, full_matrices=False)
+
+        components = np.zeros((n_features, self.dim), dtype=np.float32)
+        keep = min(self.dim, vt.shape[0])
+        components[:, :keep] = vt[:keep].T
+        return components
+
+    def _count_matrix(self, token_lists: List[List[str]], n_cols: int, index_of) -> np.ndarray:
+        """Return sublinear term counts as a dense ``(n_docs, n_cols)`` matrix.
+
+        ``index_of`` maps the distinct tokens of the batch to ``(columns,
+        weights)`` arrays; a column of -1 drops the token.
+        """
+        flat = list(chain.from_iterable(token_lists))
+        unique = dict.fromkeys(flat)
+        positions = dict(zip(unique, range(len(unique))))
+        unique_cols, unique_weights = index_of(list(positions))
+
+        inverse = np.fromiter(map(positions.__getitem__, flat), dtype=np.int64, count=len(flat))
+        rows = np.repeat(
+            np.arange(len(token_lists), dtype=np.int64),
+            np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists)),
+        )
+        cols = unique_cols[inverse]
+        keep = cols >= 0
+        counts = np.bincount(
+            rows[keep] * n_cols + cols[keep],
+            weights=unique_weights[inverse][keep],
+            minlength=len(token_lists) * n_cols,
+        ).reshape(len(token_lists), n_cols).astype(np.float32)
+        return np.sign(counts) * np.log1p(np.abs(counts))
+
+    def _tfidf(self, token_lists: List[List[str]]) -> np.ndarray:
+        vocab = self.vocabulary
+
+        def index_of(tokens):
+            cols = np.fromiter(map(vocab.get, tokens, repeat(-1)), dtype=np.int64, count=len(tokens))
+            return cols, np.ones(len(tokens))
+
+        counts = self._count_matrix(token_lists, len(vocab), index_of)
+        return _l2_normalize(counts * self.idf)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        token_lists = [tokenize(t, self.ngram_range) for t in texts]
+        if self.backend == "hashing":
+            dim = self.dim
+
+            def index_of(tokens):
+                hashes = _hash_tokens(tokens)
+                return hashes % dim, np.where(hashes & 0x80000000, 1.0, -1.0)
+
+            matrix = self._count_matrix(token_lists, dim, index_of)
+        else:
+            matrix = self._tfidf(token_lists) @ self.components
+        return _l2_normalize(matrix).astype(np.float32)
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        """Return a ``(len(texts), dim)`` float32 matrix of embeddings.
+
+        An unfitted ``tfidf`` engine is fitted on ``texts`` first.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if not self.is_fitted:
+            self.fit(texts)
+
+        keys = [_content_hash(t) for t in texts]
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        todo = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    todo.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    out[i] = cached
+
+        for start in range(0, len(todo), self.batch_size):
+            idx = todo[start:start + self.batch_size]
+            vectors = self._encode_batch([texts[i] for i in idx])
+            out[idx] = vectors
+            with self._cache_lock:
+                for i, vector in zip(idx, vectors):
+                    self._cache[keys[i]] = vector
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return out
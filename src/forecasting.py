@@ -0,0 +1,215 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.embeddings import EmbeddingEngine
+from src.metrics_store import load_metrics
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+_EMOJI_RE = re.compile("[\U0001F000-\U0001FAFF\u2600-\u27BF\uFE0F]")
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def subject_features(subjects: Sequence[str], engine: EmbeddingEngine) -> np.ndarray:
+    """Hand-crafted subject-line features plus hashed word n-grams.
+
+    Columns: length in characters and words, question mark, exclamation
+    mark, any number, emoji, share of upper-case letters, then the signed
+    hashed unigram/bigram vector from ``engine``.
+    """
+    s = pd.Series(list(subjects), dtype=object).fillna("").astype(str)
+    letters = s.str.count(r"[A-Za-z]").to_numpy(dtype=np.float64)
+    upper = s.str.count(r"[A-Z]").to_numpy(dtype=np.float64)
+    handcrafted = np.column_stack([
+        s.str.len().to_numpy(dtype=np.float64) / 50.0,
+        s.str.split().str.len().to_numpy(dtype=np.float64) / 8.0,
+        s.str.contains("?", regex=False).to_numpy(dtype=np.float64),
+        s.str.contains("!", regex=False).to_numpy(dtype=np.float64),
+        s.str.contains(_NUMBER_RE).to_numpy(dtype=np.float64),
+        s.str.contains(_EMOJI_RE).to_numpy(dtype=np.float64),
+        np.divide(upper, letters, out=np.zeros_like(upper), where=letters > 0),
+    ])
+    return np.hstack([handcrafted, engine.encode(s.tolist()).astype(np.float64)])
+
+
+def _ridge(X: np.ndarray, y: np.ndarray, alpha: float) -> tuple[np.ndarray, float]:
+    """Closed-form ridge regression with an unpenalized intercept."""
+    x_mean = X.mean(axis=0)
+    y_mean = y.mean()
+    Xc = X - x_mean
+    gram = Xc.T @ Xc
+    gram[np.diag_indices_from(gram)] += alpha
+    coef = np.linalg.solve(gram, Xc.T @ (y - y_mean))
+    return coef, y_mean - x_mean @ coef
+
+
+class OpenRateForecaster:
+    """Predict open rates for candidate subject lines from past issues.
+
+    The model is a ridge regression on two feature groups: a baseline of
+    linear trend and send-weekday over the full history, and subject-line
+    features (see :func:`subject_features`). Intervals come from refitting
+    on ``n_boot`` bootstrap resamples of the history. Fitting and scoring
+    hundreds of candidates takes milliseconds on CPU.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 1.0,
+        n_boot: int = 200,
+        ngram_dim: int = 64,
+        confidence: float = 0.9,
+        seed: int = 0,
+    ):
+        self.alpha = alpha
+        self.n_boot = n_boot
+        self.confidence = confidence
+        self.seed = seed
+        self.engine = EmbeddingEngine("hashing", dim=ngram_dim)
+        self.history: Optional[pd.DataFrame] = None
+
+    def _baseline(self, dates: pd.Series) -> np.ndarray:
+        days = (dates - self._origin).dt.days.to_numpy(dtype=np.float64) / self._span
+        weekday = np.eye(7)[dates.dt.weekday.to_numpy()]
+        return np.column_stack([days, weekday])
+
+    def _design(self, dates: pd.Series, subjects: Sequence[str]) -> np.ndarray:
+        return np.hstack([self._baseline(dates), subject_features(subjects, self.engine)])
+
+    def fit(self, df: pd.DataFrame) -> "OpenRateForecaster":
+        """Fit on a frame with ``IssueDate``, ``SubjectLine`` and ``OpenRate``."""
+        history = df.dropna(subset=["IssueDate", "SubjectLine", "OpenRate"])
+        if len(history) < 3:
+            raise ValueError("At least 3 past issues are needed to fit a forecast.")
+        history = history.sort_values("IssueDate").reset_index(drop=True)
+        self._origin = history["IssueDate"].iloc[0]
+        self._span = max((history["IssueDate"].iloc[-1] - self._origin).days, 1)
+        self.history = history
+
+        X = self._design(history["IssueDate"], history["SubjectLine"].tolist())
+        y = history["OpenRate"].to_numpy(dtype=np.float64)
+        self.coef_, self.intercept_ = _ridge(X, y, self.alpha)
+
+        rng = np.random.default_rng(self.seed)
+        samples = rng.integers(0, len(y), size=(self.n_boot, len(y)))
+        fits = [_ridge(X[idx], y[idx], self.alpha) for idx in samples]
+        self._boot_coef = np.stack([coef for coef, _ in fits])
+        self._boot_intercept = np.array([b for _, b in fits])
+        return self
+
+    def next_issue_date(self) -> pd.Timestamp:
+        """The last issue date plus the median gap between issues."""
+        dates = self.history["IssueDate"]
+        gap = dates.diff().median()
+        if pd.isna(gap) or gap <= pd.Timedelta(0):
+            gap = pd.Timedelta(days=7)
+        return dates.iloc[-1] + gap
+
+    def best_weekday(self) -> str:
+        """The past send weekday whose baseline effect on open rate is highest."""
+        seen = np.unique(self.history["IssueDate"].dt.weekday.to_numpy())
+        return WEEKDAYS[int(seen[np.argmax(self.coef_[1:8][seen])])]
+
+    def predict(self, subjects: Sequence[str], issue_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Return ``subject``, ``open_rate``, ``low`` and ``high`` for each candidate.
+
+        Rates are percentages, clipped to the 0-100 range.
+        """
+        if self.history is None:
+            raise RuntimeError("Call fit() before predict().")
+        subjects = list(subjects)
+        date = pd.Timestamp(issue_date) if issue_date is not None else self.next_issue_date()
+        X = self._design(pd.Series([date] * len(subjects)), subjects)
+        boot = X @ self._boot_coef.T + self._boot_intercept
+        tail = (1 - self.confidence) / 2 * 100
+        low, high = np.percentile(boot, [tail, 100 - tail], axis=1)
+        # A linear model extrapolates past what a rate can be; clip to 0-100%.
+        return pd.DataFrame({
+            "subject": subjects,
+            "open_rate": np.clip(X @ self.coef_ + self.intercept_, 0.0, 100.0),
+            "low": np.clip(low, 0.0, 100.0),
+            "high": np.clip(high, 0.0, 100.0),
+        })
+
+
+_MAX_MODELS = 16
+_models: "OrderedDict[tuple, OpenRateForecaster]" = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def fitted_forecaster(csv_path: str) -> OpenRateForecaster:
+    """Return an :class:`OpenRateForecaster` fit on ``csv_path``, cached per file.
+
+    Models are memoized by (path, mtime, size), so repeated scoring against
+    the same metrics export skips loading, feature extraction and fitting.
+    """
+    if not os.path.isfile(csv_path):
+        raise FileNotFoundError(f"Metrics CSV not found at {csv_path}")
+    st = os.stat(csv_path)
+    key = (os.path.abspath(csv_path), st.st_mtime_ns, st.st_size)
+    with _models_lock:
+        model = _models.get(key)
+        if model is not None:
+            _models.move_to_end(key)
+            return model
+    df = load_metrics(csv_path, required={"IssueDate", "SubjectLine", "OpenRate"})
+    model = OpenRateForecaster().fit(df)
+    with _models_lock:
+        _models[key] = model
+        while len(_models) > _MAX_MODELS:
+            _models.popitem(last=False)
+    return model
+
+
+def clear_forecaster_cache() -> None:
+    with _models_lock:
+        _models.clear()
+
+
+def rank_subjects(
+    csv_path: str,
+    subject_lines: Sequence[str],
+    issue_date: Optional[str] = None,
+    top_k: Optional[int] = None,
+) -> pd.DataFrame:
+    """Score candidates against one metrics file, best first.
+
+    Blank and duplicate candidates are dropped; all remaining candidates are
+    scored in one matrix product. Adds a 1-based ``rank`` column.
+    """
+    subjects = list(dict.fromkeys(s.strip() for s in subject_lines if s and s.strip()))
+    if not subjects:
+        raise ValueError("At least one subject line is required.")
+    model = fitted_forecaster(csv_path)
+    scores = model.predict(subjects, issue_date=issue_date)
+    scores = scores.sort_values("open_rate", ascending=False, kind="stable").reset_index(drop=True)
+    if top_k is not None:
+        scores = scores.head(top_k)
+    scores.insert(0, "rank", np.arange(1, len(scores) + 1))
+    return scores
+
+
+def score_batches(batches: Sequence[dict], top_k: Optional[int] = None) -> list[dict]:
+    """Rank candidates for several newsletters or metrics files.
+
+    Each batch is a dict with ``csv_path``, ``subject_lines`` and an optional
+    ``issue_date``. Returns one JSON-ready dict per batch, in input order.
+    """
+    results = []
+    for batch in batches:
+        scores = rank_subjects(
+            batch["csv_path"], batch["subject_lines"], batch.get("issue_date"), top_k
+        )
+        issue_date = batch.get("issue_date") or fitted_forecaster(batch["csv_path"]).next_issue_date()
+        results.append({
+            "csv_path": batch["csv_path"],
+            "issue_date": pd.Timestamp(issue_date).strftime("%Y-%m-%d"),
+            "scores": scores.round({"open_rate": 2, "low": 2, "high": 2}).to_dict(orient="records"),
+        })
+    return results
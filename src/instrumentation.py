@@ -0,0 +1,250 @@
+import contextvars
+import dataclasses
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.dag import Stage
+
+NO_STAGE = "none"
+
+_METRIC_HELP = {
+    "newsletter_pipeline_runs_total": ("counter", "Pipeline runs by final status."),
+    "newsletter_pipeline_seconds_total": ("counter", "Wall time spent in pipeline runs."),
+    "newsletter_stage_runs_total": ("counter", "Stage executions by status."),
+    "newsletter_stage_wall_seconds_total": ("counter", "Wall time spent in each stage."),
+    "newsletter_stage_cpu_seconds_total": ("counter", "Local CPU time spent in each stage's thread."),
+    "newsletter_llm_calls_total": ("counter", "LLM calls by model, stage and cache hit."),
+    "newsletter_llm_seconds_total": ("counter", "Time spent waiting on LLM calls, including queueing."),
+    "newsletter_llm_queue_seconds_total": ("counter", "Time LLM calls spent queued in the rate limiter."),
+    "newsletter_llm_tokens_total": ("counter", "Prompt and completion tokens reported by the API."),
+    "newsletter_prompt_tokens_saved_total": ("counter", "Prompt tokens removed by compaction before LLM calls."),
+    "newsletter_llm_retries_total": ("counter", "LLM call retries after rate limits or transient errors."),
+    "newsletter_llm_errors_total": ("counter", "LLM calls that failed after retries."),
+    "newsletter_llm_queue_depth": ("gauge", "LLM calls currently waiting for rate-limit capacity."),
+    "newsletter_llm_in_flight": ("gauge", "LLM calls currently in flight."),
+}
+
+
+class Metrics:
+    """Thread-safe labelled counters rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[tuple, float]] = defaultdict(lambda: defaultdict(float))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[name][key] += value
+
+    def get(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self, gauges: Optional[Dict[str, Dict[tuple, float]]] = None) -> str:
+        """Return every series as Prometheus exposition text, plus extra ``gauges``."""
+        with self._lock:
+            series = {name: dict(values) for name, values in self._values.items()}
+        series.update(gauges or {})
+        lines = []
+        for name in sorted(series):
+            kind, help_text = _METRIC_HELP.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series[name].items()):
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{rendered}}} {value:g}" if rendered else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
+
+
+def limiter_gauges(stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[tuple, float]]:
+    """Turn :meth:`src.rate_limit.RateLimiter.stats` into queue-depth gauges."""
+    return {
+        "newsletter_llm_queue_depth": {(("model", m),): s["queued"] for m, s in stats.items()},
+        "newsletter_llm_in_flight": {(("model", m),): s["in_flight"] for m, s in stats.items()},
+    }
+
+
+@dataclass
+class CallRecord:
+    """One LLM call as seen by the pipeline."""
+
+    model: str
+    stage: str = NO_STAGE
+    seconds: float = 0.0
+    queue_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tokens_saved: int = 0
+    cached: bool = False
+    retries: int = 0
+    error: Optional[str] = None
+
+    def add_usage(self, usage: Any) -> None:
+        """Take token counts from an API ``usage`` object, ignoring missing fields."""
+        for name in ("prompt_tokens", "completion_tokens"):
+            value = getattr(usage, name, None)
+            if isinstance(value, int):
+                setattr(self, name, value)
+
+
+@dataclass
+class StageRecord:
+    name: str
+    status: str = "pending"
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    calls: List[CallRecord] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "llm_seconds": round(sum(c.seconds for c in self.calls), 4),
+            "queue_seconds": round(sum(c.queue_seconds for c in self.calls), 4),
+            "llm_calls": len(self.calls),
+            "cache_hits": sum(c.cached for c in self.calls),
+            "retries": sum(c.retries for c in self.calls),
+            "prompt_tokens": sum(c.prompt_tokens for c in self.calls),
+            "completion_tokens": sum(c.completion_tokens for c in self.calls),
+            "tokens_saved": sum(c.tokens_saved for c in self.calls),
+        }
+
+
+_stage: contextvars.ContextVar[Optional[StageRecord]] = contextvars.ContextVar("pipeline_stage", default=None)
+
+
+@contextmanager
+def llm_call(model: str) -> Iterator[CallRecord]:
+    """Time one LLM call and attribute it to the current stage, if any.
+
+    Callers fill in ``cached``, token usage, ``tokens_saved`` and, through the rate limiter,
+    ``retries`` and ``queue_seconds`` on the yielded record.
+    """
+    stage = _stage.get()
+    record = CallRecord(model=model, stage=stage.name if stage else NO_STAGE)
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as exc:
+        record.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        record.seconds = time.perf_counter() - start
+        if stage is not None:
+            stage.calls.append(record)
+        _count_call(record)
+
+
+def _count_call(record: CallRecord) -> None:
+    labels = {"model": record.model, "stage": record.stage}
+    METRICS.inc("newsletter_llm_calls_total", cached=str(record.cached).lower(), **labels)
+    METRICS.inc("newsletter_llm_seconds_total", record.seconds, **labels)
+    METRICS.inc("newsletter_llm_queue_seconds_total", record.queue_seconds, model=record.model)
+    METRICS.inc("newsletter_llm_tokens_total", record.prompt_tokens, model=record.model, kind="prompt")
+    METRICS.inc("newsletter_llm_tokens_total", record.completion_tokens, model=record.model, kind="completion")
+    if record.tokens_saved:
+        METRICS.inc("newsletter_prompt_tokens_saved_total", record.tokens_saved, model=record.model)
+    if record.retries:
+        METRICS.inc("newsletter_llm_retries_total", record.retries, model=record.model)
+    if record.error is not None:
+        METRICS.inc("newsletter_llm_errors_total", model=record.model)
+
+
+class RunRecorder:
+    """Collect per-stage timings and LLM calls for one pipeline run.
+
+    Wrap the stages with :meth:`wrap` and pass :meth:`on_event` to
+    :func:`src.dag.run_stages`. Each stage's wall time and thread CPU time
+    are measured in its worker thread; LLM calls made there are attributed
+    to it through a context variable.
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.wall_seconds: Optional[float] = None
+        self.status = "running"
+        self.stages: Dict[str, StageRecord] = {}
+
+    def wrap(self, stages: List[Stage]) -> List[Stage]:
+        """Return copies of ``stages`` whose functions record their own timings."""
+        for stage in stages:
+            self.stages[stage.name] = StageRecord(stage.name)
+        return [dataclasses.replace(s, func=self._timed(self.stages[s.name], s.func)) for s in stages]
+
+    @staticmethod
+    def _timed(record: StageRecord, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            token = _stage.set(record)
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record.wall_seconds = time.perf_counter() - wall
+                record.cpu_seconds = time.thread_time() - cpu
+                _stage.reset(token)
+
+        return timed
+
+    def on_event(self, stage: str, status: str) -> None:
+        record = self.stages.setdefault(stage, StageRecord(stage))
+        record.status = status
+        if status in ("done", "skipped", "failed"):
+            METRICS.inc("newsletter_stage_runs_total", stage=stage, status=status)
+            METRICS.inc("newsletter_stage_wall_seconds_total", record.wall_seconds, stage=stage)
+            METRICS.inc("newsletter_stage_cpu_seconds_total", record.cpu_seconds, stage=stage)
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        self.wall_seconds = time.perf_counter() - self._start
+        METRICS.inc("newsletter_pipeline_runs_total", status=status)
+        METRICS.inc("newsletter_pipeline_seconds_total", self.wall_seconds)
+
+    def report(self) -> Dict[str, Any]:
+        """The run report: per-stage summaries, totals and every LLM call."""
+        wall = self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start
+        stages = [record.summary() for record in self.stages.values()]
+        totals = {
+            key: round(sum(s[key] for s in stages), 4)
+            for key in ("cpu_seconds", "llm_seconds", "queue_seconds", "llm_calls", "cache_hits",
+                        "retries", "prompt_tokens", "completion_tokens", "tokens_saved")
+        }
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(),
+            "status": self.status,
+            "wall_seconds": round(wall, 4),
+            "totals": totals,
+            "stages": stages,
+            "calls": [
+                dataclasses.asdict(call) for record in self.stages.values() for call in record.calls
+            ],
+        }
+
+    def write(self, path: Path) -> Path:
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        return path
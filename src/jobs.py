@@ -0,0 +1,227 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+UNFINISHED = (QUEUED, RUNNING)
+# A running job whose lease is older than this is presumed orphaned.
+DEFAULT_LEASE_SECONDS = 60.0
+
+
+def jobs_db_path() -> str:
+    """Path of the API's job database: ``$JOBS_DB``, default ``jobs/jobs.sqlite``."""
+    return os.getenv("JOBS_DB", "jobs/jobs.sqlite")
+
+
+class JobStore:
+    """SQLite-backed record of pipeline jobs, their stage progress and results."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT NOT NULL, "
+            "progress TEXT NOT NULL, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "owner TEXT, lease_until REAL)"
+        )
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["progress"] = json.loads(job["progress"])
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def create(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a queued job for ``params`` and return it."""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, params, progress, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), "{}", now, now),
+            )
+            self._db.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Set ``status``, ``result`` or ``error`` on a job."""
+        allowed = {"status", "result", "error"}
+        if set(fields) - allowed:
+            raise ValueError(f"Unknown job fields: {set(fields) - allowed}")
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                (*fields.values(), time.time(), job_id),
+            )
+            self._db.commit()
+
+    def set_stage(self, job_id: str, stage: str, status: str) -> None:
+        """Record the status of one pipeline stage."""
+        with self._lock:
+            row = self._db.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            progress = json.loads(row["progress"])
+            progress[stage] = status
+            self._db.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id),
+            )
+            self._db.commit()
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Mark a job running for ``owner`` if it is queued or its lease has expired.
+
+        The check and the update are one statement, so when several
+        processes share the database exactly one of them wins a job.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND "
+                "(lease_until IS NULL OR lease_until < ?)))",
+                (RUNNING, owner, now + lease_seconds, now, job_id, QUEUED, RUNNING, now),
+            )
+            self._db.commit()
+        return cursor.rowcount == 1
+
+    def renew(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> None:
+        """Extend the leases of every job ``owner`` is running."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = ?",
+                (time.time() + lease_seconds, owner, RUNNING),
+            )
+            self._db.commit()
+
+    def unfinished(self) -> List[str]:
+        """Return IDs of queued jobs and running jobs whose lease has expired, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND "
+                "(lease_until IS NULL OR lease_until < ?)) ORDER BY created_at",
+                (QUEUED, RUNNING, time.time()),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobQueue:
+    """Run pipeline jobs on a bounded worker pool, persisting state in a JobStore.
+
+    ``runner`` is called as ``runner(**params, progress=callback)`` and its
+    return value is stored as the job result. A job only runs after the
+    queue claims it (see :meth:`JobStore.claim`), and the queue renews the
+    leases of its running jobs every third of ``lease_seconds``. Queued
+    jobs, and running jobs whose lease has expired because their process
+    died, are picked up when the queue is created.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: Callable[..., Any],
+        max_workers: int = 2,
+        resume: bool = True,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ):
+        self.store = store
+        self.runner = runner
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-job")
+        self._stop = threading.Event()
+        self._drained = threading.Event()
+        self._active: set = set()
+        self._active_lock = threading.Lock()
+        self._heartbeat = threading.Thread(target=self._renew_leases, name="job-lease", daemon=True)
+        self._heartbeat.start()
+        if resume:
+            for job_id in store.unfinished():
+                self._pool.submit(self._run, job_id)
+
+    def _renew_leases(self) -> None:
+        # Runs until shutdown and until the last running job has finished.
+        while not self._drained.wait(self.lease_seconds / 3):
+            self.store.renew(self.owner, self.lease_seconds)
+
+    def submit(self, params: Dict[str, Any]) -> str:
+        """Queue a job and return its ID immediately."""
+        job = self.store.create(params)
+        self._pool.submit(self._run, job["id"])
+        return job["id"]
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        with self._active_lock:
+            # After shutdown a job that slipped past cancellation stays queued.
+            if job is None or self._stop.is_set():
+                return
+            if not self.store.claim(job_id, self.owner, self.lease_seconds):
+                return
+            self._active.add(job_id)
+
+        def progress(stage: str, status: str) -> None:
+            self.store.set_stage(job_id, stage, status)
+
+        try:
+            result = self.runner(**job["params"], progress=progress)
+        except Exception as exc:
+            self.store.update(job_id, status=FAILED, error=str(exc))
+        else:
+            self.store.update(job_id, status=SUCCEEDED, result=json.dumps(result))
+        finally:
+            with self._active_lock:
+                self._active.discard(job_id)
+                if self._stop.is_set() and not self._active:
+                    self._drained.set()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the queue.
+
+        With ``wait=True`` every queued job runs first. With ``wait=False``
+        jobs that have not started are cancelled and stay ``queued`` in the
+        store for the next start; running jobs finish in the background and
+        keep renewing their leases until they do.
+        """
+        if wait:
+            self._pool.shutdown(wait=True)
+        with self._active_lock:
+            self._stop.set()
+            if not self._active:
+                self._drained.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,125 @@
+from typing import Any, AsyncIterator, Optional
+
+from src.instrumentation import llm_call
+from src.llm_cache import cache_key, get_response_cache
+from src.rate_limit import estimate_tokens, get_rate_limiter
+
+
+def _messages(system: str, prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _cached(model: str, system: str, prompt: str, params: dict) -> tuple[Optional[str], Optional[str]]:
+    """Return ``(key, cached_content)``; both are ``None`` when caching is off."""
+    cache = get_response_cache()
+    if cache is None:
+        return None, None
+    key = cache_key(model, system, prompt, params)
+    return key, cache.get(key)
+
+
+def _store(key: Optional[str], content: Any) -> None:
+    cache = get_response_cache()
+    if key is not None and cache is not None and isinstance(content, str):
+        cache.set(key, content)
+
+
+def complete(client: Any, model: str, system: str, prompt: str, **params: Any) -> str:
+    """Run a blocking chat completion and return the message content.
+
+    Responses are served from and stored in the process-wide response cache
+    when one is configured (see :func:`src.llm_cache.get_response_cache`).
+    Uncached calls go through the process-wide rate limiter, which queues,
+    paces and retries them (see :class:`src.rate_limit.RateLimiter`). Every
+    call is timed and counted by :func:`src.instrumentation.llm_call`,
+    including the tokens saved when ``prompt`` is a compacted
+    :class:`src.prompt_budget.Prompt`.
+    """
+    with llm_call(model) as record:
+        record.tokens_saved = getattr(prompt, "tokens_saved", 0)
+        key, content = _cached(model, system, prompt, params)
+        if content is not None:
+            record.cached = True
+            return content
+        try:
+            response = get_rate_limiter().call(
+                model,
+                estimate_tokens(system, prompt, params),
+                lambda: client.chat.completions.create(
+                    model=model, messages=_messages(system, prompt), **params
+                ),
+                record,
+            )
+        except Exception as exc:
+            raise RuntimeError(f"Groq API call failed: {exc}")
+        record.add_usage(getattr(response, "usage", None))
+        content = response.choices[0].message.content
+        _store(key, content)
+        return content
+
+
+async def acomplete(client: Any, model: str, system: str, prompt: str, **params: Any) -> str:
+    """Coroutine variant of :func:`complete` for an ``AsyncGroq`` client."""
+    with llm_call(model) as record:
+        record.tokens_saved = getattr(prompt, "tokens_saved", 0)
+        key, content = _cached(model, system, prompt, params)
+        if content is not None:
+            record.cached = True
+            return content
+        try:
+            response = await get_rate_limiter().acall(
+                model,
+                estimate_tokens(system, prompt, params),
+                lambda: client.chat.completions.create(
+                    model=model, messages=_messages(system, prompt), **params
+                ),
+                record,
+            )
+        except Exception as exc:
+            raise RuntimeError(f"Groq API call failed: {exc}")
+        record.add_usage(getattr(response, "usage", None))
+        content = response.choices[0].message.content
+        _store(key, content)
+        return content
+
+
+async def astream(client: Any, model: str, system: str, prompt: str, **params: Any) -> AsyncIterator[str]:
+    """Yield completion text deltas as they arrive from an ``AsyncGroq`` client.
+
+    A cached response is yielded as a single chunk. The full text of a
+    streamed response is stored in the cache once the stream completes.
+    Opening the stream is rate limited and retried; once text has started
+    arriving a failure is raised rather than retried.
+    """
+    with llm_call(model) as record:
+        record.tokens_saved = getattr(prompt, "tokens_saved", 0)
+        key, content = _cached(model, system, prompt, params)
+        if content is not None:
+            record.cached = True
+            yield content
+            return
+        parts = []
+        try:
+            stream = await get_rate_limiter().acall(
+                model,
+                estimate_tokens(system, prompt, params),
+                lambda: client.chat.completions.create(
+                    model=model, messages=_messages(system, prompt), stream=True, **params
+                ),
+                record,
+            )
+            async for chunk in stream:
+                # Groq reports usage on the final chunk under ``x_groq``.
+                record.add_usage(getattr(getattr(chunk, "x_groq", None), "usage", None))
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as exc:
+            raise RuntimeError(f"Groq API call failed: {exc}")
+        _store(key, "".join(parts))
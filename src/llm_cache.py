@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def cache_key(model: str, system: str, prompt: str, params: Optional[dict] = None) -> str:
+    """Return a stable SHA-256 key for a chat completion request."""
+    payload = json.dumps(
+        {"model": model, "system": system, "prompt": prompt, "params": params or {}},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier LLM response cache: an in-memory LRU in front of optional SQLite.
+
+    Entries older than ``ttl`` seconds are treated as misses and dropped.
+    The memory tier holds at most ``max_entries`` items and the disk tier at
+    most ``max_disk_entries``; the least recently used entries go first.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_entries: int = 100_000,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._db.commit()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or ``None`` on a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created, now):
+                        self._db.execute(
+                            "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        self._remember(key, value, created)
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key`` in every tier and evict overflow."""
+        now = self._clock()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl is not None:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            disk_entries = 0
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_UNSET = object()
+_cache: Any = _UNSET
+_cache_lock = threading.Lock()
+
+
+def _cache_from_env() -> Optional[ResponseCache]:
+    setting = os.getenv("LLM_CACHE", "").strip()
+    if not setting or setting.lower() in {"0", "off", "false", "none"}:
+        return None
+    ttl = os.getenv("LLM_CACHE_TTL")
+    return ResponseCache(
+        path=None if setting.lower() == "memory" else setting,
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+        ttl=float(ttl) if ttl else None,
+    )
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or ``None`` when caching is off.
+
+    The cache is configured from ``LLM_CACHE`` on first use: ``memory`` keeps
+    an in-memory LRU only, any other value is a SQLite file path backing the
+    disk tier. ``LLM_CACHE_TTL`` and ``LLM_CACHE_MAX_ENTRIES`` tune eviction.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is _UNSET:
+            _cache = _cache_from_env()
+        return _cache
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Install ``cache`` as the process-wide response cache (``None`` disables)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import pandas as pd
+
+METRICS_COLUMNS = {"IssueDate", "SubjectLine", "OpenRate", "ClickRate", "ReplyCount", "Subscribers"}
+
+_MAX_FILES = 8
+_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _sidecar_dir() -> Optional[str]:
+    """Directory for Feather sidecars, or ``None`` if disabled."""
+    directory = os.getenv("METRICS_CACHE_DIR", ".cache/metrics")
+    if directory.lower() in ("", "0", "off", "none"):
+        return None
+    return directory
+
+
+def _sidecar_path(directory: str, key: tuple) -> str:
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(directory, f"{digest}.feather")
+
+
+def _parse(csv_path: str) -> pd.DataFrame:
+    df = pd.read_csv(csv_path)
+    if "IssueDate" in df.columns:
+        df["IssueDate"] = pd.to_datetime(df["IssueDate"], format="%Y-%m-%d")
+    return df
+
+
+def _read(csv_path: str, key: tuple) -> pd.DataFrame:
+    directory = _sidecar_dir()
+    if directory is None:
+        return _parse(csv_path)
+
+    import pyarrow.feather as feather
+
+    sidecar = _sidecar_path(directory, key)
+    if os.path.isfile(sidecar):
+        try:
+            return feather.read_table(sidecar, memory_map=True).to_pandas()
+        except Exception:
+            pass  # corrupt or foreign sidecar; fall back to the CSV
+    df = _parse(csv_path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp"
+        feather.write_feather(df, tmp, compression="uncompressed")
+        os.replace(tmp, sidecar)
+    except Exception:
+        pass  # the sidecar is only an optimization
+    return df
+
+
+def load_metrics(
+    csv_path: str,
+    required: Iterable[str] = METRICS_COLUMNS,
+    label: str = "Metrics CSV",
+) -> pd.DataFrame:
+    """Return the metrics CSV at ``csv_path`` as a DataFrame with parsed dates.
+
+    Each file is parsed once per process and memoized by (path, mtime, size),
+    so the agents of one pipeline run share a single parse. Parsed frames
+    are also written to an uncompressed Feather sidecar under
+    ``$METRICS_CACHE_DIR`` (default ``.cache/metrics``; ``off`` disables
+    it) that later processes memory-map instead of re-parsing. Callers get
+    a copy and may modify it freely.
+    """
+    if not os.path.isfile(csv_path):
+        raise FileNotFoundError(f"{label} not found at {csv_path}")
+    st = os.stat(csv_path)
+    key = (os.path.abspath(csv_path), st.st_mtime_ns, st.st_size)
+
+    with _lock:
+        df = _cache.get(key)
+        if df is not None:
+            _cache.move_to_end(key)
+    if df is None:
+        df = _read(csv_path, key)
+        with _lock:
+            _cache[key] = df
+            while len(_cache) > _MAX_FILES:
+                _cache.popitem(last=False)
+
+    missing = set(required) - set(df.columns)
+    if missing:
+        raise ValueError(f"{label} is missing required columns: {missing}")
+    return df.copy()
+
+
+def clear_metrics_cache() -> None:
+    """Forget memoized frames (sidecar files are left on disk)."""
+    with _lock:
+        _cache.clear()
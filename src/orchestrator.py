@@ -1,44 +1,282 @@
 import argparse
+import contextvars
+import importlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from src.agents.data_collector import ingest_metrics, ingest_content
-from src.agents.insight_scout import InsightScout
-from src.agents.outline_architect import OutlineArchitect
-from src.agents.draftsmith import Draftsmith
-from src.agents.editor_in_chief import EditorInChief
-from src.agents.creative_director import CreativeDirector
-from src.agents.metrics_forecaster import MetricsForecaster
-from src.agents.formatter import Formatter
-from src.agents.performance_analyst import PerformanceAnalyst
+from src.checkpoints import CheckpointStore
+from src.dag import Stage, downstream, run_stages
+from src.draft_quality import score_draft
+from src.instrumentation import RunRecorder
+from src.llm_cache import ResponseCache, configure_response_cache
+from src.outlines import Outline, parse_outlines
+from src.registry import get_registry
+from src.workspace import RunWorkspace, directory_lock, gc_runs
+
+if TYPE_CHECKING:
+    from src.archive_index import ArchiveIndex
+
+# Agents pull in pandas, numpy, groq and faiss, so they are imported the
+# first time a stage needs them rather than when the CLI or API starts.
+_LAZY_IMPORTS = {
+    "ContentManifest": "src.agents.data_collector",
+    "ingest_metrics": "src.agents.data_collector",
+    "InsightScout": "src.agents.insight_scout",
+    "OutlineArchitect": "src.agents.outline_architect",
+    "Draftsmith": "src.agents.draftsmith",
+    "EditorInChief": "src.agents.editor_in_chief",
+    "CreativeDirector": "src.agents.creative_director",
+    "MetricsForecaster": "src.agents.metrics_forecaster",
+    "Formatter": "src.agents.formatter",
+    "PerformanceAnalyst": "src.agents.performance_analyst",
+    "ArchiveIndex": "src.archive_index",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _load(name: str) -> Any:
+    """Return a lazily imported name (or whatever a test patched in its place)."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def _agent(name: str) -> Any:
+    """Return the shared instance of an agent class from the process-wide registry."""
+    return get_registry().get(_load(name))
 
 
 def parse_subject_lines(outline: str) -> list[str]:
     """Extract subject lines from the first outline option."""
-    import re
-
-    # Get first outline block
-    start = outline.find("# Outline Option 1")
-    if start == -1:
-        block = outline
-    else:
-        end = outline.find("# Outline Option 2", start)
-        block = outline[start:end if end != -1 else len(outline)]
-
-    subject_lines = []
-    if "## Subject Line Candidates" in block:
-        section = block.split("## Subject Line Candidates", 1)[1]
-        for line in section.splitlines():
-            line = line.strip()
-            if line.startswith("-"):
-                subject = line.lstrip("-").strip().strip('"')
-                if subject:
-                    subject_lines.append(subject)
-            elif subject_lines:
-                # stop when leaving list
-                if not line.startswith("-"):
-                    break
-    return subject_lines
+    return parse_outlines(outline)[0].subject_lines
+
+
+def _update_archive(content_dir: str, index_dir: str):
+    """Bring the archive index up to date with ``content_dir``.
+
+    Only new or changed Markdown files are parsed and embedded; the manifest
+    is saved after the index so an interrupted run is retried next time.
+    The whole load, update and save holds a lock on ``index_dir`` (see
+    :func:`src.workspace.directory_lock`), so concurrent runs never mix
+    files from two versions of the index. Returns ``None`` when the archive
+    is empty.
+    """
+    manifest_path = str(Path(index_dir) / "manifest.json")
+    with directory_lock(index_dir):
+        manifest = _load("ContentManifest").load(manifest_path)
+        try:
+            archive = _load("ArchiveIndex").load(index_dir)
+        except FileNotFoundError:
+            archive = None
+        if archive is None or not manifest.files:
+            # Index and manifest must describe the same files; start over otherwise.
+            archive = _load("ArchiveIndex")()
+            manifest = _load("ContentManifest")(manifest_path)
+
+        delta = manifest.scan(content_dir)
+        if delta:
+            archive.apply_delta(delta)
+            archive.save(index_dir)
+        manifest.save()
+    return archive if len(archive) else None
+
+
+# Stage outputs persisted to the output directory as each stage completes.
+ARTIFACTS = {
+    "research_md": "research.md",
+    "outlines_md": "outlines.md",
+    "draft_md": "draft.md",
+    "polished_md": "polished.md",
+    "summary_md": "revision_summary.md",
+    "visuals_txt": "visuals.txt",
+    "forecast_md": "forecast.md",
+    "analysis_md": "analysis.md",
+}
+RUN_REPORT = "run_report.json"
+# Failed runs are discarded, so their reports go to <output_root>/failed/<run_id>.json.
+FAILED_REPORTS_DIR = "failed"
+# Speculative runs keep every outline option's draft and edit here.
+VARIANTS_DIR = "variants"
+VARIANT_ARTIFACTS = {
+    "draft_md": "draft.md",
+    "polished_md": "polished.md",
+    "summary_md": "revision_summary.md",
+}
+
+
+def _ingest_metrics(metrics_csv: str):
+    return _load("ingest_metrics")(metrics_csv)
+
+
+def _research(metrics_csv: str, research_query: str) -> str:
+    return _agent("InsightScout").fetch_research_brief(metrics_csv, research_query)
+
+
+def _outlines(research_md: str, issue_brief: str, archive):
+    outlines_md = _agent("OutlineArchitect").generate_outlines(research_md, issue_brief, archive=archive)
+    first = parse_outlines(outlines_md)[0]
+    return outlines_md, first.subject_lines, first.markdown
+
+
+def _draft(first_outline: str) -> str:
+    return _agent("Draftsmith").create_draft(first_outline)
+
+
+def _edit(draft_md: str):
+    return _agent("EditorInChief").edit_draft(draft_md)
+
+
+def _draft_variant(outline: Outline) -> dict:
+    draft_md = _agent("Draftsmith").create_draft(outline.markdown)
+    polished_md, summary_md = _agent("EditorInChief").edit_draft(draft_md)
+    score = score_draft(polished_md, outline)
+    return {
+        "option": outline.number,
+        "title": outline.title,
+        "subject_lines": outline.subject_lines,
+        "score": score.total,
+        "components": score.components,
+        "draft_md": draft_md,
+        "polished_md": polished_md,
+        "summary_md": summary_md,
+    }
+
+
+def _variants(outlines_md: str):
+    """Draft and edit every outline option concurrently and rank the results.
+
+    Variants are ordered best first by :func:`src.draft_quality.score_draft`
+    (ties keep option order); the best one feeds the rest of the pipeline.
+    """
+    options = parse_outlines(outlines_md)
+    with ThreadPoolExecutor(max_workers=len(options), thread_name_prefix="variant") as pool:
+        # Variants inherit the stage and priority of the calling thread.
+        futures = [pool.submit(contextvars.copy_context().run, _draft_variant, o) for o in options]
+        variants = sorted((f.result() for f in futures), key=lambda v: -v["score"])
+    best = variants[0]
+    return variants, best["draft_md"], best["polished_md"], best["summary_md"]
+
+
+def _visuals(polished_md: str) -> str:
+    return _agent("CreativeDirector").suggest_visuals(polished_md[:500])
+
+
+def _forecast(metrics_csv: str, subject_lines: list[str]) -> str:
+    return _agent("MetricsForecaster").forecast(metrics_csv, subject_lines)
+
+
+def _forecast_options(metrics_csv: str, outlines_md: str) -> str:
+    subject_lines = [s for o in parse_outlines(outlines_md) for s in o.subject_lines]
+    return _agent("MetricsForecaster").forecast(metrics_csv, list(dict.fromkeys(subject_lines)))
+
+
+def _package(
+    polished_md: str,
+    output_dir: Path,
+    cover_image: str,
+    title: str,
+    slug: str,
+    tags: list[str],
+    publish_date: str,
+) -> str:
+    polished_path = output_dir / ARTIFACTS["polished_md"]
+    polished_path.write_text(polished_md, encoding="utf-8")
+    return _load("Formatter")(output_root=str(output_dir / "package")).package_for_substack(
+        draft_path=str(polished_path),
+        cover_image_path=cover_image,
+        title=title,
+        slug=slug,
+        tags=tags,
+        publish_date=publish_date,
+    )
+
+
+def _analysis(forecast_md: str, metrics_csv: str) -> str:
+    return _agent("PerformanceAnalyst").analyze(forecast_md, metrics_csv)
+
+
+def _write_variants(directory: Path, variants: list[dict]) -> None:
+    ranking = []
+    for rank, variant in enumerate(variants, 1):
+        option_dir = directory / f"option-{variant['option']}"
+        option_dir.mkdir(parents=True, exist_ok=True)
+        for key, filename in VARIANT_ARTIFACTS.items():
+            (option_dir / filename).write_text(variant[key], encoding="utf-8")
+        ranking.append({"rank": rank, **{k: v for k, v in variant.items() if k not in VARIANT_ARTIFACTS}})
+    (directory / "variants.json").write_text(json.dumps(ranking, indent=2), encoding="utf-8")
+
+
+def build_stages(ingest_archive: bool = True, speculative: bool = False) -> list[Stage]:
+    """Return the pipeline stages with their declared inputs and outputs.
+
+    Stage functions return their results instead of writing files, so a
+    stage's outputs depend only on its inputs and can be checkpointed.
+    With ``ingest_archive=False`` the ``archive`` value must be supplied
+    by the caller instead. With ``speculative=True`` a ``variants`` stage
+    drafts and edits every outline option in place of ``draft`` and
+    ``edit``, and the forecast covers every option's subject lines.
+    """
+    ingest = [
+        Stage(
+            "ingest_content",
+            _update_archive,
+            ("content_dir", "index_dir"),
+            ("archive",),
+            checkpoint=False,
+        ),
+    ]
+    drafting = [
+        Stage("draft", _draft, ("first_outline",), ("draft_md",)),
+        Stage("edit", _edit, ("draft_md",), ("polished_md", "summary_md")),
+    ]
+    speculative_drafting = [
+        Stage("variants", _variants, ("outlines_md",), ("variants", "draft_md", "polished_md", "summary_md")),
+    ]
+    forecast = Stage("forecast", _forecast, ("metrics_csv", "subject_lines"), ("forecast_md",))
+    speculative_forecast = Stage("forecast", _forecast_options, ("metrics_csv", "outlines_md"), ("forecast_md",))
+    return [
+        Stage("ingest_metrics", _ingest_metrics, ("metrics_csv",), ("metrics_df",), checkpoint=False),
+        *(ingest if ingest_archive else []),
+        Stage("research", _research, ("metrics_csv", "research_query"), ("research_md",)),
+        Stage(
+            "outlines",
+            _outlines,
+            ("research_md", "issue_brief", "archive"),
+            ("outlines_md", "subject_lines", "first_outline"),
+        ),
+        *(speculative_drafting if speculative else drafting),
+        Stage("visuals", _visuals, ("polished_md",), ("visuals_txt",)),
+        speculative_forecast if speculative else forecast,
+        Stage(
+            "package",
+            _package,
+            ("polished_md", "output_dir", "cover_image", "title", "slug", "tags", "publish_date"),
+            ("zip_path",),
+            checkpoint=False,
+        ),
+        Stage("analysis", _analysis, ("forecast_md", "metrics_csv"), ("analysis_md",)),
+    ]
+
+
+def check_from_stage(from_stage: Optional[str], speculative: bool = False, ingest_archive: bool = True) -> None:
+    """Raise ``ValueError`` unless ``from_stage`` names a stage of this kind of run.
+
+    ``draft`` and ``edit`` only exist in standard runs and ``variants`` only
+    in speculative ones.
+    """
+    names = [stage.name for stage in build_stages(ingest_archive, speculative)]
+    if from_stage is not None and from_stage not in names:
+        kind = "speculative" if speculative else "standard"
+        raise ValueError(f"Unknown stage {from_stage!r} for a {kind} run; choose from: {', '.join(names)}")
 
 
 def run_pipeline(
@@ -51,79 +289,210 @@ def run_pipeline(
     slug: str,
     tags: list[str],
     publish_date: str,
+    max_workers: int = 4,
+    progress: Optional[Callable[[str, str], None]] = None,
+    resume: bool = False,
+    from_stage: Optional[str] = None,
+    output_root: str = "output",
+    run_id: Optional[str] = None,
+    keep_runs: Optional[int] = 20,
+    checkpoint_dir: Optional[str] = None,
+    ingest_archive: bool = True,
+    archive: Optional["ArchiveIndex"] = None,
+    speculative: bool = False,
 ) -> str:
-    """Run the full pipeline and return the created ZIP path."""
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
-
-    ingest_metrics(metrics_csv)
-    try:
-        ingest_content("data/content")
-    except Exception:
-        pass
-
-    scout = InsightScout()
-    research_md = scout.fetch_research_brief(metrics_csv, research_query)
-    (output_dir / "research.md").write_text(research_md, encoding="utf-8")
-
-    architect = OutlineArchitect()
-    outlines_md = architect.generate_outlines(research_md, issue_brief)
-    (output_dir / "outlines.md").write_text(outlines_md, encoding="utf-8")
-
-    subject_lines = parse_subject_lines(outlines_md)
-    first_outline = outlines_md.split("# Outline Option 1", 1)[-1]
-    if "# Outline Option 2" in first_outline:
-        first_outline = first_outline.split("# Outline Option 2", 1)[0]
-    if not first_outline.startswith("# Outline Option 1"):
-        first_outline = "# Outline Option 1" + first_outline
-
-    smith = Draftsmith()
-    draft_md = smith.create_draft(first_outline)
-    (output_dir / "draft.md").write_text(draft_md, encoding="utf-8")
-
-    editor = EditorInChief()
-    polished_md, summary_md = editor.edit_draft(draft_md)
-    polished_path = output_dir / "polished.md"
-    polished_path.write_text(polished_md, encoding="utf-8")
-    (output_dir / "revision_summary.md").write_text(summary_md, encoding="utf-8")
+    """Run the full pipeline and return the created ZIP path.
 
-    director = CreativeDirector()
-    visuals_txt = director.suggest_visuals(polished_md[:500])
-    (output_dir / "visuals.txt").write_text(visuals_txt, encoding="utf-8")
+    Stages run as soon as their inputs are ready, so the forecast and
+    analysis overlap with drafting and editing, and research overlaps with
+    incremental archive ingestion. The outline stage pulls related passages
+    from the archive index. ``progress(stage, status)`` receives stage
+    status changes (see :func:`src.dag.run_stages`).
 
-    forecaster = MetricsForecaster()
-    forecast_md = forecaster.forecast(metrics_csv, subject_lines)
-    (output_dir / "forecast.md").write_text(forecast_md, encoding="utf-8")
+    Each run writes into its own workspace (see :class:`src.workspace.RunWorkspace`)
+    that is renamed to ``<output_root>/runs/<run_id>`` only when the run
+    succeeds, so concurrent runs never overwrite each other. Afterwards all
+    but the newest ``keep_runs`` runs are garbage-collected (``None`` skips
+    collection).
 
-    fmt = Formatter()
-    zip_path = fmt.package_for_substack(
-        draft_path=str(polished_path),
-        cover_image_path=cover_image,
-        title=title,
-        slug=slug,
-        tags=tags,
-        publish_date=publish_date,
+    With ``ingest_archive=False`` the archive is not re-indexed; ``archive``
+    (which may be ``None``) is used as-is, so batch runs can share one index.
+
+    Every LLM stage's outputs are checkpointed under ``checkpoint_dir``
+    (default ``<output_root>/checkpoints``),
+    keyed by a fingerprint of its inputs (file inputs by content). With
+    ``resume=True`` stages whose inputs are unchanged are restored instead
+    of re-run; ``from_stage`` implies ``resume`` but forces that stage and
+    everything downstream of it to run again.
+
+    A run report (per-stage wall, CPU and LLM time, token counts, cache hits
+    and retries; see :class:`src.instrumentation.RunRecorder`) is written to
+    ``run_report.json`` next to the other outputs. A failed run's workspace
+    is discarded, so its report goes to ``<output_root>/failed/<run_id>.json``.
+
+    With ``speculative=True`` every outline option is drafted and edited
+    concurrently and the best-scoring variant is packaged. All variants
+    are kept under ``variants/option-N/``, with their scores in
+    ``variants/variants.json``, so switching options needs no new calls.
+    """
+    check_from_stage(from_stage, speculative, ingest_archive)
+    stages = build_stages(ingest_archive, speculative)
+    force = downstream(stages, from_stage) if from_stage else set()
+    if not resume and not from_stage:
+        force = {stage.name for stage in stages}
+    checkpoints = CheckpointStore(
+        checkpoint_dir or str(Path(output_root) / "checkpoints"),
+        file_inputs=("metrics_csv", "cover_image"),
     )
+    workspace = RunWorkspace(output_root, run_id)
+    output_dir = workspace.path
+    recorder = RunRecorder(workspace.run_id)
+    stages = recorder.wrap(stages)
+
+    def on_event(stage: str, status: str) -> None:
+        recorder.on_event(stage, status)
+        if progress is not None:
+            progress(stage, status)
 
-    analyst = PerformanceAnalyst()
-    analysis_md = analyst.analyze(forecast_md, metrics_csv)
-    (output_dir / "analysis.md").write_text(analysis_md, encoding="utf-8")
+    def write_artifacts(stage: str, outputs: dict) -> None:
+        for name, value in outputs.items():
+            if name in ARTIFACTS:
+                (output_dir / ARTIFACTS[name]).write_text(value, encoding="utf-8")
+        if "variants" in outputs:
+            _write_variants(output_dir / VARIANTS_DIR, outputs["variants"])
 
-    return zip_path
+    initial = {} if ingest_archive else {"archive": archive}
+    with workspace:
+        try:
+            values = run_stages(
+                stages,
+                {
+                    **initial,
+                    "metrics_csv": metrics_csv,
+                    "research_query": research_query,
+                    "issue_brief": issue_brief,
+                    "cover_image": cover_image,
+                    "title": title,
+                    "slug": slug,
+                    "tags": tags,
+                    "publish_date": publish_date,
+                    "content_dir": "data/content",
+                    "index_dir": "data/index",
+                    "output_dir": output_dir,
+                },
+                max_workers=max_workers,
+                on_event=on_event,
+                on_outputs=write_artifacts,
+                checkpoints=checkpoints,
+                force=force,
+            )
+        except BaseException:
+            recorder.finish("failed")
+            failed_dir = Path(output_root) / FAILED_REPORTS_DIR
+            failed_dir.mkdir(parents=True, exist_ok=True)
+            recorder.write(failed_dir / f"{workspace.run_id}.json")
+            raise
+        recorder.finish("succeeded")
+        recorder.write(output_dir / RUN_REPORT)
+    if keep_runs is not None:
+        gc_runs(output_root, keep=keep_runs)
+    return workspace.resolve(values["zip_path"])
+
+
+REQUIRED_ARGS = (
+    "metrics_csv",
+    "research_query",
+    "issue_brief",
+    "cover_image",
+    "title",
+    "slug",
+    "tags",
+    "publish_date",
+)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run newsletter pipeline")
-    parser.add_argument("--metrics-csv", required=True, help="Path to metrics CSV")
-    parser.add_argument("--research-query", required=True, help="Research query")
-    parser.add_argument("--issue-brief", required=True, help="Issue brief text")
-    parser.add_argument("--cover-image", required=True, help="Cover image path")
-    parser.add_argument("--title", required=True, help="Newsletter title")
-    parser.add_argument("--slug", required=True, help="URL slug")
-    parser.add_argument("--tags", required=True, help="Comma-separated tags")
-    parser.add_argument("--publish-date", required=True, help="Publish date ISO8601")
+    parser.add_argument("--metrics-csv", help="Path to metrics CSV")
+    parser.add_argument("--research-query", help="Research query")
+    parser.add_argument("--issue-brief", help="Issue brief text")
+    parser.add_argument("--cover-image", help="Cover image path")
+    parser.add_argument("--title", help="Newsletter title")
+    parser.add_argument("--slug", help="URL slug")
+    parser.add_argument("--tags", help="Comma-separated tags")
+    parser.add_argument("--publish-date", help="Publish date ISO8601")
+    parser.add_argument(
+        "--cache",
+        help="Cache LLM responses: 'memory' or a SQLite file path (defaults to $LLM_CACHE)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse checkpointed stage outputs whose inputs have not changed",
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=list(dict.fromkeys(s.name for s in build_stages() + build_stages(speculative=True))),
+        help="Re-run this stage and everything downstream of it (implies --resume)",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Draft and edit every outline option concurrently and package the best-scoring one",
+    )
+    parser.add_argument(
+        "--batch",
+        help="Run every spec in a .jsonl or .csv manifest instead of a single issue",
+    )
+    parser.add_argument(
+        "--batch-workers", type=int, default=4, help="Issues to run concurrently in batch mode"
+    )
+    parser.add_argument(
+        "--report",
+        default="output/batch-report.json",
+        help="Where batch mode writes its per-issue JSON report",
+    )
     args = parser.parse_args()
 
+    if args.batch is None:
+        missing = [name for name in REQUIRED_ARGS if getattr(args, name) is None]
+        if missing:
+            flags = ", ".join("--" + name.replace("_", "-") for name in missing)
+            parser.error(f"the following arguments are required: {flags}")
+        try:
+            check_from_stage(args.from_stage, args.speculative)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.cache:
+        path = None if args.cache == "memory" else args.cache
+        configure_response_cache(ResponseCache(path=path))
+
+    if args.batch is not None:
+        from src.batch import load_manifest, run_batch
+
+        specs = load_manifest(args.batch)
+        if args.resume or args.from_stage:
+            for spec in specs:
+                spec.setdefault("resume", args.resume)
+                spec.setdefault("from_stage", args.from_stage)
+        if args.speculative:
+            for spec in specs:
+                spec.setdefault("speculative", True)
+
+        def report(entry: dict) -> None:
+            outcome = entry["zip_path"] if entry["status"] == "succeeded" else entry["error"]
+            print(f"[{entry['index'] + 1}/{len(specs)}] {entry['slug']}: {entry['status']} ({outcome})")
+
+        results = run_batch(
+            specs, max_concurrent=args.batch_workers, report_path=args.report, on_result=report
+        )
+        failed = sum(r["status"] != "succeeded" for r in results)
+        print(f"Batch complete: {len(results) - failed} succeeded, {failed} failed. Report: {args.report}")
+        if failed:
+            raise SystemExit(1)
+        return
+
     zip_path = run_pipeline(
         metrics_csv=args.metrics_csv,
         research_query=args.research_query,
@@ -133,10 +502,13 @@ def main():
         slug=args.slug,
         tags=[t.strip() for t in args.tags.split(',') if t.strip()],
         publish_date=args.publish_date,
+        resume=args.resume,
+        from_stage=args.from_stage,
+        speculative=args.speculative,
     )
 
     print(f"Pipeline complete. Package created at: {zip_path}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
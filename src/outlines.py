@@ -0,0 +1,83 @@
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+SUBJECT_HEADING = "Subject Line Candidates"
+
+_OPTION_RE = re.compile(r"^\s*#{1,3}\s*Outline Option\s+(\d+)\b[ \t:.\-\u2013\u2014]*(.*)$", re.IGNORECASE)
+_HEADING_RE = re.compile(r"^\s*(#{1,6})\s+(.*?)\s*#*\s*$")
+_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+_QUOTES = "\"'\u201c\u201d\u2018\u2019"
+
+
+@dataclass
+class OutlineSection:
+    title: str
+    description: str = ""
+
+
+@dataclass
+class Outline:
+    """One ``# Outline Option N`` block of the Outline Architect's Markdown."""
+
+    number: int
+    markdown: str
+    title: str = ""
+    sections: List[OutlineSection] = field(default_factory=list)
+    subject_lines: List[str] = field(default_factory=list)
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"[*_`]", "", text).strip().strip(_QUOTES).strip()
+
+
+def _parse_block(number: int, title: str, lines: List[str]) -> Outline:
+    outline = Outline(number=number, markdown="\n".join(lines).strip(), title=_clean(title))
+    in_subjects = False
+    for line in lines[1:]:
+        heading = _HEADING_RE.match(line)
+        if heading:
+            name = _clean(heading.group(2))
+            in_subjects = name.lower().startswith(SUBJECT_HEADING.lower())
+            if not in_subjects:
+                outline.sections.append(OutlineSection(name))
+            continue
+        if not line.strip():
+            continue
+        item = _ITEM_RE.match(line)
+        if in_subjects:
+            if item:
+                subject = _clean(item.group(1))
+                if subject:
+                    outline.subject_lines.append(subject)
+            elif outline.subject_lines:
+                # The list has ended; ignore trailing prose.
+                in_subjects = False
+        elif outline.sections:
+            section = outline.sections[-1]
+            text = _clean(item.group(1) if item else line)
+            section.description = f"{section.description} {text}".strip()
+    return outline
+
+
+def parse_outlines(outlines_md: str) -> List[Outline]:
+    """Split the Outline Architect's Markdown into its outline options, in order.
+
+    Options start at ``# Outline Option N`` headings (any heading level up
+    to three, any case). Within an option, other headings are sections and
+    the list under ``## Subject Line Candidates`` holds the subject lines,
+    with quotes and emphasis removed. Text with no option headings is one
+    option numbered 1; text before the first option heading is ignored.
+    """
+    blocks: List[tuple] = []
+    for line in outlines_md.splitlines():
+        match = _OPTION_RE.match(line)
+        if match:
+            number, title = int(match.group(1)), match.group(2).strip()
+            heading = f"# Outline Option {number}" + (f": {title}" if title else "")
+            blocks.append((number, title, [heading]))
+        elif blocks:
+            blocks[-1][2].append(line)
+    if not blocks:
+        return [_parse_block(1, "", ["# Outline Option 1", *outlines_md.splitlines()])]
+    return [_parse_block(number, title, lines) for number, title, lines in blocks]
@@ -0,0 +1,284 @@
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Context windows of the Groq models the agents use, in tokens.
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "compound-beta-mini": 131072,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+# Room kept free for the completion and for the instructions around an input.
+COMPLETION_RESERVE = 4096
+PROMPT_OVERHEAD = 512
+# Cap on any one pasted input. Long prompts cost latency and tokens per
+# minute well before they reach the context window.
+DEFAULT_INPUT_TOKENS = 6000
+MIN_INPUT_TOKENS = 256
+
+_WORD_RE = re.compile(r"\w+")
+_SYMBOL_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\n|[ \t]{2,}")
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+_LINE_UNIT_RE = re.compile(r"^\s*(?:[-*+]\s|\d+[.)]\s|\||>)")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=\S)")
+# Placeholders such as <!-- COVER_IMAGE_HOOK --> are instructions; keep them.
+_COMMENT_RE = re.compile(r"<!--(?!\s*[A-Z][A-Z0-9_]*\s*-->).*?-->", re.DOTALL)
+# Whole-line newsletter footers only; prose that merely starts with one of
+# these phrases is kept.
+_BOILERPLATE_RE = re.compile(
+    r"^\W*(?:unsubscribe(?: here)?|view (?:this email |it )?in (?:your )?browser|share this post"
+    r"|subscribe(?: now| for free)?|leave a comment|thanks for reading"
+    r"|manage (?:your )?(?:email )?preferences)\W*$",
+    re.IGNORECASE,
+)
+_STOPWORDS = frozenset(
+    "the and for that with this from have are was were will would they their there what when which "
+    "into about your you our but not all can has had its also more than then them these those been".split()
+)
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the model's token count without a tokenizer.
+
+    Words count one token per four characters (rounded up), other symbols
+    one each, and newlines and runs of spaces one each. This errs slightly
+    high for English prose, which is the safe side for a budget.
+    """
+    words = sum((len(w) + 3) // 4 for w in _WORD_RE.findall(text))
+    return words + len(_SYMBOL_RE.findall(text)) + len(_SPACE_RE.findall(text))
+
+
+def _configured_caps() -> Dict[str, int]:
+    raw = os.getenv("PROMPT_BUDGETS")
+    return {model: int(tokens) for model, tokens in json.loads(raw).items()} if raw else {}
+
+
+def input_budget(model: str, reserved: int = 0) -> int:
+    """Tokens one pasted input may use in a prompt for ``model``.
+
+    The smaller of the per-input cap (``PROMPT_BUDGETS`` JSON per model, else
+    ``PROMPT_INPUT_TOKENS``, else :data:`DEFAULT_INPUT_TOKENS`) and what the
+    context window leaves after the completion and instructions, less
+    ``reserved`` tokens used by other inputs in the same prompt.
+    """
+    cap = _configured_caps().get(model) or int(os.getenv("PROMPT_INPUT_TOKENS", DEFAULT_INPUT_TOKENS))
+    window = CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW) - COMPLETION_RESERVE - PROMPT_OVERHEAD
+    return max(MIN_INPUT_TOKENS, min(cap, window) - reserved)
+
+
+@dataclass(frozen=True)
+class Compaction:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    summarized: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class Prompt(str):
+    """A prompt that remembers how many tokens compaction removed from its inputs.
+
+    :mod:`src.llm` copies ``tokens_saved`` onto the call's
+    :class:`~src.instrumentation.CallRecord`.
+    """
+
+    tokens_saved: int = 0
+
+    def __new__(cls, text: str, tokens_saved: int = 0):
+        prompt = super().__new__(cls, text)
+        prompt.tokens_saved = tokens_saved
+        return prompt
+
+
+def _split_fences(text: str) -> List[Tuple[bool, str]]:
+    """Split ``text`` into ``(fenced, segment)`` runs; an unclosed fence runs to the end."""
+    segments, current, fenced = [], [], False
+    for line in text.split("\n"):
+        if line.lstrip().startswith("```"):
+            if fenced:
+                current.append(line)
+            if current:
+                segments.append((fenced, "\n".join(current)))
+            current = [] if fenced else [line]
+            fenced = not fenced
+            continue
+        current.append(line)
+    if current:
+        segments.append((fenced, "\n".join(current)))
+    return segments
+
+
+def _outside_fences(text: str, clean: Callable[[str], str]) -> str:
+    """Apply ``clean`` to the prose of ``text``, leaving fenced code untouched."""
+    return "\n".join(segment if fenced else clean(segment) for fenced, segment in _split_fences(text))
+
+
+def _normalize_line(line: str) -> str:
+    # Keep indentation and trailing two-space hard breaks; collapse runs elsewhere.
+    indent = len(line) - len(line.lstrip(" \t"))
+    body = line[indent:].rstrip()
+    hard_break = "  " if body and line.endswith("  ") else ""
+    return line[:indent] + re.sub(r"[ \t]{2,}", " ", body) + hard_break
+
+
+def _normalize_whitespace(text: str) -> str:
+    def clean(prose: str) -> str:
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(_normalize_line(l) for l in prose.split("\n")))
+
+    return _outside_fences(text.replace("\r\n", "\n"), clean).strip()
+
+
+def _strip_boilerplate(text: str) -> str:
+    def clean(prose: str) -> str:
+        prose = _COMMENT_RE.sub("", prose)
+        return "\n".join(line for line in prose.split("\n") if not _BOILERPLATE_RE.match(line.strip()))
+
+    return _outside_fences(text, clean)
+
+
+def _key(block: str) -> str:
+    return " ".join(_WORD_RE.findall(block.lower()))
+
+
+def _blocks(text: str) -> List[str]:
+    """Split on blank lines, giving each heading its own block; code fences stay whole."""
+    blocks, current, fenced = [], [], False
+    for line in text.split("\n"):
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+        if not fenced and (not line.strip() or _HEADING_RE.match(line)):
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            if line.strip():
+                blocks.append(line)
+            continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def _dedupe(text: str, min_chars: int = 40) -> str:
+    """Drop repeated sections and paragraphs, keeping the first occurrence.
+
+    Short blocks (headings, separators, one-line labels) are allowed to
+    repeat, since outlines legitimately reuse headings.
+    """
+    sections: List[List[str]] = [[]]
+    for block in _blocks(text):
+        if _HEADING_RE.match(block) and sections[-1]:
+            sections.append([])
+        sections[-1].append(block)
+
+    seen_sections, seen_blocks, kept = set(), set(), []
+    for section in sections:
+        body = _key("\n\n".join(b for b in section if not _HEADING_RE.match(b)))
+        if len(body) >= min_chars:
+            if body in seen_sections:
+                continue
+            seen_sections.add(body)
+        for block in section:
+            key = _key(block)
+            code = block.lstrip().startswith("```")
+            if len(key) >= min_chars and not _HEADING_RE.match(block) and not code:
+                if key in seen_blocks:
+                    continue
+                seen_blocks.add(key)
+            kept.append(block)
+    return "\n\n".join(kept)
+
+
+def _units(block: str) -> Tuple[str, List[str]]:
+    """Split a block into ``(joiner, units)`` that summarization keeps or drops whole."""
+    if block.lstrip().startswith("```") or _HEADING_RE.match(block):
+        return "\n", [block]
+    lines = block.split("\n")
+    if any(_LINE_UNIT_RE.match(line) for line in lines):
+        return "\n", lines
+    return " ", _SENTENCE_RE.split(" ".join(line.strip() for line in lines))
+
+
+def _summarize(text: str, budget: int) -> str:
+    """Keep the highest-scoring sentences, in their original order, within ``budget``.
+
+    Sentences score by the average document frequency of their content
+    words, with a bonus for the lead sentence of each block and for
+    sentences carrying numbers. A heading is kept with the first sentence
+    kept under it; code blocks are kept or dropped whole.
+    """
+    blocks = [_units(block) for block in _blocks(text)]
+    freq = Counter(w for w in _WORD_RE.findall(text.lower()) if len(w) > 3 and w not in _STOPWORDS)
+
+    heading, headings, candidates = None, {}, []
+    for b, (_, units) in enumerate(blocks):
+        if _HEADING_RE.match(units[0]):
+            heading = b
+            continue
+        headings[b] = heading
+        for u, unit in enumerate(units):
+            words = [w for w in _WORD_RE.findall(unit.lower()) if len(w) > 3 and w not in _STOPWORDS]
+            score = sum(freq[w] for w in words) / (len(words) or 1)
+            score *= (1.5 if u == 0 else 1.0) * (1.25 if re.search(r"\d", unit) else 1.0)
+            candidates.append((score, b, u))
+
+    keep, used = set(), 0
+    for _, b, u in sorted(candidates, key=lambda c: -c[0]):
+        cost = count_tokens(blocks[b][1][u]) + 1
+        h = headings[b]
+        if h is not None and (h, 0) not in keep:
+            cost += count_tokens(blocks[h][1][0]) + 2
+        if used + cost <= budget:
+            used += cost
+            keep.update({(b, u), (h, 0)} if h is not None else {(b, u)})
+
+    out = []
+    for b, (joiner, units) in enumerate(blocks):
+        kept = [unit for u, unit in enumerate(units) if (b, u) in keep]
+        if kept:
+            out.append(joiner.join(kept))
+    return "\n\n".join(out)
+
+
+def _truncate(text: str, budget: int) -> str:
+    words, used = [], 0
+    for word in text.split(" "):
+        used += count_tokens(word) + 1
+        if used > budget:
+            break
+        words.append(word)
+    return " ".join(words).rstrip() + "\u2026"
+
+
+def compact(text: str, budget: Optional[int] = None, summarize: bool = True) -> Compaction:
+    """Shrink ``text`` without changing what it says, then fit it to ``budget``.
+
+    Whitespace runs, newsletter boilerplate (whole-line unsubscribe and
+    share footers, HTML comments other than ``<!-- PLACEHOLDER -->`` hooks)
+    and repeated sections or paragraphs are always removed; fenced code is
+    left as written. If the result is still over
+    ``budget`` tokens it is summarized extractively (see :func:`_summarize`),
+    or with ``summarize=False`` returned as is.
+    """
+    before = count_tokens(text)
+    result = _dedupe(_normalize_whitespace(_strip_boilerplate(text)))
+    summarized = False
+    if summarize and budget is not None and count_tokens(result) > budget:
+        result = _summarize(result, budget)
+        if count_tokens(result) > budget:
+            result = _truncate(result, budget)
+        summarized = True
+    return Compaction(result, before, count_tokens(result), summarized)
+
+
+def fit(model: str, text: str, reserved: int = 0, summarize: bool = True) -> Compaction:
+    """Compact one input for a prompt to ``model``; see :func:`input_budget`."""
+    return compact(text, input_budget(model, reserved), summarize=summarize)
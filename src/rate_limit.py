@@ -0,0 +1,383 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.prompt_budget import count_tokens
+
+# Lower values are served first.
+INTERACTIVE = 0
+BATCH = 10
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+_RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+@contextmanager
+def priority(level: int):
+    """Run LLM calls made inside the block (and in stages it starts) at ``level``."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def estimate_tokens(system: str, prompt: str, params: Dict[str, Any]) -> int:
+    """Request size: locally counted prompt tokens plus the completion budget."""
+    completion = params.get("max_completion_tokens") or params.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+    return count_tokens(system) + count_tokens(prompt) + int(completion)
+
+
+class TokenBucket:
+    """Refills continuously to ``per_minute`` units over a minute."""
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` (capped at capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _ModelState:
+    def __init__(self, rpm: Optional[float], tpm: Optional[float], now: float):
+        self.requests = TokenBucket(rpm, now) if rpm else None
+        self.tokens = TokenBucket(tpm, now) if tpm else None
+        self.waiters: list = []
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.counts = {"requests": 0, "retries": 0, "rate_limited": 0, "tokens": 0}
+        self.waited = 0.0
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds from a ``Retry-After`` (or ``retry-after-ms``) response header."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for rate limits, server errors, timeouts and connection failures."""
+    import groq
+
+    if isinstance(exc, groq.APIConnectionError):
+        return True
+    if isinstance(exc, groq.APIStatusError):
+        return exc.status_code in _RETRY_STATUSES
+    return False
+
+
+class RateLimiter:
+    """Per-model request/token buckets with a priority queue and retries.
+
+    ``limits`` maps a model name to ``{"rpm": ..., "tpm": ...}``; models not
+    listed use ``default_rpm``/``default_tpm`` (``None`` means unlimited).
+    Callers wait in priority order (see :func:`priority`), so interactive
+    requests overtake queued batch work. Retryable failures are retried up
+    to ``max_retries`` times with full-jitter exponential backoff, waiting
+    at least as long as the server's ``Retry-After``; a 429 also pauses the
+    whole model so other callers stop adding to the burst.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        default_rpm: Optional[float] = None,
+        default_tpm: Optional[float] = None,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        asleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.limits = limits or {}
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self.asleep = asleep
+        self.jitter = jitter
+        self._cond = threading.Condition()
+        self._models: Dict[str, _ModelState] = {}
+        self._seq = itertools.count()
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            limit = self.limits.get(model, {})
+            state = _ModelState(
+                limit.get("rpm", self.default_rpm), limit.get("tpm", self.default_tpm), self.clock()
+            )
+            self._models[model] = state
+        return state
+
+    def _try_acquire(self, state: _ModelState, ticket: tuple, tokens: int) -> Optional[float]:
+        """Take capacity for ``ticket`` and return ``None``, or return how long to wait."""
+        if state.waiters[0] != ticket:
+            return 0.05  # someone with higher priority is first; wait for a notify
+        now = self.clock()
+        delay = state.paused_until - now
+        if state.requests is not None:
+            delay = max(delay, state.requests.delay(1, now))
+        if state.tokens is not None:
+            delay = max(delay, state.tokens.delay(tokens, now))
+        if delay > 0:
+            return delay
+        heapq.heappop(state.waiters)
+        if state.requests is not None:
+            state.requests.take(1, now)
+        if state.tokens is not None:
+            state.tokens.take(tokens, now)
+        state.in_flight += 1
+        state.counts["requests"] += 1
+        state.counts["tokens"] += tokens
+        self._cond.notify_all()
+        return None
+
+    def _enqueue(self, model: str, level: Optional[int]) -> tuple:
+        ticket = (current_priority() if level is None else level, next(self._seq))
+        heapq.heappush(self._state(model).waiters, ticket)
+        return ticket
+
+    def _dequeue(self, model: str, ticket: tuple) -> None:
+        waiters = self._state(model).waiters
+        if ticket in waiters:
+            waiters.remove(ticket)
+            heapq.heapify(waiters)
+            self._cond.notify_all()
+
+    def acquire(self, model: str, tokens: int, level: Optional[int] = None) -> float:
+        """Block until ``model`` has capacity for one request of ``tokens`` tokens.
+
+        Returns the seconds spent waiting.
+        """
+        start = self.clock()
+        with self._cond:
+            ticket = self._enqueue(model, level)
+            state = self._state(model)
+            try:
+                while True:
+                    delay = self._try_acquire(state, ticket, tokens)
+                    if delay is None:
+                        break
+                    self._cond.wait(timeout=delay)
+            except BaseException:
+                self._dequeue(model, ticket)
+                raise
+            waited = self.clock() - start
+            state.waited += waited
+        return waited
+
+    async def aacquire(self, model: str, tokens: int, level: Optional[int] = None) -> float:
+        """Coroutine variant of :meth:`acquire`; waits without blocking the loop."""
+        start = self.clock()
+        with self._cond:
+            ticket = self._enqueue(model, level)
+            state = self._state(model)
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_acquire(state, ticket, tokens)
+                if delay is None:
+                    break
+                await self.asleep(min(delay, 0.05))
+        except BaseException:
+            with self._cond:
+                self._dequeue(model, ticket)
+            raise
+        waited = self.clock() - start
+        with self._cond:
+            state.waited += waited
+        return waited
+
+    def release(self, model: str, reserved: int, used: Optional[int] = None) -> None:
+        """Finish a request, crediting or charging the difference to the token bucket."""
+        with self._cond:
+            state = self._state(model)
+            state.in_flight -= 1
+            if used is not None and state.tokens is not None:
+                now = self.clock()
+                if used < reserved:
+                    state.tokens.give(reserved - used, now)
+                else:
+                    state.tokens.take(used - reserved, now)
+                state.counts["tokens"] += used - reserved
+            self._cond.notify_all()
+
+    def pause(self, model: str, seconds: float) -> None:
+        """Stop handing out capacity for ``model`` for ``seconds``."""
+        with self._cond:
+            state = self._state(model)
+            state.paused_until = max(state.paused_until, self.clock() + seconds)
+            self._cond.notify_all()
+
+    def _retry_delay(self, model: str, exc: BaseException, attempt: int) -> Optional[float]:
+        if attempt >= self.max_retries or not is_retryable(exc):
+            return None
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt) * self.jitter()
+        retry_after = _retry_after(exc)
+        with self._cond:
+            state = self._state(model)
+            state.counts["retries"] += 1
+            if getattr(exc, "status_code", None) == 429:
+                state.counts["rate_limited"] += 1
+        if getattr(exc, "status_code", None) == 429:
+            self.pause(model, retry_after if retry_after is not None else backoff)
+        return max(backoff, retry_after or 0.0)
+
+    @staticmethod
+    def _usage(response: Any) -> Optional[int]:
+        used = getattr(getattr(response, "usage", None), "total_tokens", None)
+        return used if isinstance(used, int) else None
+
+    def call(self, model: str, tokens: int, fn: Callable[[], Any], record: Any = None) -> Any:
+        """Run ``fn()`` under the model's limits, retrying retryable failures.
+
+        If given, ``record`` (a :class:`src.instrumentation.CallRecord`) gets
+        the queueing time and retry count added to it.
+        """
+        for attempt in itertools.count():
+            waited = self.acquire(model, tokens)
+            if record is not None:
+                record.queue_seconds += waited
+            try:
+                response = fn()
+            except Exception as exc:
+                self.release(model, tokens)
+                delay = self._retry_delay(model, exc, attempt)
+                if delay is None:
+                    raise
+                if record is not None:
+                    record.retries += 1
+                self.sleep(delay)
+                continue
+            self.release(model, tokens, self._usage(response))
+            return response
+
+    async def acall(
+        self, model: str, tokens: int, fn: Callable[[], Awaitable[Any]], record: Any = None
+    ) -> Any:
+        """Coroutine variant of :meth:`call`; ``fn`` returns an awaitable."""
+        for attempt in itertools.count():
+            waited = await self.aacquire(model, tokens)
+            if record is not None:
+                record.queue_seconds += waited
+            try:
+                response = await fn()
+            except Exception as exc:
+                self.release(model, tokens)
+                delay = self._retry_delay(model, exc, attempt)
+                if delay is None:
+                    raise
+                if record is not None:
+                    record.retries += 1
+                await self.asleep(delay)
+                continue
+            self.release(model, tokens, self._usage(response))
+            return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Live per-model queue depth, in-flight requests and counters."""
+        with self._cond:
+            now = self.clock()
+            return {
+                model: {
+                    "queued": len(state.waiters),
+                    "in_flight": state.in_flight,
+                    "paused_for": round(max(0.0, state.paused_until - now), 3),
+                    **state.counts,
+                    "wait_seconds": round(state.waited, 3),
+                }
+                for model, state in self._models.items()
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter, configured from the environment.
+
+    ``GROQ_RPM``/``GROQ_TPM`` set default per-model limits (unset means
+    unlimited), ``GROQ_RATE_LIMITS`` holds per-model JSON overrides such as
+    ``{"llama-3.3-70b-versatile": {"rpm": 30, "tpm": 6000}}``, and
+    ``GROQ_MAX_RETRIES`` (default 4) bounds retries.
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                limits=json.loads(os.getenv("GROQ_RATE_LIMITS", "{}")),
+                default_rpm=_env_float("GROQ_RPM"),
+                default_tpm=_env_float("GROQ_TPM"),
+                max_retries=int(os.getenv("GROQ_MAX_RETRIES", "4")),
+            )
+        return _limiter
+
+
+def configure_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the process-wide limiter (``None`` re-reads the environment)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
@@ -0,0 +1,78 @@
+import functools
+import threading
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class AgentRegistry:
+    """Process-wide agent singletons, built on first use.
+
+    Agents keep no per-request state; each holds only the shared pooled Groq
+    client (see :func:`src.utils.get_groq_client`), so one instance per class
+    can serve concurrent API requests and pipeline stages. Construction
+    happens once under a lock; a constructor that raises (for example with
+    no ``GROQ_API_KEY``) is retried on the next call.
+    """
+
+    def __init__(self):
+        self._agents: Dict[type, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cls: Type[T]) -> T:
+        agent = self._agents.get(cls)
+        if agent is None:
+            with self._lock:
+                agent = self._agents.get(cls)
+                if agent is None:
+                    agent = self._agents[cls] = cls()
+        return agent
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._agents.clear()
+
+
+_registry: Optional[AgentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> AgentRegistry:
+    """Return the process-wide registry shared by the API and ``run_pipeline``."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = AgentRegistry()
+        return _registry
+
+
+def configure_registry(registry: Optional[AgentRegistry]) -> None:
+    """Replace the process-wide registry (``None`` starts a fresh one on next use)."""
+    global _registry
+    with _registry_lock:
+        _registry = registry
+
+
+@functools.lru_cache(maxsize=None)
+def agent(cls: Type[T]) -> Callable[..., T]:
+    """FastAPI dependency that injects the shared ``cls`` instance.
+
+    The same callable is returned for a class every time, so tests can
+    replace it with ``app.dependency_overrides[agent(cls)]``. A constructor
+    failure (such as a missing API key) becomes a 502, as the handlers map
+    agent errors.
+    """
+
+    def dependency() -> T:
+        from fastapi import HTTPException
+
+        try:
+            return get_registry().get(cls)
+        except RuntimeError as re:
+            raise HTTPException(status_code=502, detail=str(re))
+
+    dependency.__name__ = f"get_{cls.__name__}"
+    return dependency
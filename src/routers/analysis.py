@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agents.performance_analyst import PerformanceAnalyst
+from src.registry import agent
+
+router = APIRouter()
+
+
+class AnalyzeRequest(BaseModel):
+    forecast_markdown: str
+    actuals_csv_path: str
+
+
+class AnalyzeResponse(BaseModel):
+    analysis_markdown: str
+
+
+@router.post("/api/analyze-performance", response_model=AnalyzeResponse)
+async def analyze_performance(
+    req: AnalyzeRequest,
+    analyst: PerformanceAnalyst = Depends(agent(PerformanceAnalyst)),
+):
+    """Compare forecast vs. actual metrics and return lessons learned."""
+    try:
+        md = await analyst.aanalyze(req.forecast_markdown, req.actuals_csv_path)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except FileNotFoundError as fnf:
+        raise HTTPException(status_code=404, detail=str(fnf))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return AnalyzeResponse(analysis_markdown=md)
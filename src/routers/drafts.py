@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agents.draftsmith import Draftsmith
+from src.registry import agent
+from src.routers.streaming import streaming_response
+
+router = APIRouter()
+
+
+class DraftRequest(BaseModel):
+    outline_markdown: str
+
+
+class DraftResponse(BaseModel):
+    draft_markdown: str
+
+
+@router.post("/api/create-draft", response_model=DraftResponse)
+async def create_draft(req: DraftRequest, smith: Draftsmith = Depends(agent(Draftsmith))):
+    """Expand an outline into a full newsletter draft."""
+    try:
+        draft_md = await smith.acreate_draft(req.outline_markdown)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return DraftResponse(draft_markdown=draft_md)
+
+
+@router.post("/api/create-draft/stream")
+async def create_draft_stream(req: DraftRequest, smith: Draftsmith = Depends(agent(Draftsmith))):
+    """Stream the draft as server-sent ``token`` events."""
+    try:
+        chunks = smith.astream_draft(req.outline_markdown)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+
+    async def parts():
+        async for text in chunks:
+            yield "token", text
+
+    return streaming_response("create-draft", parts())
@@ -0,0 +1,52 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agents.editor_in_chief import EditorInChief
+from src.registry import agent
+from src.routers.streaming import streaming_response
+
+router = APIRouter()
+
+
+class EditRequest(BaseModel):
+    draft_markdown: str
+    # None edits long drafts section by section; True/False forces it.
+    chunked: Optional[bool] = None
+
+
+class EditResponse(BaseModel):
+    polished_markdown: str
+    revision_summary: str
+
+
+@router.post("/api/edit-draft", response_model=EditResponse)
+async def edit_draft(req: EditRequest, editor: EditorInChief = Depends(agent(EditorInChief))):
+    """Polish a draft and return polished content plus revision summary."""
+    try:
+        polished, summary = await editor.aedit_draft(req.draft_markdown, chunked=req.chunked)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return EditResponse(polished_markdown=polished, revision_summary=summary)
+
+
+@router.post("/api/edit-draft/stream")
+async def edit_draft_stream(
+    req: EditRequest,
+    editor: EditorInChief = Depends(agent(EditorInChief)),
+):
+    """Stream the edit as ``polished`` and ``summary`` server-sent events."""
+    try:
+        parts = editor.astream_edit(req.draft_markdown, chunked=req.chunked)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+
+    return streaming_response("edit-draft", parts)
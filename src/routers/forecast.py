@@ -0,0 +1,89 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from src.agents.metrics_forecaster import MetricsForecaster
+from src.forecasting import score_batches
+from src.registry import agent
+
+router = APIRouter()
+
+
+class ForecastRequest(BaseModel):
+    csv_path: str
+    subject_lines: List[str]
+    narrative: bool = True
+
+
+class ForecastResponse(BaseModel):
+    forecast_markdown: str
+
+
+@router.post("/api/forecast-performance", response_model=ForecastResponse)
+async def forecast_performance(
+    req: ForecastRequest,
+    forecaster: MetricsForecaster = Depends(agent(MetricsForecaster)),
+):
+    """Generate a performance forecast from metrics CSV and subject lines."""
+    try:
+        md = await forecaster.aforecast(req.csv_path, req.subject_lines, narrative=req.narrative)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Metrics CSV not found.")
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return ForecastResponse(forecast_markdown=md)
+
+
+class ScoreBatch(BaseModel):
+    csv_path: str
+    subject_lines: List[str]
+    issue_date: Optional[str] = None
+
+
+class ScoreSubjectsRequest(BaseModel):
+    batches: List[ScoreBatch]
+    top_k: Optional[int] = None
+
+
+class SubjectScore(BaseModel):
+    rank: int
+    subject: str
+    open_rate: float
+    low: float
+    high: float
+
+
+class BatchScores(BaseModel):
+    csv_path: str
+    issue_date: str
+    scores: List[SubjectScore]
+
+
+class ScoreSubjectsResponse(BaseModel):
+    results: List[BatchScores]
+
+
+@router.post("/api/score-subjects", response_model=ScoreSubjectsResponse)
+async def score_subjects(req: ScoreSubjectsRequest):
+    """Rank many subject-line candidates per metrics CSV with the local forecaster."""
+    if not req.batches:
+        raise HTTPException(status_code=400, detail="At least one batch is required.")
+    try:
+        results = await run_in_threadpool(
+            score_batches, [b.model_dump() for b in req.batches], req.top_k
+        )
+    except FileNotFoundError as fe:
+        raise HTTPException(status_code=404, detail=str(fe))
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return ScoreSubjectsResponse(results=results)
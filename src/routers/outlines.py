@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agents.outline_architect import OutlineArchitect
+from src.registry import agent
+
+router = APIRouter()
+
+
+class OutlineRequest(BaseModel):
+    research_brief: str
+    issue_brief: str
+
+
+class OutlineResponse(BaseModel):
+    outlines_markdown: str
+
+
+@router.post("/api/generate-outlines", response_model=OutlineResponse)
+async def generate_outlines(
+    req: OutlineRequest,
+    architect: OutlineArchitect = Depends(agent(OutlineArchitect)),
+):
+    """Generate newsletter outlines from research and issue briefs."""
+    try:
+        md = await architect.agenerate_outlines(req.research_brief, req.issue_brief)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return OutlineResponse(outlines_markdown=md)
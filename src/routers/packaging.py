@@ -0,0 +1,78 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.agents.formatter import Formatter
+from src.registry import agent
+
+router = APIRouter()
+
+
+class PackageRequest(BaseModel):
+    draft_path: str
+    cover_image_path: str
+    title: str
+    slug: str
+    tags: List[str]
+    publish_date: str
+
+
+class PackageResponse(BaseModel):
+    package_zip_path: str
+
+
+@router.post("/api/package-for-substack", response_model=PackageResponse)
+async def package_for_substack(req: PackageRequest, fmt: Formatter = Depends(agent(Formatter))):
+    """Package final draft and assets into a Substack-ready ZIP."""
+    try:
+        zip_path = await fmt.apackage_for_substack(
+            draft_path=req.draft_path,
+            cover_image_path=req.cover_image_path,
+            title=req.title,
+            slug=req.slug,
+            tags=req.tags,
+            publish_date=req.publish_date,
+        )
+    except FileNotFoundError as fnf:
+        raise HTTPException(status_code=404, detail=str(fnf))
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return PackageResponse(package_zip_path=zip_path)
+
+
+@router.post("/api/package-for-substack/stream")
+async def package_for_substack_stream(
+    req: PackageRequest,
+    fmt: Formatter = Depends(agent(Formatter)),
+):
+    """Stream the package ZIP as the response body without writing the ZIP to disk."""
+    try:
+        filename, chunks = await run_in_threadpool(
+            fmt.stream_package,
+            req.draft_path,
+            req.cover_image_path,
+            req.title,
+            req.slug,
+            req.tags,
+            req.publish_date,
+        )
+    except FileNotFoundError as fnf:
+        raise HTTPException(status_code=404, detail=str(fnf))
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,146 @@
+import os
+import threading
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from src.jobs import FAILED, SUCCEEDED, JobQueue, JobStore, jobs_db_path
+from src.orchestrator import run_pipeline
+from src.rate_limit import BATCH, priority
+
+router = APIRouter()
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def _run_job(**params):
+    # Queued jobs yield Groq capacity to interactive requests.
+    with priority(BATCH):
+        return run_pipeline(**params)
+
+
+def get_job_queue() -> JobQueue:
+    """Return the pipeline job queue, creating it (and resuming jobs) on first use.
+
+    The API's lifespan calls this at startup when a job database exists, so
+    unfinished jobs resume without waiting for a ``/api/jobs`` request.
+    Job state lives in ``$JOBS_DB`` (default ``jobs/jobs.sqlite``) and
+    ``$PIPELINE_WORKERS`` pipelines run at once (default 2).
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            store = JobStore(jobs_db_path())
+            _job_queue = JobQueue(
+                store,
+                _run_job,
+                max_workers=int(os.getenv("PIPELINE_WORKERS", "2")),
+            )
+        return _job_queue
+
+
+def shutdown_job_queue() -> None:
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.shutdown(wait=False)
+
+
+class PipelineRequest(BaseModel):
+    metrics_csv: str
+    research_query: str
+    issue_brief: str
+    cover_image: str
+    title: str
+    slug: str
+    tags: List[str]
+    publish_date: str
+    # Draft and edit every outline option, keeping all variants.
+    speculative: bool = False
+
+
+class PipelineResponse(BaseModel):
+    package_zip_path: str
+
+
+@router.post("/api/run-pipeline", response_model=PipelineResponse)
+async def run_pipeline_api(req: PipelineRequest):
+    """Run the full newsletter pipeline and return the package ZIP path."""
+    try:
+        zip_path = await run_in_threadpool(
+            run_pipeline,
+            metrics_csv=req.metrics_csv,
+            research_query=req.research_query,
+            issue_brief=req.issue_brief,
+            cover_image=req.cover_image,
+            title=req.title,
+            slug=req.slug,
+            tags=req.tags,
+            publish_date=req.publish_date,
+            speculative=req.speculative,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {e}")
+    return PipelineResponse(package_zip_path=zip_path)
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    stages: dict[str, str]
+    completed_stages: int
+    total_stages: int
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+def _get_job(job_id: str) -> dict:
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@router.post("/api/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_pipeline_job(req: PipelineRequest):
+    """Queue a pipeline run and return its job ID immediately."""
+    job_id = await run_in_threadpool(get_job_queue().submit, req.model_dump())
+    return JobSubmitResponse(job_id=job_id, status="queued")
+
+
+@router.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_pipeline_job(job_id: str):
+    """Return a job's status and stage-by-stage progress."""
+    job = await run_in_threadpool(_get_job, job_id)
+    stages = job["progress"]
+    return JobStatusResponse(
+        job_id=job["id"],
+        status=job["status"],
+        stages=stages,
+        completed_stages=sum(1 for s in stages.values() if s in ("done", "skipped")),
+        total_stages=len(stages),
+        error=job["error"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+    )
+
+
+@router.get("/api/jobs/{job_id}/result", response_model=PipelineResponse)
+async def get_pipeline_job_result(job_id: str):
+    """Return the package ZIP path of a finished job."""
+    job = await run_in_threadpool(_get_job, job_id)
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {job['error']}")
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}.")
+    return PipelineResponse(package_zip_path=job["result"])
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agents.insight_scout import InsightScout
+from src.registry import agent
+
+router = APIRouter()
+
+
+class ResearchRequest(BaseModel):
+    csv_path: str
+    query: str
+
+
+class ResearchResponse(BaseModel):
+    research_brief: str
+
+
+@router.post("/api/generate-research", response_model=ResearchResponse)
+async def generate_research(
+    req: ResearchRequest,
+    scout: InsightScout = Depends(agent(InsightScout)),
+):
+    """Generate a research brief from metrics CSV and search query."""
+    try:
+        brief = await scout.afetch_research_brief(req.csv_path, req.query)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Metrics CSV not found.")
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return ResearchResponse(research_brief=brief)
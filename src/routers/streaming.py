@@ -0,0 +1,41 @@
+import json
+import logging
+import time
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger("src.api")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _event_stream(name: str, parts: AsyncIterator[tuple[str, str]]) -> AsyncIterator[str]:
+    """Render ``(event, text)`` parts as server-sent events.
+
+    Ends with a ``done`` event carrying time-to-first-token and total time in
+    milliseconds, or an ``error`` event if the upstream call fails mid-stream.
+    """
+    start = time.perf_counter()
+    ttft_ms = None
+    try:
+        async for event, text in parts:
+            if ttft_ms is None:
+                ttft_ms = round((time.perf_counter() - start) * 1000, 1)
+                logger.info("%s time to first token: %.1f ms", name, ttft_ms)
+            yield _sse(event, {"text": text})
+    except Exception as e:
+        yield _sse("error", {"detail": str(e)})
+        return
+    total_ms = round((time.perf_counter() - start) * 1000, 1)
+    yield _sse("done", {"ttft_ms": ttft_ms, "total_ms": total_ms})
+
+
+def streaming_response(name: str, parts: AsyncIterator[tuple[str, str]]) -> StreamingResponse:
+    return StreamingResponse(
+        _event_stream(name, parts),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
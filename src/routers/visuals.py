@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agents.creative_director import CreativeDirector
+from src.registry import agent
+
+router = APIRouter()
+
+
+class VisualRequest(BaseModel):
+    draft_excerpt: str
+
+
+class VisualResponse(BaseModel):
+    visual_prompts: str
+
+
+@router.post("/api/suggest-visuals", response_model=VisualResponse)
+async def suggest_visuals(
+    req: VisualRequest,
+    director: CreativeDirector = Depends(agent(CreativeDirector)),
+):
+    """Generate cover image concepts from a draft excerpt."""
+    try:
+        prompts = await director.asuggest_visuals(req.draft_excerpt)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=502, detail=str(re))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+
+    return VisualResponse(visual_prompts=prompts)
@@ -1,10 +1,86 @@
 import os
-from groq import Groq
+import threading
+from typing import TYPE_CHECKING
 
+# httpx and groq are imported on first use to keep API and CLI startup fast.
+if TYPE_CHECKING:
+    import httpx
+    from groq import AsyncGroq, Groq
 
-def get_groq_client() -> Groq:
-    """Return a Groq client using the API key from environment."""
+_client = None
+_client_lock = threading.Lock()
+_async_client = None
+_async_lock = threading.Lock()
+
+
+def _limits() -> "httpx.Limits":
+    import httpx
+
+    max_connections = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+def _timeout() -> "httpx.Timeout":
+    import httpx
+
+    return httpx.Timeout(120.0, connect=10.0)
+
+
+def _get_api_key() -> str:
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise RuntimeError("GROQ_API_KEY not set in environment")
-    return Groq(api_key=api_key)
+    return api_key
+
+
+def get_groq_client() -> "Groq":
+    """Return the process-wide Groq client using the API key from environment.
+
+    Agents built in different threads or pipeline runs share its pooled
+    HTTP connections, so repeated runs in one process reuse TLS sessions.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            import httpx
+            from groq import Groq
+
+            http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+            # Retries are handled by src.rate_limit, not the SDK.
+            _client = Groq(api_key=_get_api_key(), http_client=http_client, max_retries=0)
+        return _client
+
+
+def close_groq_client() -> None:
+    """Close the shared Groq client and its connection pool, if open."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def get_async_groq_client() -> "AsyncGroq":
+    """Return the process-wide AsyncGroq client.
+
+    All coroutine agent methods share this client, and with it a single
+    pooled HTTP connection set sized by ``GROQ_MAX_CONNECTIONS``.
+    """
+    global _async_client
+    with _async_lock:
+        if _async_client is None:
+            import httpx
+            from groq import AsyncGroq
+
+            http_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+            _async_client = AsyncGroq(api_key=_get_api_key(), http_client=http_client, max_retries=0)
+        return _async_client
+
+
+async def close_async_groq_client() -> None:
+    """Close the shared AsyncGroq client and its connection pool, if open."""
+    global _async_client
+    with _async_lock:
+        client, _async_client = _async_client, None
+    if client is not None:
+        await client.close()
@@ -0,0 +1,143 @@
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STAGING = ".staging"
+_RUN_ID_RE = re.compile(r"^\d{8}T\d{6}Z-[0-9a-f]{8}$")
+
+_dir_locks: Dict[str, threading.Lock] = {}
+_dir_locks_guard = threading.Lock()
+
+
+def new_run_id(now: Optional[datetime] = None) -> str:
+    """Return a sortable, collision-resistant ID such as ``20250701T090000Z-1a2b3c4d``."""
+    now = now or datetime.now(timezone.utc)
+    return f"{now.strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
+
+
+class RunWorkspace:
+    """A per-run output directory that only appears once the run succeeds.
+
+    Files are written under ``<root>/.staging/<run_id>``. :meth:`commit`
+    renames the staging directory to ``<root>/runs/<run_id>`` in one
+    ``os.replace``, so readers never see a half-written run, and concurrent
+    runs (threads, processes or containers sharing the volume) never touch
+    each other's files. :meth:`abort` discards the staging directory.
+    """
+
+    def __init__(self, root: str = "output", run_id: Optional[str] = None):
+        self.root = Path(root)
+        self.run_id = run_id or new_run_id()
+        self.path = self.root / STAGING / self.run_id
+        self.final_path = self.root / "runs" / self.run_id
+        self.committed = False
+
+    def __enter__(self) -> "RunWorkspace":
+        self.path.mkdir(parents=True, exist_ok=False)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def resolve(self, path: str) -> str:
+        """Map a path inside the staging directory to its committed location."""
+        try:
+            relative = Path(path).relative_to(self.path)
+        except ValueError:
+            return str(path)
+        return str((self.final_path if self.committed else self.path) / relative)
+
+    def commit(self) -> Path:
+        """Atomically publish the staging directory and return its final path."""
+        if not self.committed:
+            self.final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.path, self.final_path)
+            self.committed = True
+        return self.final_path
+
+    def abort(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def list_runs(root: str = "output") -> List[Path]:
+    """Return committed run directories under ``root``, oldest first."""
+    runs_dir = Path(root) / "runs"
+    if not runs_dir.is_dir():
+        return []
+    runs = [p for p in runs_dir.iterdir() if p.is_dir() and _RUN_ID_RE.match(p.name)]
+    # IDs sort by second; break ties within a second by commit time.
+    return sorted(runs, key=lambda p: (p.name[:16], p.stat().st_mtime_ns))
+
+
+def gc_runs(
+    root: str = "output",
+    keep: int = 20,
+    max_age: Optional[float] = None,
+    stale_staging: float = 24 * 3600,
+    clock: Callable[[], float] = time.time,
+) -> List[Path]:
+    """Delete old runs and abandoned staging directories; return what was removed.
+
+    The newest ``keep`` committed runs are always kept. Older runs are
+    removed, or with ``max_age`` only those last modified more than
+    ``max_age`` seconds ago, so ``keep`` becomes a floor. Staging directories
+    untouched for ``stale_staging`` seconds belong to crashed runs. Removal
+    renames a directory aside before deleting it, so two collectors running
+    at once never delete the same tree twice.
+    """
+    now = clock()
+    runs = list_runs(root)
+    doomed = runs[:-keep] if keep > 0 else list(runs)
+    if max_age is not None:
+        doomed = [p for p in doomed if now - p.stat().st_mtime > max_age]
+    staging = Path(root) / STAGING
+    if staging.is_dir():
+        doomed += [p for p in staging.iterdir() if p.is_dir() and now - p.stat().st_mtime > stale_staging]
+
+    removed = []
+    for path in doomed:
+        trash = path.with_name(f".trash-{path.name}-{uuid.uuid4().hex[:8]}")
+        try:
+            os.replace(path, trash)
+        except OSError:
+            continue  # already collected elsewhere
+        shutil.rmtree(trash, ignore_errors=True)
+        removed.append(path)
+    return removed
+
+
+@contextmanager
+def directory_lock(directory: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``directory`` across threads and processes.
+
+    Processes are excluded with ``flock`` on ``<directory>/.lock`` (POSIX
+    only); threads of this process also share an in-process lock.
+    """
+    path = os.path.abspath(directory)
+    with _dir_locks_guard:
+        lock = _dir_locks.setdefault(path, threading.Lock())
+    with lock:
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
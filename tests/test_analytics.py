@@ -0,0 +1,57 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from src import analytics
+
+DF = pd.DataFrame({
+    "IssueDate": pd.to_datetime(["2025-05-01", "2025-06-01", "2025-05-15", "2025-04-01"]),
+    "SubjectLine": ["C", "A", "B", "D"],
+    "OpenRate": [17.9, 19.2, 18.5, 16.0],
+    "ClickRate": [2.5, 3.4, 2.9, 2.0],
+    "ReplyCount": [41, 45, 38, 60],
+    "Subscribers": [9900, 10000, 9950, 9800],
+    "Segment": ["free", "paid", "free", "paid"],
+})
+
+
+def test_pain_points_match_row_by_row_formatting():
+    points = analytics.pain_points(DF, top_n=2)
+    assert points == [
+        "- **2025-05-15**: only 3.82 replies per 1k subscribers (ReplyCount=38, Subscribers=9950)",
+        "- **2025-05-01**: only 4.14 replies per 1k subscribers (ReplyCount=41, Subscribers=9900)",
+    ]
+
+
+def test_pain_points_per_segment():
+    points = analytics.pain_points(DF, top_n=1, by="Segment")
+    assert points == [
+        "- [free] **2025-05-15**: only 3.82 replies per 1k subscribers (ReplyCount=38, Subscribers=9950)",
+        "- [paid] **2025-06-01**: only 4.5 replies per 1k subscribers (ReplyCount=45, Subscribers=10000)",
+    ]
+    assert analytics.segment_column(DF) == "Segment"
+    assert analytics.segment_column(DF.drop(columns="Segment")) is None
+
+
+def test_recent_excerpts_are_newest_first():
+    assert analytics.metrics_excerpt(DF, 2) == (
+        "2025-06-01, 19.2%, 3.4%, 45 replies, 10000 subs\n"
+        "2025-05-15, 18.5%, 2.9%, 38 replies, 9950 subs"
+    )
+    rows = analytics.recent(DF, 2)
+    assert analytics.subject_history(rows) == (
+        '- 2025-06-01: "A" → 19.2%\n- 2025-05-15: "B" → 18.5%'
+    )
+    assert analytics.open_click_history(rows).startswith("- 2025-06-01: OpenRate=19.2%, ClickRate=3.4%")
+
+
+def test_lowest_handles_empty_and_zero():
+    assert len(analytics.lowest(pd.Series([], dtype=float), 3)) == 0
+    assert len(analytics.lowest(DF["OpenRate"], 0)) == 0
+
+
+def test_lowest_per_group_uses_nsmallest_and_orders_by_group_then_value():
+    values = pd.Series([3, 1, 2, 1, 5, 0], index=[10, 11, 12, 13, 14, 15])
+    by = pd.Series(list("babbaa"), index=values.index)
+    assert list(analytics.lowest(values, 2, by)) == [15, 11, 13, 12]
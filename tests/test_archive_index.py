@@ -0,0 +1,126 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from src.archive_index import ArchiveIndex, chunk_markdown, format_passages
+from src.embeddings import EmbeddingEngine
+
+DOCS = [
+    {
+        "path": "issues/habits.md",
+        "content": "# Habit Loops\n\nA cue, a routine and a reward build reading habits.\n\n"
+                   "## Rewards\n\nReward readers with a quick win every issue.",
+        "metadata": {"filename": "habits.md"},
+    },
+    {
+        "path": "issues/subjects.md",
+        "content": "# Subject Lines\n\nNumbers and questions in subject lines lift open rates.",
+        "metadata": {"filename": "subjects.md"},
+    },
+]
+
+
+def test_chunk_markdown_splits_on_headings_and_size():
+    text = "# A\n\none two\n\nthree\n\n## B\n\n" + " ".join(["w"] * 25)
+    chunks = chunk_markdown(text, max_words=10)
+    assert chunks[0] == "# A\n\none two\n\nthree"
+    assert chunks[1] == "## B"
+    assert all(len(c.split()) <= 10 for c in chunks)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf", "hnsw"])
+def test_search_returns_relevant_passage(index_type):
+    index = ArchiveIndex(index_type=index_type).build(DOCS)
+    results = index.search("subject lines open rates", k=2)
+    assert results[0]["filename"] == "subjects.md"
+    assert results[0]["score"] >= results[-1]["score"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = ArchiveIndex(engine=EmbeddingEngine("tfidf", dim=8)).build(DOCS)
+    index.save(str(tmp_path / "idx"))
+    loaded = ArchiveIndex.load(str(tmp_path / "idx"))
+    assert len(loaded) == len(index)
+    assert loaded.engine.backend == "tfidf"
+    assert loaded.search("reward readers", k=1) == index.search("reward readers", k=1)
+
+
+def test_load_missing_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ArchiveIndex.load(str(tmp_path / "missing"))
+
+
+def test_empty_index_and_format():
+    index = ArchiveIndex().build([])
+    assert index.search("anything") == []
+    with pytest.raises(ValueError):
+        index.search("  ")
+    line = format_passages([{"filename": "a.md", "text": "two\nlines"}])
+    assert line == "- (a.md) two lines"
+
+
+def test_apply_delta_only_embeds_updated_docs():
+    from src.agents.data_collector import ContentDelta
+
+    index = ArchiveIndex().build(DOCS)
+    before = len(index)
+    revised = dict(DOCS[1], content="# Subject Lines\n\nEmoji in subject lines.")
+    index.apply_delta(ContentDelta(changed=[revised], removed=["issues/habits.md"]))
+    assert {c["path"] for c in index.chunks} == {"issues/subjects.md"}
+    assert len(index) < before
+    assert index.search("emoji", k=1)[0]["text"].endswith("Emoji in subject lines.")
+
+
+def _doc(name, text):
+    return {"path": f"issues/{name}.md", "content": f"# {name}\n\n{text}", "metadata": {"filename": f"{name}.md"}}
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf"])
+def test_deltas_update_the_faiss_index_in_place(index_type):
+    from unittest.mock import patch
+    from src.agents.data_collector import ContentDelta
+
+    index = ArchiveIndex(index_type=index_type).build(DOCS)
+    built = index._index
+    with patch.object(ArchiveIndex, "_rebuild") as rebuild:
+        index.apply_delta(ContentDelta(added=[_doc("emoji", "Emoji in subject lines.")], removed=["issues/habits.md"]))
+    rebuild.assert_not_called()
+    assert index._index is built
+    assert index._index.ntotal == len(index) == 2
+    assert index.search("emoji", k=1)[0]["filename"] == "emoji.md"
+    assert index.search("subject lines open rates", k=1)[0]["filename"] == "subjects.md"
+
+
+def test_auto_index_rebuilds_when_crossing_the_flat_limit(monkeypatch):
+    from src import archive_index
+
+    monkeypatch.setattr(archive_index, "FLAT_MAX_CHUNKS", 3)
+    index = ArchiveIndex().build(DOCS)
+    assert index._built_type == "flat"
+    index.add_documents([_doc(f"extra{i}", f"Extra issue number {i}.") for i in range(3)])
+    assert index._built_type == "ivf"
+    assert index._index.ntotal == len(index)
+
+
+def test_hnsw_removal_rebuilds():
+    index = ArchiveIndex(index_type="hnsw").build(DOCS)
+    index.remove_paths(["issues/habits.md"])
+    assert index._index.ntotal == len(index)
+    assert {r["filename"] for r in index.search("reward readers", k=5)} == {"subjects.md"}
+
+
+def test_load_keeps_ids_and_upgrades_old_indexes(tmp_path):
+    index = ArchiveIndex().build(DOCS)
+    index.remove_paths(["issues/habits.md"])
+    index.add_documents([_doc("emoji", "Emoji in subject lines.")])
+    index.save(str(tmp_path / "idx"))
+
+    loaded = ArchiveIndex.load(str(tmp_path / "idx"))
+    assert list(loaded.ids) == list(index.ids)
+    assert loaded.search("emoji", k=1) == index.search("emoji", k=1)
+
+    os.remove(tmp_path / "idx" / "ids.npy")
+    legacy = ArchiveIndex.load(str(tmp_path / "idx"))
+    assert list(legacy.ids) == list(range(len(index)))
+    assert legacy.search("emoji", k=1)[0]["filename"] == "emoji.md"
@@ -0,0 +1,87 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from unittest.mock import patch
+
+from PIL import Image
+
+from src import assets
+from src.assets import AssetPipeline, process_image
+
+
+def test_find_references_skips_remote_images():
+    md = (
+        "![a](img/a.png)\n![b](<img/b c.jpg> \"title\")\n"
+        "![remote](https://x.test/c.png)\n<img src=\"img/d.gif\" alt=\"d\">\n![a again](img/a.png)"
+    )
+    assert AssetPipeline.find_references(md) == ["img/a.png", "img/b c.jpg", "img/d.gif"]
+
+
+def test_prepare_dedupes_and_rewrites_links(tmp_path):
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "a.png").write_bytes(b"not really a png")
+    (tmp_path / "img" / "copy.png").write_bytes(b"not really a png")
+    (tmp_path / "cover.svg").write_text("<svg>cover</svg>", encoding="utf-8")
+    md = "![a](img/a.png)\n![same](img/copy.png)\n![missing](img/none.png)\n<img src='img/a.png'>"
+
+    pipeline = AssetPipeline(cache_dir=str(tmp_path / "cache"))
+    text, cover, found = pipeline.prepare(md, str(tmp_path), str(tmp_path / "cover.svg"))
+
+    assert cover.arcname == "images/cover.svg"
+    assert len(found) == 2
+    inline = next(a for a in found if a is not cover)
+    assert text.count(inline.arcname) == 3
+    assert "![missing](img/none.png)" in text
+    assert all(a.path.is_file() for a in found)
+
+    with patch.object(assets, "process_image") as proc:
+        pipeline.prepare(md, str(tmp_path), str(tmp_path / "cover.svg"))
+    proc.assert_not_called()
+
+
+def test_prepare_ignores_refs_outside_base_dir_and_non_images(tmp_path):
+    draft_dir = tmp_path / "drafts"
+    (draft_dir / "img").mkdir(parents=True)
+    (draft_dir / "img" / "ok.png").write_bytes(b"png bytes")
+    (draft_dir / "notes.txt").write_text("private", encoding="utf-8")
+    (tmp_path / "secret.png").write_bytes(b"outside")
+    (tmp_path / ".env").write_text("GROQ_API_KEY=x", encoding="utf-8")
+    md = (
+        "![ok](img/ok.png)\n![up](../secret.png)\n![env](../.env)\n"
+        f"![abs]({tmp_path / 'secret.png'})\n<img src=\"notes.txt\">"
+    )
+
+    pipeline = AssetPipeline(cache_dir=str(tmp_path / "cache"))
+    text, _, found = pipeline.prepare(md, str(draft_dir))
+
+    assert [a.source.name for a in found] == ["ok.png"]
+    assert "![up](../secret.png)" in text
+    assert "![env](../.env)" in text
+    assert f"![abs]({tmp_path / 'secret.png'})" in text
+    assert '<img src="notes.txt">' in text
+
+
+def test_process_image_resizes_and_strips_metadata(tmp_path):
+    src = tmp_path / "photo.jpg"
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"
+    Image.new("RGB", (3000, 1500), "red").save(src, format="JPEG", exif=exif)
+
+    dest = tmp_path / "out.jpg"
+    process_image(str(src), str(dest), max_width=1456)
+    with Image.open(dest) as out:
+        assert out.size == (1456, 728)
+        assert not out.getexif()
+
+
+def test_process_many_images_in_parallel(tmp_path):
+    md = []
+    for i in range(3):
+        Image.new("RGB", (2000, 100), (i, 0, 0)).save(tmp_path / f"{i}.png")
+        md.append(f"![{i}]({i}.png)")
+    pipeline = AssetPipeline(cache_dir=str(tmp_path / "cache"), max_workers=2)
+    _, _, found = pipeline.prepare("\n".join(md), str(tmp_path))
+    assert len(found) == 3
+    for asset in found:
+        with Image.open(asset.path) as out:
+            assert out.width == 1456
@@ -0,0 +1,76 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src import batch
+from src.batch import load_manifest, run_batch
+
+SPEC = {
+    "metrics_csv": "m.csv",
+    "research_query": "q",
+    "issue_brief": "b",
+    "cover_image": "c.png",
+    "title": "T",
+    "slug": "s",
+    "tags": "a, b",
+    "publish_date": "2025-07-01T09:00:00+03:00",
+}
+
+
+def test_load_manifest_reads_jsonl_and_csv(tmp_path):
+    jsonl = tmp_path / "issues.jsonl"
+    jsonl.write_text(json.dumps(SPEC) + "\n\n" + json.dumps(dict(SPEC, tags=["x"])) + "\n", encoding="utf-8")
+    specs = load_manifest(str(jsonl))
+    assert [s["tags"] for s in specs] == [["a", "b"], ["x"]]
+
+    csv_path = tmp_path / "issues.csv"
+    csv_path.write_text(",".join(SPEC) + "\n" + ",".join(f'"{v}"' for v in SPEC.values()) + "\n", encoding="utf-8")
+    assert load_manifest(str(csv_path))[0]["tags"] == ["a", "b"]
+
+    other = tmp_path / "issues.txt"
+    other.write_text("", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_manifest(str(other))
+
+
+def test_run_batch_shares_archive_and_reports_failures(tmp_path):
+    specs = [dict(SPEC, slug=f"issue-{i}") for i in range(6)]
+    specs[2]["title"] = ""
+    specs[3].update(speculative="true", from_stage="draft")
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_run(**kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        assert kwargs["archive"] == "ARCHIVE" and kwargs["ingest_archive"] is False
+        if kwargs["slug"] == "issue-4":
+            raise RuntimeError("Groq API call failed: boom")
+        return f"output/runs/{kwargs['slug']}.zip"
+
+    report_path = tmp_path / "report.json"
+    with patch.object(batch, "_update_archive", return_value="ARCHIVE") as update, \
+            patch.object(batch, "run_pipeline", side_effect=fake_run), \
+            patch.object(batch, "gc_runs"):
+        results = run_batch(specs, max_concurrent=2, report_path=str(report_path))
+
+    update.assert_called_once()
+    assert peak <= 2
+    assert [r["status"] for r in results] == ["succeeded", "succeeded", "failed", "failed", "failed", "succeeded"]
+    assert "missing required fields" in results[2]["error"]
+    assert "Unknown stage 'draft' for a speculative run" in results[3]["error"]
+    assert results[4]["error"] == "RuntimeError: Groq API call failed: boom"
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert (report["total"], report["succeeded"], report["failed"]) == (6, 3, 3)
@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+import pytest
+from groq import AsyncGroq, Groq, RateLimitError
+
+from benchmarks.fake_groq import PROFILES, FakeGroqServer, Profile
+from benchmarks.run import compare, run_scenarios
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "Write an outline."}]
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeGroqServer(PROFILES["instant"]) as server:
+        yield server
+
+
+def test_fake_server_is_deterministic(server):
+    client = Groq(api_key="fake", base_url=server.base_url, max_retries=0)
+    first = client.chat.completions.create(model="m", messages=MESSAGES)
+    second = client.chat.completions.create(model="m", messages=MESSAGES)
+    text = first.choices[0].message.content
+    assert text == second.choices[0].message.content
+    assert "## Subject Line Candidates" in text and "## Revision Summary" in text
+    assert first.usage.completion_tokens > 0
+
+
+def test_fake_server_streams_with_usage(server):
+    async def collect():
+        client = AsyncGroq(api_key="fake", base_url=server.base_url, max_retries=0)
+        parts, usage = [], None
+        async for chunk in await client.chat.completions.create(model="m", messages=MESSAGES, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if chunk.x_groq is not None and chunk.x_groq.usage is not None:
+                usage = chunk.x_groq.usage
+        await client.close()
+        return "".join(parts), usage
+
+    text, usage = asyncio.run(collect())
+    assert text.startswith("# Outline Option 1")
+    assert usage.completion_tokens == len(text.split(" "))
+
+
+def test_fake_server_rate_limits():
+    with FakeGroqServer(Profile("tight", rpm=1)) as server:
+        client = Groq(api_key="fake", base_url=server.base_url, max_retries=0)
+        client.chat.completions.create(model="m", messages=MESSAGES)
+        with pytest.raises(RateLimitError) as exc_info:
+            client.chat.completions.create(model="m", messages=MESSAGES)
+        assert float(exc_info.value.response.headers["retry-after"]) > 0
+        assert server.stats["rate_limited"] == 1
+
+
+def test_compare_flags_slower_seconds_only():
+    meta = {"profile": "groq", "scale": "default"}
+    baseline = {"meta": meta, "scenarios": {"a": {"seconds": 1.0, "llm_calls": 7}}}
+    slower = {"meta": meta, "scenarios": {"a": {"seconds": 1.5, "llm_calls": 9}}}
+    assert compare(slower, baseline, tolerance=0.2) == ["a.seconds: 1.500s vs baseline 1.000s (+50%)"]
+    assert compare(slower, baseline, tolerance=0.6) == []
+    tiny = {"meta": meta, "scenarios": {"a": {"seconds": 0.01}}}
+    assert compare({**tiny, "scenarios": {"a": {"seconds": 0.03}}}, tiny) == []
+    with pytest.raises(ValueError, match=r"scale=smoke \(baseline default\)"):
+        compare({**slower, "meta": {**meta, "scale": "smoke"}}, baseline)
+
+
+def test_single_pipeline_scenario_runs_end_to_end():
+    results = run_scenarios(["single_pipeline"], profile="instant", scale="smoke", repeat=1)
+    metrics = results["scenarios"]["single_pipeline"]
+    assert metrics["llm_calls"] == metrics["server_requests"] == 7
+    assert results["meta"]["profile"] == "instant"
@@ -0,0 +1,83 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.checkpoints import CheckpointStore
+from src.dag import Stage, downstream, run_stages
+
+
+def test_fingerprint_tracks_file_contents(tmp_path):
+    csv = tmp_path / "m.csv"
+    csv.write_text("a,b\n1,2\n", encoding="utf-8")
+    store = CheckpointStore(str(tmp_path / "ckpt"), file_inputs=("csv",))
+    before = store.fingerprint("research", {"csv": str(csv), "query": "q"})
+    assert before == store.fingerprint("research", {"query": "q", "csv": str(csv)})
+
+    csv.write_text("a,b\n1,3\n", encoding="utf-8")
+    os.utime(csv, ns=(1, 1))
+    assert store.fingerprint("research", {"csv": str(csv), "query": "q"}) != before
+    assert store.fingerprint("draft", {"csv": str(csv), "query": "q"}) != before
+
+
+def test_version_bump_invalidates_checkpoints(tmp_path, monkeypatch):
+    from src import checkpoints
+
+    store = CheckpointStore(str(tmp_path / "ckpt"))
+    old = store.fingerprint("draft", {"first_outline": "o"})
+    store.save("draft", old, {"draft_md": "stale"})
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_VERSION", checkpoints.CHECKPOINT_VERSION + 1)
+    new = store.fingerprint("draft", {"first_outline": "o"})
+    assert new != old
+    assert store.load("draft", new) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    fp = store.fingerprint("edit", {"draft_md": "x"})
+    assert store.load("edit", fp) is None
+    store.save("edit", fp, {"polished_md": "p", "summary_md": "s"})
+    assert store.load("edit", fp) == {"polished_md": "p", "summary_md": "s"}
+
+
+def test_run_stages_skips_checkpointed_stages(tmp_path):
+    calls = []
+
+    def step(name, value):
+        calls.append(name)
+        return value
+
+    stages = [
+        Stage("a", lambda x: step("a", x + 1), ("x",), ("a_out",)),
+        Stage("b", lambda a_out: step("b", a_out * 2), ("a_out",), ("b_out",)),
+        Stage("c", lambda x: step("c", -x), ("x",), ("c_out",), checkpoint=False),
+    ]
+    store = CheckpointStore(str(tmp_path))
+    assert run_stages(stages, {"x": 1}, checkpoints=store)["b_out"] == 4
+    assert sorted(calls) == ["a", "b", "c"]
+
+    calls.clear()
+    events = []
+    values = run_stages(
+        stages, {"x": 1}, checkpoints=store, on_event=lambda s, st: events.append((s, st))
+    )
+    assert values["b_out"] == 4
+    assert calls == ["c"]
+    assert ("a", "skipped") in events and ("b", "skipped") in events
+
+    calls.clear()
+    run_stages(stages, {"x": 1}, checkpoints=store, force=downstream(stages, "b"))
+    assert sorted(calls) == ["b", "c"]
+
+    calls.clear()
+    run_stages(stages, {"x": 2}, checkpoints=store)
+    assert sorted(calls) == ["a", "b", "c"]
+
+
+def test_downstream_follows_outputs():
+    stages = [
+        Stage("a", lambda: 1, (), ("a_out",)),
+        Stage("b", lambda a_out: a_out, ("a_out",), ("b_out",)),
+        Stage("c", lambda b_out: b_out, ("b_out",), ("c_out",)),
+        Stage("d", lambda: 2, (), ("d_out",)),
+    ]
+    assert downstream(stages, "b") == {"b", "c"}
+    assert downstream(stages, "a") == {"a", "b", "c"}
@@ -2,7 +2,8 @@ import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import pytest
 
-from src.agents.data_collector import ingest_content
+from src.agents import data_collector
+from src.agents.data_collector import ContentManifest, ingest_content, ingest_content_incremental
 
 
 def test_ingest_content_success(tmp_path):
@@ -20,3 +21,40 @@ def test_ingest_content_no_files(tmp_path):
     empty.mkdir()
     with pytest.raises(ValueError):
         ingest_content(str(empty))
+
+
+def test_manifest_scan_reports_only_changes(tmp_path):
+    md_dir = tmp_path / "mds"
+    md_dir.mkdir()
+    (md_dir / "a.md").write_text("# A", encoding="utf-8")
+    (md_dir / "b.md").write_text("# B", encoding="utf-8")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    first = ingest_content_incremental(str(md_dir), manifest_path)
+    assert sorted(d["metadata"]["filename"] for d in first.added) == ["a.md", "b.md"]
+
+    second = ingest_content_incremental(str(md_dir), manifest_path)
+    assert not second
+    assert len(second.unchanged) == 2
+
+    (md_dir / "a.md").write_text("# A, revised", encoding="utf-8")
+    (md_dir / "b.md").unlink()
+    (md_dir / "c.md").write_text("# C", encoding="utf-8")
+    third = ingest_content_incremental(str(md_dir), manifest_path)
+    assert [d["content"] for d in third.changed] == ["# A, revised"]
+    assert [d["metadata"]["filename"] for d in third.added] == ["c.md"]
+    assert third.removed == [str(md_dir / "b.md")]
+
+
+def test_manifest_skips_reads_when_stat_matches(tmp_path, monkeypatch):
+    md_dir = tmp_path / "mds"
+    md_dir.mkdir()
+    (md_dir / "a.md").write_text("# A", encoding="utf-8")
+    manifest = ContentManifest(str(tmp_path / "manifest.json"))
+    manifest.scan(str(md_dir))
+
+    def fail(path):
+        raise AssertionError("unchanged file was re-read")
+
+    monkeypatch.setattr(data_collector, "_read_doc", fail)
+    assert not manifest.scan(str(md_dir))
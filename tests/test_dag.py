@@ -0,0 +1,77 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import pytest
+
+from src.dag import Stage, run_stages, validate_stages
+from src.rate_limit import BATCH, current_priority, priority
+
+
+def test_run_stages_respects_dependencies():
+    stages = [
+        Stage("double", lambda x: x * 2, ("x",), ("doubled",)),
+        Stage("add", lambda doubled, y: doubled + y, ("doubled", "y"), ("total",)),
+    ]
+    values = run_stages(stages, {"x": 3, "y": 1})
+    assert values["total"] == 7
+
+
+def test_run_stages_runs_independent_stages_concurrently():
+    # Both stages block on the barrier, so this only finishes if they overlap.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_then(value):
+        barrier.wait()
+        return value
+
+    stages = [
+        Stage("a", lambda: wait_then("a"), (), ("a_out",)),
+        Stage("b", lambda: wait_then("b"), (), ("b_out",)),
+    ]
+    values = run_stages(stages)
+    assert values["a_out"] == "a"
+    assert values["b_out"] == "b"
+
+
+def test_run_stages_multiple_outputs():
+    stages = [Stage("split", lambda s: tuple(s.split(",")), ("s",), ("left", "right"))]
+    values = run_stages(stages, {"s": "l,r"})
+    assert (values["left"], values["right"]) == ("l", "r")
+
+
+def test_run_stages_propagates_error_and_skips_dependents():
+    called = []
+
+    def boom():
+        raise RuntimeError("stage failed")
+
+    stages = [
+        Stage("fail", boom, (), ("x",)),
+        Stage("after", lambda x: called.append(x), ("x",), ()),
+    ]
+    with pytest.raises(RuntimeError, match="stage failed"):
+        run_stages(stages)
+    assert called == []
+
+
+def test_validate_stages_rejects_bad_graphs():
+    with pytest.raises(ValueError):
+        validate_stages([Stage("a", lambda missing: 1, ("missing",), ("a",))])
+    with pytest.raises(ValueError):
+        validate_stages([
+            Stage("a", lambda b: 1, ("b",), ("a",)),
+            Stage("b", lambda a: 1, ("a",), ("b",)),
+        ])
+    with pytest.raises(ValueError):
+        validate_stages([
+            Stage("a", lambda: 1, (), ("x",)),
+            Stage("b", lambda: 1, (), ("x",)),
+        ])
+
+
+def test_run_stages_propagates_context_to_stage_threads():
+    stages = [Stage("probe", current_priority, (), ("level",))]
+    with priority(BATCH):
+        values = run_stages(stages, {})
+    assert values["level"] == BATCH
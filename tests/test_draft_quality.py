@@ -0,0 +1,39 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.draft_quality import WEIGHTS, score_draft
+from src.outlines import parse_outlines
+
+OUTLINE = parse_outlines(
+    "# Outline Option 1\n## Habit Cues\nWhat triggers.\n## Reward Design\nWhat pays off.\n"
+    "## Subject Line Candidates\n- A"
+)[0]
+SENTENCE = "Small habit cues help readers come back to the newsletter every single week. "
+
+
+def _draft(sections, sentences=40, comments=0):
+    parts = ["<!-- COVER_IMAGE_HOOK -->", "# Title"]
+    for title in sections:
+        parts += [f"## {title}", SENTENCE * sentences]
+    parts += [">> COMMENT: tighten this."] * comments
+    return "\n\n".join(parts)
+
+
+def test_score_prefers_covered_polished_drafts():
+    full = score_draft(_draft(["Habit Cues", "Reward Design"]), OUTLINE)
+    partial = score_draft(_draft(["Habit Cues", "Something Else"]), OUTLINE)
+    noisy = score_draft(_draft(["Habit Cues", "Reward Design"], comments=20), OUTLINE)
+    assert full.components["coverage"] == 1.0 and partial.components["coverage"] == 0.5
+    assert full.total > partial.total and full.total > noisy.total
+    assert set(full.components) == set(WEIGHTS)
+    assert 0.0 <= full.total <= 1.0
+
+
+def test_length_closest_to_target_wins():
+    near = score_draft(_draft(["Habit Cues", "Reward Design"], sentences=46), OUTLINE)
+    short = score_draft(_draft(["Habit Cues", "Reward Design"], sentences=5), OUTLINE)
+    assert near.components["length"] > 0.9 > short.components["length"]
+
+
+def test_empty_draft_scores_zero():
+    assert score_draft("", OUTLINE).total == 0.0
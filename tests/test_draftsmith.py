@@ -2,7 +2,8 @@ import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pytest
-from unittest.mock import patch, MagicMock
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from src.agents.draftsmith import Draftsmith
 
@@ -52,3 +53,28 @@ def test_create_draft_api_error(mock_get_client):
     smith = Draftsmith()
     with pytest.raises(RuntimeError):
         smith.create_draft(DUMMY_OUTLINE)
+
+
+@patch("src.agents.draftsmith.get_async_groq_client")
+@patch("src.agents.draftsmith.get_groq_client")
+def test_acreate_draft_success(mock_get_client, mock_get_async_client):
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="<!-- COVER_IMAGE_HOOK -->\nBody"))]
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    mock_get_async_client.return_value = mock_client
+
+    smith = Draftsmith()
+    result = asyncio.run(smith.acreate_draft(DUMMY_OUTLINE))
+    assert result.startswith("<!-- COVER_IMAGE_HOOK -->")
+
+
+@patch("src.agents.draftsmith.get_async_groq_client")
+@patch("src.agents.draftsmith.get_groq_client")
+def test_acreate_draft_api_error(mock_get_client, mock_get_async_client):
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=Exception("boom"))
+    mock_get_async_client.return_value = mock_client
+    smith = Draftsmith()
+    with pytest.raises(RuntimeError):
+        asyncio.run(smith.acreate_draft(DUMMY_OUTLINE))
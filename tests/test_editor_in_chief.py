@@ -2,9 +2,11 @@ import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pytest
-from unittest.mock import patch, MagicMock
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
 
-from src.agents.editor_in_chief import EditorInChief
+from src.agents.editor_in_chief import EditorInChief, RevisionSummarySplitter, split_sections
+from src.prompt_budget import count_tokens
 
 DUMMY_DRAFT = (
     "<!-- COVER_IMAGE_HOOK -->\n"
@@ -51,3 +53,163 @@ def test_edit_draft_api_error(mock_get_client):
     with pytest.raises(RuntimeError) as exc:
         editor.edit_draft(DUMMY_DRAFT)
     assert "Groq API call failed" in str(exc.value)
+
+
+@patch("src.agents.editor_in_chief.get_async_groq_client")
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_aedit_draft_success(mock_get_client, mock_get_async_client):
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(message=MagicMock(content="Polished.\n\n## Revision Summary\n- Tightened"))
+    ]
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    mock_get_async_client.return_value = mock_client
+
+    editor = EditorInChief()
+    polished, summary = asyncio.run(editor.aedit_draft(DUMMY_DRAFT))
+    assert polished == "Polished."
+    assert summary == "## Revision Summary\n- Tightened"
+
+
+def _collect(parts):
+    polished = "".join(t for p, t in parts if p == "polished")
+    summary = "".join(t for p, t in parts if p == "summary")
+    return polished, summary
+
+
+def test_splitter_handles_heading_split_across_chunks():
+    text = "Body text.\n\n## Revision Summary\n- Tightened intro"
+    splitter = RevisionSummarySplitter()
+    parts = []
+    for i in range(0, len(text), 3):
+        parts.extend(splitter.feed(text[i:i + 3]))
+    parts.extend(splitter.flush())
+    polished, summary = _collect(parts)
+    assert polished == "Body text.\n\n"
+    assert summary == "## Revision Summary\n- Tightened intro"
+
+
+def test_splitter_without_summary_is_all_polished():
+    splitter = RevisionSummarySplitter()
+    parts = splitter.feed("Just ## Revision") + splitter.feed(" notes") + splitter.flush()
+    assert _collect(parts) == ("Just ## Revision notes", "")
+
+
+@patch("src.agents.editor_in_chief.astream")
+@patch("src.agents.editor_in_chief.get_async_groq_client")
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_astream_edit_splits_stream(mock_get_client, mock_get_async_client, mock_astream):
+    async def deltas():
+        for chunk in ["Polished ", "text.\n## Rev", "ision summary\n- Done"]:
+            yield chunk
+
+    mock_astream.return_value = deltas()
+    editor = EditorInChief()
+
+    async def run():
+        return [part async for part in editor.astream_edit(DUMMY_DRAFT)]
+
+    polished, summary = _collect(asyncio.run(run()))
+    assert polished == "Polished text.\n"
+    assert summary == "## Revision summary\n- Done"
+
+
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_astream_edit_validates_before_streaming(mock_get_client):
+    with pytest.raises(ValueError):
+        EditorInChief().astream_edit("  ")
+
+
+def _long_draft(names, words=160):
+    body = " ".join(["word"] * words)
+    return "<!-- COVER_IMAGE_HOOK -->\n# Title\n\n" + "\n\n".join(f"## {n}\n{n} text. {body}." for n in names)
+
+
+def _section_reply(model, messages, **params):
+    """Echo the section's first heading as its edit, with a one-line summary."""
+    heading = next(l for l in messages[1]["content"].splitlines() if l.startswith("## "))
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(
+        content=f"{heading}\nEdited {heading[3:]}.\n\n## Revision Summary\n- Tightened {heading[3:]}"
+    ))]
+    return response
+
+
+def test_split_sections_merges_short_sections_and_ignores_code():
+    draft = "# Title\n\nIntro.\n\n## A\n" + "a " * 200 + "\n```\n## not a heading\n```\n\n## B\n" + "b " * 200 + "\n## C\nTail."
+    sections = split_sections(draft)
+    assert len(sections) == 2
+    assert sections[0].startswith("# Title") and "## not a heading" in sections[0]
+    assert sections[1].startswith("## B") and sections[1].endswith("## C\nTail.")
+    assert split_sections("No headings at all.") == ["No headings at all."]
+
+
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_typical_issue_is_edited_in_one_call(mock_get_client, monkeypatch):
+    monkeypatch.delenv("PROMPT_BUDGETS", raising=False)
+    monkeypatch.delenv("PROMPT_INPUT_TOKENS", raising=False)
+    create = mock_get_client.return_value.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content="Polished.\n\n## Revision Summary\n- Done"))]
+    sentence = "Subscribers respond to practical newsletters, especially when the examples are specific. "
+    draft = "# Title\n\n" + "\n\n".join(f"## Part {i}\n" + sentence * 18 for i in range(6))
+    assert 1100 < len(draft.split()) < 1300 and count_tokens(draft) > 2400
+
+    polished, _ = EditorInChief().edit_draft(draft)
+    assert create.call_count == 1
+    assert polished == "Polished."
+
+
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_chunked_edit_stitches_sections_in_order(mock_get_client):
+    create = mock_get_client.return_value.chat.completions.create
+    create.side_effect = _section_reply
+    editor = EditorInChief()
+
+    polished, summary = editor.edit_draft(_long_draft(["A", "B", "C"]), chunked=True)
+    assert create.call_count == 3
+    assert polished == "## A\nEdited A.\n\n## B\nEdited B.\n\n## C\nEdited C."
+    assert summary == "## Revision Summary\n- Tightened A\n- Tightened B\n- Tightened C"
+
+
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_chunked_edit_skips_unchanged_sections(mock_get_client):
+    create = mock_get_client.return_value.chat.completions.create
+    create.side_effect = _section_reply
+    editor = EditorInChief()
+
+    editor.edit_draft(_long_draft(["A", "B", "C"]), chunked=True)
+    create.reset_mock()
+    polished, summary = editor.edit_draft(_long_draft(["A", "B2", "C"]), chunked=True)
+    assert create.call_count == 1
+    assert "Edited B2." in polished and "- Tightened A" in summary
+
+
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_short_drafts_are_edited_in_one_call(mock_get_client):
+    create = mock_get_client.return_value.chat.completions.create
+    create.side_effect = _section_reply
+    EditorInChief().edit_draft(_long_draft(["A", "B"], words=5))
+    assert create.call_count == 1
+
+
+@patch("src.agents.editor_in_chief.get_async_groq_client")
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_chunked_aedit_and_stream(mock_get_client, mock_get_async_client):
+    async def reply(**kwargs):
+        return _section_reply(**kwargs)
+
+    mock_get_async_client.return_value.chat.completions.create = AsyncMock(side_effect=reply)
+    draft = _long_draft(["A", "B"])
+
+    async def run():
+        editor = EditorInChief()
+        result = await editor.aedit_draft(draft, chunked=True)
+        parts = [part async for part in EditorInChief().astream_edit(draft, chunked=True)]
+        return result, parts
+
+    (polished, summary), parts = asyncio.run(run())
+    assert polished == "## A\nEdited A.\n\n## B\nEdited B."
+    assert _collect(parts) == (polished, summary)
+    assert [p for p, _ in parts] == ["polished", "polished", "summary"]
+
@@ -0,0 +1,58 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from src.agents.data_collector import compute_embeddings
+from src.embeddings import EmbeddingEngine, tokenize
+
+DOCS = [
+    "Habit loops drive newsletter engagement.",
+    "Subject lines with numbers lift open rates.",
+    "Habit loops and reward cues drive engagement.",
+]
+
+
+def test_tokenize_includes_bigrams():
+    assert tokenize("Habit loops work") == ["habit", "loops", "work", "habit loops", "loops work"]
+
+
+@pytest.mark.parametrize("backend", ["hashing", "tfidf"])
+def test_encode_shape_dtype_and_norm(backend):
+    engine = EmbeddingEngine(backend, dim=32)
+    vectors = engine.encode(DOCS)
+    assert vectors.shape == (3, 32)
+    assert vectors.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+
+@pytest.mark.parametrize("backend", ["hashing", "tfidf"])
+def test_similar_documents_score_higher(backend):
+    vectors = EmbeddingEngine(backend, dim=32).encode(DOCS)
+    sims = vectors @ vectors.T
+    assert sims[0, 2] > sims[0, 1]
+
+
+def test_hashing_is_deterministic_across_instances():
+    a = EmbeddingEngine("hashing", dim=16).encode(DOCS)
+    b = EmbeddingEngine("hashing", dim=16).encode(DOCS)
+    np.testing.assert_array_equal(a, b)
+
+
+def test_encode_uses_content_hash_cache():
+    engine = EmbeddingEngine("hashing", dim=16)
+    first = engine.encode(DOCS)
+    engine._encode_batch = None  # any cache miss would now fail
+    np.testing.assert_array_equal(engine.encode(DOCS), first)
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        EmbeddingEngine("llm")
+
+
+def test_compute_embeddings_is_local():
+    vectors = compute_embeddings(DOCS, dim=24)
+    assert vectors.shape == (3, 24)
+    assert compute_embeddings([], dim=24).shape == (0, 24)
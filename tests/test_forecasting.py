@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.embeddings import EmbeddingEngine
+from src.forecasting import OpenRateForecaster, subject_features
+
+
+def history(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = ["growth", "pricing", "hiring", "retention", "launch"]
+    subjects = [
+        f"{topics[i % 5]} notes {i}" + ("?" if i % 3 == 0 else "") for i in range(n)
+    ]
+    rates = 20 + np.array([4.0 if s.endswith("?") else 0.0 for s in subjects]) + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        "IssueDate": pd.date_range("2023-01-02", periods=n, freq="7D"),
+        "SubjectLine": subjects,
+        "OpenRate": rates,
+    })
+
+
+def test_subject_features_flags():
+    engine = EmbeddingEngine("hashing", dim=8)
+    X = subject_features(["Why now?", "5 WAYS to grow!", "Hello \U0001F44B"], engine)
+    assert X.shape == (3, 7 + 8)
+    assert X[0, 2] == 1 and X[1, 2] == 0  # question mark
+    assert X[1, 3] == 1 and X[1, 4] == 1  # exclamation, number
+    assert X[2, 5] == 1  # emoji
+    assert X[1, 6] > X[0, 6]  # upper-case share
+
+
+def test_forecaster_learns_subject_effects_with_intervals():
+    model = OpenRateForecaster(n_boot=100).fit(history())
+    scores = model.predict(["pricing notes?", "pricing notes"])
+    question, plain = scores["open_rate"]
+    assert question - plain > 2
+    assert (scores["low"] <= scores["open_rate"]).all()
+    assert (scores["open_rate"] <= scores["high"]).all()
+    assert model.next_issue_date() == pd.Timestamp("2023-01-02") + pd.Timedelta(days=7 * 120)
+    assert model.best_weekday() == "Monday"
+
+
+def test_forecaster_scores_many_candidates_deterministically():
+    df = history()
+    candidates = [f"candidate {i}" for i in range(500)]
+    first = OpenRateForecaster(seed=3).fit(df).predict(candidates)
+    second = OpenRateForecaster(seed=3).fit(df).predict(candidates)
+    assert len(first) == 500
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_predictions_are_clipped_to_valid_rates():
+    near_full = history()
+    near_full["OpenRate"] += 78  # plain subjects ~98%, questions ~102%
+    scores = OpenRateForecaster(n_boot=50).fit(near_full).predict(["pricing notes?", "pricing notes"])
+    assert scores["open_rate"].iloc[0] == 100.0
+    assert (scores[["open_rate", "low", "high"]] <= 100.0).all().all()
+
+    near_zero = history()
+    near_zero["OpenRate"] -= 20.5  # plain subjects ~-0.5%
+    scores = OpenRateForecaster(n_boot=50).fit(near_zero).predict(["pricing notes"])
+    assert (scores[["open_rate", "low", "high"]] >= 0.0).all().all()
+    assert scores["low"].iloc[0] == 0.0
+
+
+def test_forecaster_needs_history():
+    with pytest.raises(ValueError):
+        OpenRateForecaster().fit(history(n=2))
+    with pytest.raises(RuntimeError):
+        OpenRateForecaster().predict(["x"])
@@ -79,3 +79,76 @@ def test_package_invalid_metadata(tmp_path):
         fmt.package_for_substack(draft_path, cover_path, "T", "s", [], "2025-07-01T09:00:00+03:00")
     with pytest.raises(ValueError):
         fmt.package_for_substack(draft_path, cover_path, "T", "s", ["t"], "bad-date")
+
+
+def test_package_replaces_previous_package_atomically(tmp_path):
+    draft_path = write_temp_file(tmp_path, "draft.md", "first")
+    cover_path = write_temp_file(tmp_path, "cover.png", b"img", binary=True)
+    fmt = Formatter(output_root=str(tmp_path / "pkg"))
+    fmt.package_for_substack(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+    write_temp_file(tmp_path, "draft.md", "second")
+    zip_path = fmt.package_for_substack(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+
+    date_folder = datetime.now().strftime("%Y-%m-%d")
+    assert os.listdir(tmp_path / "pkg") == [f"{date_folder}.zip"]
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.read(f"{date_folder}/Issue.md").decode("utf-8").endswith("second")
+
+
+def test_package_stores_images_and_streams(tmp_path):
+    draft_path = write_temp_file(tmp_path, "draft.md", "# Title\n" + "words " * 500)
+    cover_path = write_temp_file(tmp_path, "cover.png", os.urandom(3 * 1024 * 1024), binary=True)
+    fmt = Formatter(output_root=str(tmp_path / "pkg"))
+    zip_path = fmt.package_for_substack(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+
+    filename, chunks = fmt.stream_package(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+    chunks = list(chunks)
+    assert len(chunks) > 1
+    streamed = tmp_path / filename
+    streamed.write_bytes(b"".join(chunks))
+
+    date_folder = datetime.now().strftime("%Y-%m-%d")
+    for path in (zip_path, streamed):
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            assert zf.getinfo(f"{date_folder}/images/cover.png").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo(f"{date_folder}/Issue.md").compress_type == zipfile.ZIP_DEFLATED
+            assert zf.read(f"{date_folder}/images/cover.png") == open(cover_path, "rb").read()
+
+
+def test_asset_errors_become_packaging_errors(tmp_path, monkeypatch):
+    draft_path = write_temp_file(tmp_path, "draft.md", "# Title\nContent")
+    cover_path = write_temp_file(tmp_path, "cover.png", b"\x89PNG\r\n\x1a\n", binary=True)
+    fmt = Formatter(output_root=str(tmp_path / "pkg"))
+
+    def broken(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(fmt.assets, "prepare", broken)
+    with pytest.raises(RuntimeError, match="Packaging failed: disk full"):
+        fmt.package_for_substack(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+    with pytest.raises(RuntimeError, match="Packaging failed"):
+        fmt.stream_package(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+    assert not (tmp_path / "pkg").exists() or not os.listdir(tmp_path / "pkg")
+
+
+def test_stream_package_validates_before_streaming(tmp_path):
+    cover_path = write_temp_file(tmp_path, "cover.png", b"img", binary=True)
+    with pytest.raises(FileNotFoundError):
+        Formatter().stream_package("no_draft.md", cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+
+
+def test_package_includes_inline_images(tmp_path):
+    write_temp_file(tmp_path, "chart.gif", b"GIF89a-not-really", binary=True)
+    draft_path = write_temp_file(tmp_path, "draft.md", "Intro\n\n![Chart](chart.gif)\n")
+    cover_path = write_temp_file(tmp_path, "cover.jpg", b"\xff\xd8\xff-cover", binary=True)
+    fmt = Formatter(output_root=str(tmp_path / "pkg"))
+    zip_path = fmt.package_for_substack(draft_path, cover_path, "T", "s", ["t"], "2025-07-01T09:00:00+03:00")
+
+    date_folder = datetime.now().strftime("%Y-%m-%d")
+    with zipfile.ZipFile(zip_path) as zf:
+        issue = zf.read(f"{date_folder}/Issue.md").decode("utf-8")
+        assert issue.startswith("![Cover](images/cover.jpg)")
+        (chart,) = [n for n in zf.namelist() if n.endswith(".gif")]
+        assert f"![Chart]({chart.split('/', 1)[1]})" in issue
+        assert zf.read(chart) == b"GIF89a-not-really"
@@ -73,3 +73,28 @@ def test_fetch_research_brief_missing_columns(mock_get_client, tmp_path):
     scout = InsightScout()
     with pytest.raises(ValueError):
         scout.fetch_research_brief(str(bad), "x")
+
+
+@patch("src.agents.insight_scout.acomplete")
+@patch("src.agents.insight_scout.get_async_groq_client")
+@patch("src.agents.insight_scout.get_groq_client")
+def test_afetch_builds_prompt_off_the_event_loop(mock_get_client, mock_get_async_client, mock_acomplete, temp_metrics_csv):
+    import asyncio
+    import threading
+
+    threads = []
+    archive = MagicMock()
+    archive.search.side_effect = lambda *a, **k: threads.append(threading.get_ident()) or []
+
+    async def fake_acomplete(client, model, system, prompt):
+        return "## Pain Points\n- A\n\n## Trending Articles\n- Art"
+
+    mock_acomplete.side_effect = fake_acomplete
+
+    async def run():
+        result = await InsightScout().afetch_research_brief(temp_metrics_csv, "habit loops", archive)
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+    assert "## Pain Points" in result
+    assert threads and threads[0] != loop_thread
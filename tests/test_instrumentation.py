@@ -0,0 +1,85 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.dag import Stage, run_stages
+from src.instrumentation import METRICS, Metrics, RunRecorder
+from src.llm import complete
+from src.llm_cache import ResponseCache, configure_response_cache
+
+
+def _client(text="ok", prompt_tokens=12, completion_tokens=30):
+    client = MagicMock()
+    response = client.chat.completions.create.return_value
+    response.choices[0].message.content = text
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    response.usage.total_tokens = prompt_tokens + completion_tokens
+    return client
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    METRICS.reset()
+    yield
+    METRICS.reset()
+    configure_response_cache(None)
+
+
+def test_run_report_attributes_calls_to_stages(tmp_path):
+    client = _client()
+    configure_response_cache(ResponseCache())
+    recorder = RunRecorder("run-1")
+    stages = recorder.wrap([
+        Stage("draft", lambda: complete(client, "m", "sys", "outline"), (), ("draft",)),
+        Stage("again", lambda draft: complete(client, "m", "sys", "outline"), ("draft",), ("again",)),
+        Stage("local", lambda: sum(range(1000)), (), ("total",)),
+    ])
+    run_stages(stages, on_event=recorder.on_event)
+    recorder.finish("succeeded")
+    report = json.loads(recorder.write(tmp_path / "run_report.json").read_text(encoding="utf-8"))
+
+    by_name = {s["name"]: s for s in report["stages"]}
+    assert by_name["draft"]["llm_calls"] == 1
+    assert by_name["draft"]["prompt_tokens"] == 12
+    assert by_name["draft"]["completion_tokens"] == 30
+    assert by_name["again"]["cache_hits"] == 1
+    assert by_name["again"]["prompt_tokens"] == 0
+    assert by_name["local"]["llm_calls"] == 0
+    assert all(s["status"] == "done" for s in report["stages"])
+    assert report["totals"]["llm_calls"] == 2
+    assert [c["stage"] for c in report["calls"]] == ["draft", "again"]
+    assert client.chat.completions.create.call_count == 1
+
+
+def test_failed_calls_are_counted():
+    client = MagicMock()
+    client.chat.completions.create.side_effect = Exception("boom")
+    with pytest.raises(RuntimeError):
+        complete(client, "m", "sys", "prompt")
+    assert METRICS.get("newsletter_llm_errors_total", model="m") == 1
+    assert METRICS.get("newsletter_llm_calls_total", model="m", stage="none", cached="false") == 1
+
+
+def test_prometheus_rendering():
+    metrics = Metrics()
+    metrics.inc("newsletter_stage_runs_total", stage="draft", status="done")
+    metrics.inc("newsletter_stage_runs_total", stage="draft", status="done")
+    text = metrics.render({"newsletter_llm_queue_depth": {(("model", "m"),): 3}})
+    assert "# TYPE newsletter_stage_runs_total counter" in text
+    assert 'newsletter_stage_runs_total{stage="draft",status="done"} 2' in text
+    assert 'newsletter_llm_queue_depth{model="m"} 3' in text
+
+
+def test_metrics_endpoint():
+    complete(_client(), "m", "sys", "prompt")
+    response = TestClient(app).get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'newsletter_llm_tokens_total{kind="completion",model="m"} 30' in response.text
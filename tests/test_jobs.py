@@ -0,0 +1,200 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import pytest
+from fastapi.testclient import TestClient
+
+from src import api
+from src.routers import pipeline
+from src.jobs import FAILED, RUNNING, SUCCEEDED, JobQueue, JobStore
+
+PAYLOAD = {
+    "metrics_csv": "m.csv",
+    "research_query": "q",
+    "issue_brief": "b",
+    "cover_image": "c.png",
+    "title": "T",
+    "slug": "s",
+    "tags": ["x"],
+    "publish_date": "2025-07-01T09:00:00+03:00",
+}
+
+
+def fake_runner(progress, **params):
+    progress("research", "running")
+    progress("research", "done")
+    return f"package/{params['slug']}.zip"
+
+
+def test_queue_runs_job_and_records_progress(tmp_path):
+    queue = JobQueue(JobStore(str(tmp_path / "jobs.sqlite")), fake_runner)
+    job_id = queue.submit(PAYLOAD)
+    queue.shutdown()
+    job = queue.store.get(job_id)
+    assert job["status"] == SUCCEEDED
+    assert job["result"] == "package/s.zip"
+    assert job["progress"] == {"research": "done"}
+
+
+def test_queue_records_failure(tmp_path):
+    def boom(progress, **params):
+        raise RuntimeError("Groq API call failed")
+
+    queue = JobQueue(JobStore(str(tmp_path / "jobs.sqlite")), boom)
+    job_id = queue.submit(PAYLOAD)
+    queue.shutdown()
+    job = queue.store.get(job_id)
+    assert job["status"] == FAILED
+    assert "Groq API call failed" in job["error"]
+
+
+def test_unfinished_jobs_resume_after_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path)
+    queued = store.create(PAYLOAD)["id"]
+    running = store.create(dict(PAYLOAD, slug="r"))["id"]
+    store.update(running, status=RUNNING)
+    store.close()
+
+    queue = JobQueue(JobStore(path), fake_runner)
+    queue.shutdown()
+    assert queue.store.get(queued)["status"] == SUCCEEDED
+    assert queue.store.get(running)["result"] == "package/r.zip"
+
+
+def test_claim_is_exclusive_until_the_lease_expires(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    job_id = store.create(PAYLOAD)["id"]
+    assert store.claim(job_id, "a", lease_seconds=60)
+    assert not store.claim(job_id, "b", lease_seconds=60)
+    assert store.get(job_id)["owner"] == "a"
+
+    assert store.claim(store.create(PAYLOAD)["id"], "a", lease_seconds=-1)
+    expired = store.unfinished()
+    assert len(expired) == 1
+    assert store.claim(expired[0], "b")
+    assert store.get(expired[0])["owner"] == "b"
+
+
+def test_restart_leaves_jobs_with_live_leases_alone(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path)
+    live = store.create(PAYLOAD)["id"]
+    store.claim(live, "other-process", lease_seconds=60)
+    orphaned = store.create(dict(PAYLOAD, slug="o"))["id"]
+    store.claim(orphaned, "dead-process", lease_seconds=-1)
+    store.close()
+
+    queue = JobQueue(JobStore(path), fake_runner)
+    queue.shutdown()
+    assert queue.store.get(live)["status"] == RUNNING
+    assert queue.store.get(live)["owner"] == "other-process"
+    assert queue.store.get(orphaned)["result"] == "package/o.zip"
+    assert queue.store.get(orphaned)["owner"] == queue.owner
+
+
+def test_shutdown_without_wait_leaves_unstarted_jobs_queued(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    started, release = threading.Event(), threading.Event()
+
+    def runner(progress, **params):
+        started.set()
+        release.wait(5)
+        return f"package/{params['slug']}.zip"
+
+    queue = JobQueue(JobStore(path), runner, max_workers=1)
+    first = queue.submit(PAYLOAD)
+    rest = [queue.submit(dict(PAYLOAD, slug=f"s{i}")) for i in range(3)]
+    started.wait(5)
+    queue.shutdown(wait=False)
+    release.set()
+    queue._heartbeat.join(5)
+
+    assert queue.store.get(first)["status"] == SUCCEEDED
+    for job_id in rest:
+        job = queue.store.get(job_id)
+        assert job["status"] == "queued" and job["owner"] is None
+
+    resumed = JobQueue(JobStore(path), fake_runner)
+    resumed.shutdown()
+    assert all(resumed.store.get(job_id)["status"] == SUCCEEDED for job_id in rest)
+
+
+def test_lifespan_resumes_jobs_at_startup(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path)
+    job_id = store.create(PAYLOAD)["id"]
+    store.close()
+    monkeypatch.setenv("JOBS_DB", path)
+    monkeypatch.setattr(pipeline, "_job_queue", None)
+    monkeypatch.setattr(pipeline, "_run_job", fake_runner)
+
+    with TestClient(api.app):
+        for _ in range(100):
+            queue = pipeline._job_queue
+            if queue is not None and queue.store.get(job_id)["status"] == SUCCEEDED:
+                break
+            threading.Event().wait(0.05)
+    assert pipeline._job_queue.store.get(job_id)["result"] == "package/s.zip"
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    def runner(progress, **params):
+        progress("research", "pending")
+        progress("draft", "pending")
+        progress("outline", "pending")
+        progress("research", "skipped")
+        progress("draft", "done")
+        release.wait(5)
+        return "package/out.zip"
+
+    queue = JobQueue(JobStore(str(tmp_path / "jobs.sqlite")), runner)
+    monkeypatch.setattr(pipeline, "_job_queue", queue)
+    yield TestClient(api.app), release, queue
+    release.set()
+    queue.shutdown()
+
+
+def test_job_endpoints(api_client):
+    client, release, queue = api_client
+    resp = client.post("/api/jobs", json=PAYLOAD)
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+
+    assert client.get(f"/api/jobs/{job_id}/result").status_code == 409
+
+    release.set()
+    queue.shutdown()
+    status = client.get(f"/api/jobs/{job_id}").json()
+    assert status["status"] == SUCCEEDED
+    assert status["completed_stages"] == 2
+    assert status["total_stages"] == 3
+    result = client.get(f"/api/jobs/{job_id}/result")
+    assert result.json() == {"package_zip_path": "package/out.zip"}
+
+
+def test_get_job_queue_creates_one_queue_under_concurrency(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(pipeline, "_job_queue", None)
+    queues, start = [], threading.Barrier(8)
+
+    def get():
+        start.wait()
+        queues.append(pipeline.get_job_queue())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(q) for q in queues}) == 1
+    queues[0].shutdown()
+
+
+def test_unknown_job_returns_404(api_client):
+    client, _, _ = api_client
+    assert client.get("/api/jobs/nope").status_code == 404
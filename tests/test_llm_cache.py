@@ -0,0 +1,112 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from unittest.mock import MagicMock
+
+from src import llm_cache
+from src.llm import complete
+from src.llm_cache import ResponseCache, cache_key, configure_response_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_depends_on_every_field():
+    base = cache_key("m", "sys", "prompt", {"temperature": 0})
+    assert base == cache_key("m", "sys", "prompt", {"temperature": 0})
+    assert base != cache_key("m2", "sys", "prompt", {"temperature": 0})
+    assert base != cache_key("m", "sys2", "prompt", {"temperature": 0})
+    assert base != cache_key("m", "sys", "prompt2", {"temperature": 0})
+    assert base != cache_key("m", "sys", "prompt", {"temperature": 1})
+
+
+def test_memory_tier_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.set("k", "v")
+    clock.now += 5
+    assert cache.get("k") == "v"
+    clock.now += 10
+    assert cache.get("k") is None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = ResponseCache(path=path)
+    first.set("k", "v")
+    first.close()
+
+    second = ResponseCache(path=path)
+    assert second.get("k") == "v"
+    assert second.stats()["disk_hits"] == 1
+    assert second.get("k") == "v"
+    assert second.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_size_eviction(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(path=str(tmp_path / "c.sqlite"), max_entries=1, max_disk_entries=2, clock=clock)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.set(key, key)
+    assert cache.stats()["disk_entries"] == 2
+    assert cache.get("a") is None
+    assert cache.get("b") == "b"
+
+
+def test_complete_uses_configured_cache():
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [MagicMock(message=MagicMock(content="hello"))]
+    configure_response_cache(ResponseCache())
+    try:
+        assert complete(client, "m", "sys", "prompt") == "hello"
+        assert complete(client, "m", "sys", "prompt") == "hello"
+        assert client.chat.completions.create.call_count == 1
+        assert llm_cache.get_response_cache().stats()["memory_hits"] == 1
+    finally:
+        configure_response_cache(None)
+
+
+def test_astream_yields_deltas_and_caches_full_text():
+    import asyncio
+    from unittest.mock import AsyncMock
+    from src.llm import astream
+
+    def chunk(text):
+        return MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+    async def stream():
+        for text in ["Hel", None, "lo"]:
+            yield chunk(text)
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=lambda **kw: stream())
+
+    async def collect():
+        return [d async for d in astream(client, "m", "sys", "prompt")]
+
+    configure_response_cache(ResponseCache())
+    try:
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+        assert asyncio.run(collect()) == ["Hello"]
+        assert client.chat.completions.create.call_count == 1
+    finally:
+        configure_response_cache(None)
@@ -112,3 +112,23 @@ def test_forecast_api_error(mock_get_client, tmp_path):
     with pytest.raises(RuntimeError) as exc:
         forecaster.forecast(csv_path, ["Subj"])
     assert "Groq API call failed" in str(exc.value)
+
+
+@patch("src.agents.metrics_forecaster.get_groq_client")
+def test_forecast_without_narrative_is_local(mock_get_client, tmp_path):
+    rows = [
+        {"IssueDate": f"2025-0{m}-01", "SubjectLine": s, "OpenRate": r}
+        for m, s, r in [(1, "Why now?", 24.0), (2, "Weekly notes", 18.0), (3, "What next?", 25.0), (4, "Digest", 17.5)]
+    ]
+    csv_path = write_csv(tmp_path, rows)
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+
+    result = MetricsForecaster().forecast(csv_path, ["Plain update", "Ready?"], narrative=False)
+    mock_client.chat.completions.create.assert_not_called()
+    assert "| Subject line | Predicted open rate | 90% interval |" in result
+    assert result.index('"Ready?"') < result.index('"Plain update"')
+    assert "Recommended send date/time" in result
+
+    scores = MetricsForecaster().score(csv_path, ["Plain update", "Ready?"])
+    assert scores["subject"].tolist() == ["Ready?", "Plain update"]
@@ -0,0 +1,82 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src import metrics_store
+from src.metrics_store import clear_metrics_cache, load_metrics
+
+ROWS = {
+    "IssueDate": ["2025-06-01", "2025-05-15"],
+    "SubjectLine": ["A", "B"],
+    "OpenRate": [20.0, 18.0],
+    "ClickRate": [3.0, 2.5],
+    "ReplyCount": [5, 3],
+    "Subscribers": [1000, 990],
+}
+
+
+@pytest.fixture(autouse=True)
+def no_sidecar(monkeypatch):
+    monkeypatch.setenv("METRICS_CACHE_DIR", "off")
+    clear_metrics_cache()
+    yield
+    clear_metrics_cache()
+
+
+def write_csv(path, rows=ROWS):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_load_metrics_parses_once(tmp_path):
+    csv_path = write_csv(tmp_path / "m.csv")
+    with patch.object(metrics_store.pd, "read_csv", wraps=pd.read_csv) as read_csv:
+        first = load_metrics(csv_path)
+        second = load_metrics(csv_path, required={"IssueDate", "OpenRate"})
+    assert read_csv.call_count == 1
+    assert str(first["IssueDate"].dtype).startswith("datetime64")
+    first.loc[0, "OpenRate"] = 0.0
+    assert second.loc[0, "OpenRate"] == 20.0
+
+
+def test_load_metrics_reloads_changed_file(tmp_path):
+    csv_path = write_csv(tmp_path / "m.csv")
+    assert len(load_metrics(csv_path)) == 2
+    write_csv(tmp_path / "m.csv", {k: v[:1] for k, v in ROWS.items()})
+    os.utime(csv_path, ns=(1, 1))
+    assert len(load_metrics(csv_path)) == 1
+
+
+def test_load_metrics_validates_columns(tmp_path):
+    csv_path = write_csv(tmp_path / "m.csv", {"IssueDate": ["2025-06-01"]})
+    with pytest.raises(ValueError, match="Actuals CSV is missing required columns"):
+        load_metrics(csv_path, required={"IssueDate", "OpenRate"}, label="Actuals CSV")
+    with pytest.raises(FileNotFoundError):
+        load_metrics(str(tmp_path / "missing.csv"))
+
+
+def test_feather_sidecar_skips_parsing(tmp_path, monkeypatch):
+    monkeypatch.setenv("METRICS_CACHE_DIR", str(tmp_path / "cache"))
+    csv_path = write_csv(tmp_path / "m.csv")
+    expected = load_metrics(csv_path)
+    clear_metrics_cache()
+    with patch.object(metrics_store.pd, "read_csv") as read_csv:
+        loaded = load_metrics(csv_path)
+    read_csv.assert_not_called()
+    pd.testing.assert_frame_equal(loaded, expected)
+
+
+def test_sidecar_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("METRICS_CACHE_DIR", "off")
+    monkeypatch.chdir(tmp_path)
+    csv_path = write_csv(tmp_path / "m.csv")
+    load_metrics(csv_path)
+    clear_metrics_cache()
+    with patch.object(metrics_store.pd, "read_csv", wraps=pd.read_csv) as read_csv:
+        load_metrics(csv_path)
+    read_csv.assert_called_once()
+    assert not (tmp_path / ".cache").exists()
@@ -0,0 +1,221 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src import orchestrator
+from src.orchestrator import parse_subject_lines, run_pipeline
+
+OUTLINES = (
+    "# Outline Option 1\n"
+    "## Hook\nIntro.\n\n"
+    "## Subject Line Candidates\n"
+    "- \"First\"\n"
+    "- Second\n\n"
+    "# Outline Option 2\n"
+    "## Subject Line Candidates\n"
+    "- Other\n"
+)
+
+
+def test_parse_subject_lines_reads_first_option():
+    assert parse_subject_lines(OUTLINES) == ["First", "Second"]
+
+
+def test_run_pipeline_wires_stages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    patches = {
+        name: patch.object(orchestrator, name)
+        for name in (
+            "ingest_metrics",
+            "InsightScout",
+            "OutlineArchitect",
+            "Draftsmith",
+            "EditorInChief",
+            "CreativeDirector",
+            "MetricsForecaster",
+            "Formatter",
+            "PerformanceAnalyst",
+        )
+    }
+    mocks = {name: p.start() for name, p in patches.items()}
+    try:
+        mocks["InsightScout"].return_value.fetch_research_brief.return_value = "research"
+        mocks["OutlineArchitect"].return_value.generate_outlines.return_value = OUTLINES
+        mocks["Draftsmith"].return_value.create_draft.return_value = "draft"
+        mocks["EditorInChief"].return_value.edit_draft.return_value = ("polished", "## Revision Summary")
+        mocks["CreativeDirector"].return_value.suggest_visuals.return_value = "visuals"
+        mocks["MetricsForecaster"].return_value.forecast.return_value = "forecast"
+        mocks["Formatter"].return_value.package_for_substack.return_value = "package/x.zip"
+        mocks["PerformanceAnalyst"].return_value.analyze.return_value = "analysis"
+
+        zip_path = run_pipeline(
+            metrics_csv="m.csv",
+            research_query="q",
+            issue_brief="b",
+            cover_image="c.png",
+            title="T",
+            slug="s",
+            tags=["t"],
+            publish_date="2025-07-01T09:00:00+03:00",
+        )
+    finally:
+        for p in patches.values():
+            p.stop()
+
+    assert zip_path == "package/x.zip"
+    draft_arg = mocks["Draftsmith"].return_value.create_draft.call_args[0][0]
+    assert draft_arg.startswith("# Outline Option 1")
+    assert "Other" not in draft_arg
+    mocks["MetricsForecaster"].return_value.forecast.assert_called_once_with("m.csv", ["First", "Second"])
+    mocks["PerformanceAnalyst"].return_value.analyze.assert_called_once_with("forecast", "m.csv")
+    mocks["OutlineArchitect"].return_value.generate_outlines.assert_called_once_with(
+        "research", "b", archive=None
+    )
+    (run_dir,) = (tmp_path / "output" / "runs").iterdir()
+    assert (run_dir / "polished.md").read_text(encoding="utf-8") == "polished"
+    assert not any((tmp_path / "output" / ".staging").iterdir())
+    report = json.loads((run_dir / "run_report.json").read_text(encoding="utf-8"))
+    assert report["status"] == "succeeded"
+    assert {s["name"]: s["status"] for s in report["stages"]}["draft"] == "done"
+
+
+def test_run_pipeline_resume_skips_finished_stages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "m.csv").write_text("subject,open_rate\n", encoding="utf-8")
+    names = (
+        "ingest_metrics",
+        "InsightScout",
+        "OutlineArchitect",
+        "Draftsmith",
+        "EditorInChief",
+        "CreativeDirector",
+        "MetricsForecaster",
+        "Formatter",
+        "PerformanceAnalyst",
+    )
+    patches = [patch.object(orchestrator, name) for name in names]
+    mocks = dict(zip(names, (p.start() for p in patches)))
+    try:
+        mocks["InsightScout"].return_value.fetch_research_brief.return_value = "research"
+        mocks["OutlineArchitect"].return_value.generate_outlines.return_value = OUTLINES
+        mocks["Draftsmith"].return_value.create_draft.return_value = "draft"
+        mocks["EditorInChief"].return_value.edit_draft.return_value = ("polished", "summary")
+        mocks["CreativeDirector"].return_value.suggest_visuals.return_value = "visuals"
+        mocks["MetricsForecaster"].return_value.forecast.side_effect = [RuntimeError("boom"), "forecast"]
+        mocks["Formatter"].return_value.package_for_substack.return_value = "package/x.zip"
+        mocks["PerformanceAnalyst"].return_value.analyze.return_value = "analysis"
+        kwargs = dict(
+            metrics_csv="m.csv",
+            research_query="q",
+            issue_brief="b",
+            cover_image="c.png",
+            title="T",
+            slug="s",
+            tags=["t"],
+            publish_date="2025-07-01T09:00:00+03:00",
+        )
+        try:
+            run_pipeline(**kwargs)
+        except RuntimeError:
+            pass
+        zip_path = run_pipeline(**kwargs, resume=True)
+        run_pipeline(**kwargs, from_stage="draft")
+    finally:
+        for p in patches:
+            p.stop()
+
+    assert zip_path == "package/x.zip"
+    assert mocks["InsightScout"].return_value.fetch_research_brief.call_count == 1
+    assert mocks["OutlineArchitect"].return_value.generate_outlines.call_count == 1
+    assert mocks["MetricsForecaster"].return_value.forecast.call_count == 2
+    assert mocks["Draftsmith"].return_value.create_draft.call_count == 2
+    runs = sorted((tmp_path / "output" / "runs").iterdir())
+    assert len(runs) == 2  # the failed run was discarded
+    assert (runs[-1] / "research.md").read_text(encoding="utf-8") == "research"
+    (failed,) = (tmp_path / "output" / "failed").iterdir()
+    report = json.loads(failed.read_text(encoding="utf-8"))
+    assert report["status"] == "failed"
+    assert {s["name"]: s["status"] for s in report["stages"]}["forecast"] == "failed"
+
+
+def test_from_stage_must_match_the_run_kind(tmp_path):
+    kwargs = dict(
+        metrics_csv="m.csv",
+        research_query="q",
+        issue_brief="b",
+        cover_image="c.png",
+        title="T",
+        slug="s",
+        tags=["t"],
+        publish_date="2025-07-01T09:00:00+03:00",
+        output_root=str(tmp_path),
+    )
+    with pytest.raises(ValueError, match="speculative run; choose from: .*variants"):
+        run_pipeline(**kwargs, from_stage="edit", speculative=True)
+    with pytest.raises(ValueError, match="standard run"):
+        run_pipeline(**kwargs, from_stage="variants")
+    assert not (tmp_path / "runs").exists()
+
+
+def test_speculative_run_drafts_every_option(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    outlines = OUTLINES + "\n# Outline Option 3\n## Subject Line Candidates\n- Third\n"
+    names = (
+        "ingest_metrics",
+        "InsightScout",
+        "OutlineArchitect",
+        "Draftsmith",
+        "EditorInChief",
+        "CreativeDirector",
+        "MetricsForecaster",
+        "Formatter",
+        "PerformanceAnalyst",
+    )
+    patches = [patch.object(orchestrator, name) for name in names]
+    mocks = dict(zip(names, (p.start() for p in patches)))
+    try:
+        mocks["OutlineArchitect"].return_value.generate_outlines.return_value = outlines
+        mocks["Draftsmith"].return_value.create_draft.side_effect = lambda o: "draft of " + o.splitlines()[0]
+        # Option 2's draft gets the cover placeholder, so it scores best.
+        mocks["EditorInChief"].return_value.edit_draft.side_effect = lambda d: (
+            ("<!-- COVER_IMAGE_HOOK -->\n" if "Option 2" in d else "") + "polished " + d,
+            "## Revision Summary",
+        )
+        mocks["CreativeDirector"].return_value.suggest_visuals.return_value = "visuals"
+        mocks["MetricsForecaster"].return_value.forecast.return_value = "forecast"
+        mocks["Formatter"].return_value.package_for_substack.return_value = "package/x.zip"
+        mocks["PerformanceAnalyst"].return_value.analyze.return_value = "analysis"
+        mocks["InsightScout"].return_value.fetch_research_brief.return_value = "research"
+
+        run_pipeline(
+            metrics_csv="m.csv",
+            research_query="q",
+            issue_brief="b",
+            cover_image="c.png",
+            title="T",
+            slug="s",
+            tags=["t"],
+            publish_date="2025-07-01T09:00:00+03:00",
+            speculative=True,
+        )
+    finally:
+        for p in patches:
+            p.stop()
+
+    assert mocks["Draftsmith"].return_value.create_draft.call_count == 3
+    mocks["MetricsForecaster"].return_value.forecast.assert_called_once_with(
+        "m.csv", ["First", "Second", "Other", "Third"]
+    )
+    (run_dir,) = (tmp_path / "output" / "runs").iterdir()
+    assert "Option 2" in (run_dir / "polished.md").read_text(encoding="utf-8")
+    ranking = json.loads((run_dir / "variants" / "variants.json").read_text(encoding="utf-8"))
+    assert ranking[0]["option"] == 2 and sorted(v["option"] for v in ranking) == [1, 2, 3]
+    assert [v["rank"] for v in ranking] == [1, 2, 3]
+    assert ranking[0]["subject_lines"] == ["Other"]
+    for option in (1, 2, 3):
+        polished = (run_dir / "variants" / f"option-{option}" / "polished.md").read_text(encoding="utf-8")
+        assert f"Option {option}" in polished
@@ -55,3 +55,21 @@ def test_generate_outlines_empty_issue(mock_get_client):
     arch = OutlineArchitect()
     with pytest.raises(ValueError):
         arch.generate_outlines(DUMMY_RESEARCH, "")
+
+
+@patch("src.agents.outline_architect.get_groq_client")
+def test_generate_outlines_includes_archive_passages(mock_get_client):
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="# Outline Option 1"))]
+    mock_client.chat.completions.create.return_value = mock_response
+    archive = MagicMock()
+    archive.search.return_value = [{"filename": "old.md", "text": "Habit loops recap"}]
+
+    architect = OutlineArchitect()
+    architect.generate_outlines(DUMMY_RESEARCH, DUMMY_ISSUE, archive=archive)
+
+    archive.search.assert_called_once_with(DUMMY_ISSUE, k=3)
+    prompt = mock_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+    assert "- (old.md) Habit loops recap" in prompt
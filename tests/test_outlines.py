@@ -0,0 +1,48 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.outlines import parse_outlines
+
+OUTLINES = (
+    "Here are three outlines.\n\n"
+    "# Outline Option 1: Habit Loops\n"
+    "## Hook\nWhy cues matter.\n\n"
+    "## The Loop\n- Cue, routine, reward\n\n"
+    "## Subject Line Candidates\n"
+    "- \"Build the loop\"\n"
+    "- **Cues that stick**\n\n"
+    "Pick one.\n\n"
+    "## Outline Option 2 — Streaks\n"
+    "### Why streaks work\nMomentum.\n"
+    "## Subject Line Candidates\n"
+    "1. “Don't break the chain”\n\n"
+    "# outline option 3\n"
+    "## Subject Line Candidates\n"
+    "- Third\n"
+)
+
+
+def test_parse_outlines_reads_every_option():
+    first, second, third = parse_outlines(OUTLINES)
+    assert [o.number for o in (first, second, third)] == [1, 2, 3]
+    assert first.title == "Habit Loops" and second.title == "Streaks" and third.title == ""
+    assert [s.title for s in first.sections] == ["Hook", "The Loop"]
+    assert first.sections[1].description == "Cue, routine, reward"
+    assert first.subject_lines == ["Build the loop", "Cues that stick"]
+    assert second.subject_lines == ["Don't break the chain"]
+    assert third.subject_lines == ["Third"]
+
+
+def test_option_markdown_is_normalized_and_self_contained():
+    first, second, _ = parse_outlines(OUTLINES)
+    assert first.markdown.startswith("# Outline Option 1: Habit Loops\n## Hook")
+    assert first.markdown.endswith("Pick one.")
+    assert "Streaks" not in first.markdown
+    assert second.markdown.startswith("# Outline Option 2: Streaks\n")
+
+
+def test_text_without_option_headings_is_one_option():
+    (only,) = parse_outlines("## Intro\nText.\n\n## Subject Line Candidates\n- A\n- B")
+    assert only.number == 1
+    assert only.markdown.startswith("# Outline Option 1\n## Intro")
+    assert only.subject_lines == ["A", "B"]
@@ -6,7 +6,7 @@ from src.api import app
 
 client = TestClient(app)
 
-@patch("src.api.run_pipeline")
+@patch("src.routers.pipeline.run_pipeline")
 def test_run_pipeline_success(mock_run):
     mock_run.return_value = "output/2025-06-01.zip"
     payload = {
@@ -29,7 +29,7 @@ def test_run_pipeline_missing_field():
     assert resp.status_code == 422
 
 
-@patch("src.api.run_pipeline")
+@patch("src.routers.pipeline.run_pipeline")
 def test_run_pipeline_error(mock_run):
     mock_run.side_effect = Exception("boom")
     payload = {
@@ -45,3 +45,30 @@ def test_run_pipeline_error(mock_run):
     resp = client.post("/api/run-pipeline", json=payload)
     assert resp.status_code == 500
     assert "boom" in resp.text
+
+
+def test_package_stream_endpoint(tmp_path):
+    import io
+    import zipfile
+
+    draft = tmp_path / "draft.md"
+    draft.write_text("# Title\nBody", encoding="utf-8")
+    cover = tmp_path / "cover.jpg"
+    cover.write_bytes(b"\xff\xd8\xff" + b"0" * 4096)
+    payload = {
+        "draft_path": str(draft),
+        "cover_image_path": str(cover),
+        "title": "T",
+        "slug": "s",
+        "tags": ["t"],
+        "publish_date": "2025-07-01T09:00:00+03:00",
+    }
+    resp = client.post("/api/package-for-substack/stream", json=payload)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    assert "attachment" in resp.headers["content-disposition"]
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert any(name.endswith("images/cover.jpg") for name in zf.namelist())
+
+    resp = client.post("/api/package-for-substack/stream", json=dict(payload, title=" "))
+    assert resp.status_code == 400
@@ -0,0 +1,112 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from unittest.mock import MagicMock, patch
+
+from src.agents.draftsmith import Draftsmith
+from src.instrumentation import StageRecord, _stage
+from src.prompt_budget import MIN_INPUT_TOKENS, Prompt, compact, count_tokens, fit, input_budget
+
+PARAGRAPH = "Open rates climbed after we moved the send time to Tuesday morning."
+
+
+def test_count_tokens_grows_with_text_and_whitespace():
+    assert count_tokens("") == 0
+    assert count_tokens("the cat") == 2
+    assert count_tokens("a  b") > count_tokens("a b")
+    assert count_tokens(PARAGRAPH * 2) > count_tokens(PARAGRAPH)
+
+
+def test_compact_removes_boilerplate_duplicates_and_whitespace():
+    text = (
+        "<!-- COVER_IMAGE_HOOK -->\n<!-- draft notes -->\n# Issue   12\n\n\n\n"
+        f"## Growth\n{PARAGRAPH}\n\n## Recap\n{PARAGRAPH}\n\n"
+        "Share this post\nUnsubscribe\n"
+    )
+    result = compact(text)
+    assert result.text == f"<!-- COVER_IMAGE_HOOK -->\n\n# Issue 12\n\n## Growth\n\n{PARAGRAPH}"
+    assert result.tokens_saved == count_tokens(text) - count_tokens(result.text) > 0
+    assert not result.summarized
+
+
+def test_compact_keeps_repeated_headings():
+    text = "# Outline Option 1\n## Subject Line Candidates\n- A\n\n# Outline Option 2\n## Subject Line Candidates\n- B"
+    assert compact(text).text.count("## Subject Line Candidates") == 2
+
+
+def test_compact_summarizes_overflow_within_budget():
+    sections = [
+        f"## Week {i}\nOpen rate hit {40 + i}% this week. Filler about the weather and nothing much. "
+        f"Another aside that adds little."
+        for i in range(60)
+    ]
+    result = compact("\n\n".join(sections), budget=300)
+    assert result.summarized and result.tokens_after <= 300
+    assert "## Week 0\n\nOpen rate hit 40% this week." in result.text
+    assert result.text.index("Week 1") < result.text.index("Week 2")
+
+
+def test_compact_without_summarize_keeps_everything():
+    text = "\n\n".join(f"Paragraph {i} says something different about topic {i}." for i in range(200))
+    result = compact(text, budget=100, summarize=False)
+    assert result.text == text and result.tokens_saved == 0
+
+
+def test_input_budget_respects_caps_and_reserved(monkeypatch):
+    monkeypatch.setenv("PROMPT_INPUT_TOKENS", "3000")
+    assert input_budget("llama-3.3-70b-versatile") == 3000
+    assert input_budget("llama-3.3-70b-versatile", reserved=500) == 2500
+    monkeypatch.setenv("PROMPT_BUDGETS", '{"llama-3.3-70b-versatile": 1000}')
+    assert input_budget("llama-3.3-70b-versatile") == 1000
+    assert input_budget("llama-3.3-70b-versatile", reserved=5000) == MIN_INPUT_TOKENS
+    assert input_budget("unknown-model") == 3000
+
+
+@patch("src.agents.draftsmith.get_groq_client")
+def test_tokens_saved_are_recorded_per_call(mock_get_client, monkeypatch):
+    monkeypatch.setenv("PROMPT_INPUT_TOKENS", "300")
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content="<!-- COVER_IMAGE_HOOK -->\nDraft"))]
+    mock_get_client.return_value.chat.completions.create.return_value = response
+    outline = "\n\n".join(f"## Section {i}\n{PARAGRAPH} Detail number {i} matters." for i in range(80))
+
+    smith = Draftsmith()
+    expected = fit("llama-3.3-70b-versatile", outline)
+    stage = StageRecord("draft")
+    token = _stage.set(stage)
+    try:
+        smith.create_draft(outline)
+    finally:
+        _stage.reset(token)
+
+    prompt = mock_get_client.return_value.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+    assert isinstance(prompt, Prompt) and expected.text in prompt
+    assert stage.calls[0].tokens_saved == expected.tokens_saved > 0
+    assert stage.summary()["tokens_saved"] == expected.tokens_saved
+
+
+def test_compact_keeps_prose_that_starts_like_a_footer():
+    text = (
+        "Copyright is the theme of this issue.\n\n"
+        "Thanks for reading, and see you next week with more data.\n\n"
+        "Thanks for reading!\n"
+        "Unsubscribe"
+    )
+    assert compact(text).text == (
+        "Copyright is the theme of this issue.\n\n"
+        "Thanks for reading, and see you next week with more data."
+    )
+
+
+def test_compact_leaves_fenced_code_and_hard_breaks_alone():
+    code = "```python\nx  =  1\n\n\n\ny = 2   \n# Share this post\n```"
+    text = f"Line one  \nline  two\n\n{code}\n\nAfter."
+    assert compact(text).text == f"Line one  \nline two\n\n{code}\n\nAfter."
+
+
+@patch("src.agents.editor_in_chief.get_groq_client")
+def test_editor_sends_the_draft_verbatim(mock_get_client):
+    from src.agents.editor_in_chief import EditorInChief
+
+    draft = "Copyright is tricky.  \nThanks for reading\n\n\n```\nx  =  1\n```"
+    assert draft in EditorInChief()._build_prompt(draft)
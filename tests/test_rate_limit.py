@@ -0,0 +1,146 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import groq
+import httpx
+import pytest
+
+from src import rate_limit
+from src.llm import acomplete, complete
+from src.rate_limit import BATCH, INTERACTIVE, RateLimiter, TokenBucket, configure_rate_limiter, priority
+
+
+def _status_error(status, headers=None):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    cls = groq.RateLimitError if status == 429 else groq.InternalServerError
+    return cls("error", response=response, body=None)
+
+
+def _response(text="ok", tokens=None):
+    response = MagicMock()
+    response.choices[0].message.content = text
+    response.usage.total_tokens = tokens
+    return response
+
+
+@pytest.fixture
+def limiter():
+    sleeps = []
+    limiter = RateLimiter(max_retries=3, base_delay=1.0, sleep=sleeps.append, jitter=lambda: 1.0)
+    limiter.sleeps = sleeps
+    configure_rate_limiter(limiter)
+    yield limiter
+    configure_rate_limiter(None)
+
+
+def test_token_bucket_refills_over_a_minute():
+    bucket = TokenBucket(60, now=0.0)
+    bucket.take(60, now=0.0)
+    assert bucket.delay(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.delay(1, now=1.0) == 0.0
+    assert bucket.delay(1000, now=1.0) == pytest.approx(59.0)  # capped at capacity
+
+
+def test_retries_429_honouring_retry_after(limiter):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [
+        _status_error(429, {"retry-after": "7"}),
+        _status_error(503),
+        _response("done"),
+    ]
+    assert complete(client, "m", "sys", "prompt") == "done"
+    assert limiter.sleeps == [7.0, 2.0]  # Retry-After wins, then 1s * 2**1 backoff
+    stats = limiter.stats()["m"]
+    assert stats["retries"] == 2
+    assert stats["rate_limited"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_gives_up_after_max_retries(limiter):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = _status_error(429)
+    with pytest.raises(RuntimeError, match="Groq API call failed"):
+        complete(client, "m", "sys", "prompt")
+    assert client.chat.completions.create.call_count == 4
+
+
+def test_non_retryable_errors_fail_immediately(limiter):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = Exception("bad request")
+    with pytest.raises(RuntimeError, match="bad request"):
+        complete(client, "m", "sys", "prompt")
+    assert client.chat.completions.create.call_count == 1
+    assert limiter.sleeps == []
+
+
+def test_async_path_retries(limiter):
+    slept = []
+
+    async def asleep(seconds):
+        slept.append(seconds)
+
+    limiter.asleep = asleep
+    client = MagicMock()
+    calls = iter([_status_error(500), _response("async")])
+
+    async def create(**kwargs):
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    client.chat.completions.create = create
+    assert asyncio.run(acomplete(client, "m", "sys", "prompt")) == "async"
+    assert 1.0 in slept
+
+
+def test_token_usage_is_reconciled():
+    limiter = RateLimiter(limits={"m": {"tpm": 600}})
+    limiter.call("m", 500, lambda: _response(tokens=100))
+    # 500 reserved, 100 used: 500 tokens are free again without waiting.
+    limiter.acquire("m", 500)
+    assert limiter.stats()["m"]["tokens"] == 600
+
+
+def test_interactive_calls_overtake_queued_batch_work():
+    limiter = RateLimiter(limits={"m": {"rpm": 120}})
+    limiter.acquire("m", 1)
+    limiter._models["m"].requests.level = 0.0  # drained: one slot every 0.5s
+    order = []
+
+    def worker(level, name):
+        with priority(level):
+            limiter.acquire("m", 1)
+        order.append(name)
+
+    batch = threading.Thread(target=worker, args=(BATCH, "batch"))
+    batch.start()
+    deadline = time.monotonic() + 2
+    while limiter.stats()["m"]["queued"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    interactive = threading.Thread(target=worker, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    while limiter.stats()["m"]["queued"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert limiter.stats()["m"]["queued"] == 2
+    batch.join(5)
+    interactive.join(5)
+    assert order == ["interactive", "batch"]
+
+
+def test_env_configuration(monkeypatch):
+    monkeypatch.setenv("GROQ_RPM", "30")
+    monkeypatch.setenv("GROQ_RATE_LIMITS", '{"big": {"tpm": 6000}}')
+    configure_rate_limiter(None)
+    try:
+        limiter = rate_limit.get_rate_limiter()
+        assert limiter.default_rpm == 30
+        assert limiter.limits["big"]["tpm"] == 6000
+    finally:
+        configure_rate_limiter(None)
@@ -0,0 +1,61 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agents.outline_architect import OutlineArchitect
+from src.api import app
+from src.registry import AgentRegistry, agent, configure_registry, get_registry
+
+
+class Counted:
+    built = 0
+
+    def __init__(self):
+        type(self).built += 1
+
+
+def test_registry_builds_each_agent_once_across_threads():
+    registry = AgentRegistry()
+    Counted.built = 0
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(registry.get(Counted))) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert Counted.built == 1
+    assert all(a is seen[0] for a in seen)
+    registry.clear()
+    assert registry.get(Counted) is not seen[0]
+
+
+def test_failed_construction_is_retried():
+    registry = AgentRegistry()
+    factory = MagicMock(side_effect=[RuntimeError("GROQ_API_KEY not set"), "agent"])
+    with pytest.raises(RuntimeError):
+        registry.get(factory)
+    assert registry.get(factory) == "agent"
+
+
+def test_dependency_is_stable_per_class():
+    assert agent(OutlineArchitect) is agent(OutlineArchitect)
+
+
+@patch("src.agents.outline_architect.get_groq_client")
+def test_handlers_reuse_one_agent_instance(mock_client):
+    configure_registry(None)
+    try:
+        with patch.object(OutlineArchitect, "agenerate_outlines", return_value="# Outline Option 1"):
+            client = TestClient(app)
+            for _ in range(3):
+                resp = client.post("/api/generate-outlines", json={"research_brief": "R", "issue_brief": "B"})
+                assert resp.status_code == 200
+        assert mock_client.call_count == 1
+        assert isinstance(get_registry().get(OutlineArchitect), OutlineArchitect)
+    finally:
+        configure_registry(None)
@@ -0,0 +1,63 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.forecasting import clear_forecaster_cache, fitted_forecaster, score_batches
+
+client = TestClient(app)
+
+
+def write_csv(path, n=12):
+    pd.DataFrame({
+        "IssueDate": pd.date_range("2025-01-06", periods=n, freq="7D").strftime("%Y-%m-%d"),
+        "SubjectLine": [f"Note {i}" + ("?" if i % 2 else "") for i in range(n)],
+        "OpenRate": [24.0 if i % 2 else 18.0 for i in range(n)],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_fitted_forecaster_is_cached_per_file(tmp_path):
+    clear_forecaster_cache()
+    csv_path = write_csv(tmp_path / "a.csv")
+    assert fitted_forecaster(csv_path) is fitted_forecaster(csv_path)
+    write_csv(tmp_path / "a.csv", n=13)
+    assert len(fitted_forecaster(csv_path).history) == 13
+
+
+def test_score_batches_ranks_each_file(tmp_path):
+    a = write_csv(tmp_path / "a.csv")
+    b = write_csv(tmp_path / "b.csv", n=8)
+    results = score_batches(
+        [
+            {"csv_path": a, "subject_lines": ["Plain", "Really?", "Plain", " "]},
+            {"csv_path": b, "subject_lines": ["One?", "Two"], "issue_date": "2025-06-02"},
+        ]
+    )
+    assert [r["csv_path"] for r in results] == [a, b]
+    assert [s["subject"] for s in results[0]["scores"]] == ["Really?", "Plain"]
+    assert [s["rank"] for s in results[0]["scores"]] == [1, 2]
+    assert results[1]["issue_date"] == "2025-06-02"
+
+
+def test_score_subjects_endpoint(tmp_path):
+    csv_path = write_csv(tmp_path / "m.csv")
+    candidates = [f"Candidate {i}" + ("?" if i % 3 == 0 else "") for i in range(300)]
+    resp = client.post(
+        "/api/score-subjects",
+        json={"batches": [{"csv_path": csv_path, "subject_lines": candidates}], "top_k": 5},
+    )
+    assert resp.status_code == 200
+    scores = resp.json()["results"][0]["scores"]
+    assert len(scores) == 5
+    assert all(s["subject"].endswith("?") for s in scores)
+    assert scores[0]["low"] <= scores[0]["open_rate"] <= scores[0]["high"]
+
+
+def test_score_subjects_errors(tmp_path):
+    resp = client.post(
+        "/api/score-subjects",
+        json={"batches": [{"csv_path": str(tmp_path / "none.csv"), "subject_lines": ["x"]}]},
+    )
+    assert resp.status_code == 404
+    resp = client.post("/api/score-subjects", json={"batches": []})
+    assert resp.status_code == 400
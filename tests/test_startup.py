@@ -0,0 +1,41 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import subprocess
+
+from fastapi.testclient import TestClient
+
+from benchmarks.run import HEAVY_MODULES, REPO_ROOT
+from src.api import ROUTERS, app, routers
+
+
+def _loaded_after(statement):
+    code = f"import sys\n{statement}\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def test_api_and_cli_import_without_heavy_modules():
+    assert _loaded_after("import src.api") == []
+    assert _loaded_after("import src.orchestrator") == []
+
+
+def test_health_does_not_load_routers():
+    # The test client itself needs httpx.
+    assert set(_loaded_after(
+        "from fastapi.testclient import TestClient\n"
+        "from src.api import app, routers\n"
+        "assert TestClient(app).get('/api/health').status_code == 200\n"
+        "assert not routers.loaded"
+    )) <= {"httpx"}
+
+
+def test_routers_load_on_first_use():
+    client = TestClient(app)
+    client.post("/api/generate-outlines", json={})
+    assert "src.routers.outlines" in routers.loaded
+    paths = client.get("/openapi.json").json()["paths"]
+    assert set(routers.loaded) == set(ROUTERS)
+    assert "/api/create-draft/stream" in paths and "/api/jobs/{job_id}" in paths
@@ -0,0 +1,69 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agents.draftsmith import Draftsmith
+from src.agents.editor_in_chief import EditorInChief
+from src.api import app
+from src.registry import agent
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def override():
+    def install(cls):
+        mock = MagicMock()
+        app.dependency_overrides[agent(cls)] = lambda: mock
+        return mock
+
+    yield install
+    app.dependency_overrides.clear()
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def agen(items):
+    for item in items:
+        yield item
+
+
+def test_create_draft_stream_emits_tokens_then_done(override):
+    override(Draftsmith).astream_draft.return_value = agen(["<!-- COVER", "_IMAGE_HOOK -->"])
+    resp = client.post("/api/create-draft/stream", json={"outline_markdown": "# Outline"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(resp.text)
+    assert [e for e, _ in events] == ["token", "token", "done"]
+    assert "".join(d["text"] for e, d in events if e == "token") == "<!-- COVER_IMAGE_HOOK -->"
+    assert events[-1][1]["ttft_ms"] is not None
+
+
+def test_create_draft_stream_rejects_empty_outline(override):
+    override(Draftsmith).astream_draft.side_effect = ValueError("Outline Markdown cannot be empty.")
+    resp = client.post("/api/create-draft/stream", json={"outline_markdown": ""})
+    assert resp.status_code == 400
+
+
+def test_edit_draft_stream_reports_midstream_error(override):
+    async def failing():
+        yield "polished", "Start"
+        raise RuntimeError("Groq API call failed: reset")
+
+    override(EditorInChief).astream_edit.return_value = failing()
+    resp = client.post("/api/edit-draft/stream", json={"draft_markdown": "Draft"})
+    events = parse_events(resp.text)
+    assert events[0] == ("polished", {"text": "Start"})
+    assert events[-1][0] == "error"
+    assert "reset" in events[-1][1]["detail"]
@@ -0,0 +1,33 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import pytest
+
+from src import utils
+
+
+def test_async_client_is_shared(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    try:
+        first = utils.get_async_groq_client()
+        assert utils.get_async_groq_client() is first
+    finally:
+        asyncio.run(utils.close_async_groq_client())
+    assert utils._async_client is None
+
+
+def test_async_client_requires_api_key(monkeypatch):
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    with pytest.raises(RuntimeError):
+        utils.get_async_groq_client()
+
+
+def test_sync_client_is_shared(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    try:
+        first = utils.get_groq_client()
+        assert utils.get_groq_client() is first
+    finally:
+        utils.close_groq_client()
+    assert utils._client is None
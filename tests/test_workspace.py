@@ -0,0 +1,95 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import time
+from datetime import datetime, timezone
+import pytest
+
+from src.workspace import RunWorkspace, directory_lock, gc_runs, list_runs, new_run_id
+
+
+def test_workspace_commits_atomically(tmp_path):
+    ws = RunWorkspace(str(tmp_path))
+    with ws:
+        (ws.path / "draft.md").write_text("draft", encoding="utf-8")
+        staged = str(ws.path / "draft.md")
+        assert not ws.final_path.exists()
+    assert (ws.final_path / "draft.md").read_text(encoding="utf-8") == "draft"
+    assert not ws.path.exists()
+    assert ws.resolve(staged) == str(ws.final_path / "draft.md")
+    assert ws.resolve("elsewhere/x.zip") == "elsewhere/x.zip"
+
+
+def test_workspace_discards_failed_runs(tmp_path):
+    ws = RunWorkspace(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        with ws:
+            (ws.path / "draft.md").write_text("draft", encoding="utf-8")
+            raise RuntimeError("boom")
+    assert not ws.path.exists()
+    assert not ws.final_path.exists()
+
+
+def test_concurrent_workspaces_are_isolated(tmp_path):
+    a, b = RunWorkspace(str(tmp_path)), RunWorkspace(str(tmp_path))
+    assert a.run_id != b.run_id
+    with a, b:
+        (a.path / "x").write_text("a", encoding="utf-8")
+        (b.path / "x").write_text("b", encoding="utf-8")
+    assert (a.final_path / "x").read_text(encoding="utf-8") == "a"
+    assert (b.final_path / "x").read_text(encoding="utf-8") == "b"
+
+
+def test_gc_keeps_newest_runs_and_drops_stale_staging(tmp_path):
+    for _ in range(4):
+        with RunWorkspace(str(tmp_path)):
+            pass
+    runs = list_runs(str(tmp_path))
+    active = RunWorkspace(str(tmp_path)).__enter__()
+    crashed = tmp_path / ".staging" / new_run_id()
+    crashed.mkdir()
+    os.utime(crashed, (0, 0))
+
+    removed = gc_runs(str(tmp_path), keep=2, clock=time.time)
+    assert list_runs(str(tmp_path)) == runs[-2:]
+    assert set(removed) == set(runs[:2]) | {crashed}
+    assert active.path.exists()
+
+
+def test_gc_max_age_never_touches_the_keep_window(tmp_path):
+    for day in range(1, 5):
+        with RunWorkspace(str(tmp_path), new_run_id(datetime(2025, 7, day, tzinfo=timezone.utc))):
+            pass
+    runs = list_runs(str(tmp_path))
+    for run in runs[1:]:
+        os.utime(run, (0, 0))  # every run but the oldest looks ancient
+
+    removed = gc_runs(str(tmp_path), keep=2, max_age=3600, clock=time.time)
+    assert removed == [runs[1]]
+    assert list_runs(str(tmp_path)) == [runs[0], *runs[2:]]
+
+
+def test_directory_lock_excludes_threads_and_other_lock_holders(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    inside, overlaps = [], []
+
+    def hold():
+        with directory_lock(str(tmp_path / "idx")):
+            inside.append(1)
+            overlaps.append(len(inside))
+            time.sleep(0.01)
+            inside.pop()
+
+    threads = [threading.Thread(target=hold) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert overlaps == [1, 1, 1, 1]
+
+    # Another process opens the lock file separately; flock refuses it meanwhile.
+    with directory_lock(str(tmp_path / "idx")):
+        with open(tmp_path / "idx" / ".lock", "a") as other:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)